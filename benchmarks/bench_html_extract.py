@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Benchmark: BeautifulSoup full-tree extraction vs the streaming extractor.
+
+Builds synthetic "large" pages (boilerplate nav/script blocks around many
+paragraphs, both pretty-printed and minified) and times each path at the
+scraper's default 5000-char budget and with no budget at all.
+
+Usage (Docker):
+    docker compose run --rm crew python benchmarks/bench_html_extract.py
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from crewai_template.tools.html_extract import extract_html, soup_extract
+
+
+def _fixture(paragraphs: int, minified: bool, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    words = ["market", "model", "latency", "vendor", "release", "benchmark", "cost", "policy"]
+    sep = "" if minified else "\n"
+    parts = ["<html><head><title>Fixture</title><style>body{margin:0}</style></head><body>"]
+    parts.append("<header><nav>" + "".join(f"<a href='https://e.x/{i}'>menu {i}</a>" for i in range(50)) + "</nav></header>")
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            parts.append("<script>" + "var x = 1;" * 200 + "</script>")
+        text = " ".join(rng.choice(words) for _ in range(60))
+        parts.append(f"<p>{text} <a href='https://e.x/p{i}'>source {i}</a></p>")
+    parts.append("<footer>" + "legal " * 500 + "</footer></body></html>")
+    return sep.join(parts).encode()
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    print(f"{'fixture':<24}{'size':>9}{'soup':>10}{'stream@5k':>12}{'stream full':>13}{'speedup@5k':>12}")
+    for paragraphs in (1_000, 10_000):
+        for minified in (False, True):
+            page = _fixture(paragraphs, minified)
+            soup = _time(lambda: soup_extract(page))
+            budget = _time(lambda: extract_html(page, max_chars=5000))
+            full = _time(lambda: extract_html(page, collect_links=True))
+            label = f"{paragraphs} paras{' (minified)' if minified else ''}"
+            print(
+                f"{label:<24}{len(page) / 1e6:>7.1f}MB{soup * 1e3:>8.0f}ms"
+                f"{budget * 1e3:>10.1f}ms{full * 1e3:>11.0f}ms{soup / budget:>11.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
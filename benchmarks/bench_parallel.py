@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Benchmark: serial vs column-sharded profiling of a wide CSV.
+
+Writes a synthetic CSV (numeric, categorical and date columns) to a
+temporary directory and profiles it in-process, then with 2, 4, ...
+worker processes up to the machine's core count. Pool start-up (spawning
+and importing in every worker) is timed separately, since a long-lived
+crew pays it once.
+
+Usage (Docker):
+    docker compose run --rm crew python benchmarks/bench_parallel.py [rows] [columns]
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from crewai_template.tools import parallel
+from crewai_template.tools.dataset import TableShard
+from crewai_template.tools.dataset_files import read_file
+
+
+def _fixture(path: Path, rows: int, columns: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    kinds = [("num", "cat", "date")[i % 3] for i in range(columns)]
+    cells = {
+        "num": lambda: f"{rng.gauss(100, 15):.3f}",
+        "cat": lambda: rng.choice(("north", "south", "east", "west", "")),
+        "date": lambda: f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+    }
+    with open(path, "w") as f:
+        f.write(",".join(f"{kind}{i}" for i, kind in enumerate(kinds)) + "\n")
+        for _ in range(rows):
+            f.write(",".join(cells[kind]() for kind in kinds) + "\n")
+
+
+def _time(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wide.csv"
+        _fixture(path, rows, columns)
+        print(f"{rows:,} rows x {columns} columns, {path.stat().st_size / 1e6:.0f} MB, {cores} cores")
+        serial = _time(lambda: read_file(path, "", TableShard()))
+        print(f"{'workers':<9}{'startup':>9}{'profile':>9}{'speedup':>9}")
+        print(f"{'serial':<9}{'-':>9}{serial:>8.2f}s{1:>8.2f}x")
+
+        workers = 2
+        while workers <= max(cores, 2):
+            os.environ["DATA_ANALYZER_WORKERS"] = str(workers)
+            parallel.reset_process_pool()
+            pool, _ = parallel.get_process_pool()
+            startup = _time(lambda: list(pool.map(abs, range(workers))))
+            sharded = _time(lambda: parallel.profile_sharded(read_file, path))
+            print(f"{workers:<9}{startup:>8.2f}s{sharded:>8.2f}s{serial / sharded:>8.2f}x")
+            workers *= 2
+        parallel.reset_process_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Benchmark: streaming trend sketch over synthetic time series.
+
+Feeds linear, step, kink, random-walk and seasonal series through
+`TrendSketch` a CSV-sized chunk at a time (as `ColumnProfile.fold` does)
+at 10k, 100k and 1M rows, and reports the time per row, the fitted
+direction and the detected changepoints against the planted ones.
+
+Usage (Docker):
+    docker compose run --rm crew python benchmarks/bench_trends.py
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from array import array
+
+from crewai_template.tools.dataset import CHUNK_ROWS
+from crewai_template.tools.trends import TrendSketch, summarize
+
+
+def _series(kind: str, n: int, seed: int = 0) -> tuple[array, list[int]]:
+    """Values and the rows where the planted regime changes happen."""
+    rng = random.Random(seed)
+    noise = [rng.gauss(0, 1) for _ in range(n)]
+    if kind == "linear":
+        return array("d", (i * 5 / n + e for i, e in enumerate(noise))), []
+    if kind == "step":
+        at = int(n * 0.6)
+        return array("d", ((1.0 if i >= at else 0.0) + e for i, e in enumerate(noise))), [at]
+    if kind == "kink":
+        at = int(n * 0.4)
+        return array("d", (max(0, i - at) * 5 / n + e for i, e in enumerate(noise))), [at]
+    if kind == "walk":
+        return array("d", _accumulate(noise)), []
+    return array("d", (3 * math.sin(i * 2 * math.pi / (n / 4)) + e for i, e in enumerate(noise))), []
+
+
+def _accumulate(values: list[float]):
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+def _profile(values: array) -> TrendSketch:
+    sketch = TrendSketch()
+    mask = bytearray([1]) * CHUNK_ROWS
+    for offset in range(0, len(values), CHUNK_ROWS):
+        chunk = values[offset:offset + CHUNK_ROWS]
+        sketch.update(offset, chunk, mask[:len(chunk)])
+    return sketch
+
+
+def main() -> None:
+    print(f"{'series':<10}{'rows':>10}{'fold':>10}{'ns/row':>9}{'summary':>10}  {'direction':<11}{'planted':<12}found")
+    for rows in (10_000, 100_000, 1_000_000):
+        for kind in ("linear", "step", "kink", "walk", "seasonal"):
+            values, planted = _series(kind, rows)
+            started = time.perf_counter()
+            sketch = _profile(values)
+            fold = time.perf_counter() - started
+            started = time.perf_counter()
+            summary = summarize(sketch)
+            summary_ms = (time.perf_counter() - started) * 1000
+            found = ", ".join(f"{point.row:,}" for point in summary.changepoints) or "-"
+            expected = ", ".join(f"{row:,}" for row in planted) or "-"
+            print(
+                f"{kind:<10}{rows:>10,}{fold * 1000:>8.1f}ms{fold / rows * 1e9:>9.0f}{summary_ms:>8.1f}ms"
+                f"  {summary.direction:<11}{expected:<12}{found}"
+            )
+
+
+if __name__ == "__main__":
+    main()
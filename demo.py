@@ -157,7 +157,7 @@ This demo showcases how AI agents collaborate to research topics and generate in
 🤖 What happens during a demo:
 1. Research Agent investigates the topic using various sources
 2. Reporting Analyst synthesizes findings into a comprehensive report
-3. Final report is saved to 'report.md' in the project directory
+3. Final report is saved to 'reports/<run_id>/report.md' in the project directory
 
 ⚡ Features demonstrated:
 • Multi-agent collaboration
@@ -169,7 +169,7 @@ This demo showcases how AI agents collaborate to research topics and generate in
 🎯 Best practices:
 • Be specific with your topics for better results
 • Use focus areas to guide the analysis direction
-• Check the generated report.md for detailed insights
+• Check the generated reports/<run_id>/report.md for detailed insights
 
 🔧 Technical details:
 • Powered by CrewAI framework
@@ -207,7 +207,7 @@ def run_demo(config):
 
         print("\n" + "=" * 60)
         print("✅ Analysis Complete!")
-        print("📄 Detailed report saved to: report.md")
+        print(f"📄 Detailed report saved to: {crew.tasks[-1].output_file}")
         print("🎉 Check the file for comprehensive insights!")
         print("=" * 60)
 
@@ -20,24 +20,43 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from datetime import datetime
 
+from crewai_template.batch import run_batch
 from crewai_template.crew import CrewaiTemplate
 
+# Configurations for the three analyses
+MARKET_ANALYSIS = {
+    'topic': 'Electric Vehicle Charging Infrastructure',
+    'industry': 'Automotive/Energy',
+    'region': 'North America',
+    'timeframe': '2024-2026',
+    'current_year': str(datetime.now().year),
+    'analysis_depth': 'comprehensive',
+    'focus_areas': 'market size, key players, growth opportunities, regulatory landscape'
+}
+
+COMPETITIVE_ANALYSIS = {
+    'topic': 'AI-Powered Customer Service Platforms',
+    'competitors': 'Zendesk, Salesforce Service Cloud, Intercom',
+    'analysis_type': 'competitive landscape',
+    'current_year': str(datetime.now().year),
+    'focus_areas': 'features, pricing, market position, strengths, weaknesses'
+}
+
+PRODUCT_RESEARCH = {
+    'topic': 'Smart Home Security Systems',
+    'research_type': 'product development',
+    'target_market': 'homeowners aged 25-55',
+    'current_year': str(datetime.now().year),
+    'focus_areas': 'user needs, technology trends, feature requirements, pricing strategy'
+}
+
 
 def run_business_analysis():
     """
     Run a business analysis crew focused on market research and strategic planning.
     """
 
-    # Configuration for business analysis
-    inputs = {
-        'topic': 'Electric Vehicle Charging Infrastructure',
-        'industry': 'Automotive/Energy',
-        'region': 'North America',
-        'timeframe': '2024-2026',
-        'current_year': str(datetime.now().year),
-        'analysis_depth': 'comprehensive',
-        'focus_areas': 'market size, key players, growth opportunities, regulatory landscape'
-    }
+    inputs = MARKET_ANALYSIS
 
     print("🚀 Starting Business Analysis Crew...")
     print(f"📊 Analyzing: {inputs['topic']}")
@@ -51,7 +70,7 @@ def run_business_analysis():
         result = crew.kickoff(inputs=inputs)
 
         print("\n✅ Business Analysis Complete!")
-        print("📄 Report saved to: report.md")
+        print(f"📄 Report saved to: {crew.tasks[-1].output_file}")
 
         return result
 
@@ -63,13 +82,7 @@ def run_competitive_analysis():
     """
     Example configuration for competitive analysis.
     """
-    inputs = {
-        'topic': 'AI-Powered Customer Service Platforms',
-        'competitors': 'Zendesk, Salesforce Service Cloud, Intercom',
-        'analysis_type': 'competitive landscape',
-        'current_year': str(datetime.now().year),
-        'focus_areas': 'features, pricing, market position, strengths, weaknesses'
-    }
+    inputs = COMPETITIVE_ANALYSIS
 
     print("🏁 Starting Competitive Analysis...")
     return CrewaiTemplate().crew().kickoff(inputs=inputs)
@@ -78,17 +91,24 @@ def run_product_research():
     """
     Example configuration for product research and development insights.
     """
-    inputs = {
-        'topic': 'Smart Home Security Systems',
-        'research_type': 'product development',
-        'target_market': 'homeowners aged 25-55',
-        'current_year': str(datetime.now().year),
-        'focus_areas': 'user needs, technology trends, feature requirements, pricing strategy'
-    }
+    inputs = PRODUCT_RESEARCH
 
     print("🔬 Starting Product Research...")
     return CrewaiTemplate().crew().kickoff(inputs=inputs)
 
+def run_all_analyses():
+    """
+    Run the three analyses concurrently, one kickoff (and run_id) each.
+    """
+    print("\n🚀 Running all examples concurrently...")
+    analyses = [MARKET_ANALYSIS, COMPETITIVE_ANALYSIS, PRODUCT_RESEARCH]
+    for record in run_batch(analyses, concurrency=len(analyses)):
+        topic = record['inputs']['topic']
+        if record['status'] == 'ok':
+            print(f"✅ {topic} ({record['seconds']:.0f}s) → {record['report']}")
+        else:
+            print(f"❌ {topic}: {record['error']}")
+
 if __name__ == "__main__":
     print("🎯 CrewAI Business Analysis Examples")
     print("=" * 50)
@@ -111,12 +131,7 @@ if __name__ == "__main__":
     elif choice == "3":
         run_product_research()
     elif choice == "4":
-        print("\n🚀 Running all examples...")
-        run_business_analysis()
-        print("\n" + "="*60)
-        run_competitive_analysis()
-        print("\n" + "="*60)
-        run_product_research()
+        run_all_analyses()
     else:
         print("❌ Invalid choice. Running default market analysis...")
         run_business_analysis()
@@ -42,7 +42,7 @@ class ArticleFlow(Flow[ArticleState]):
     @listen("publish")
     def publish(self) -> None:
         self.state.decision = "PUBLISHED"
-        print(f"✓ {self.state.decision} — see report.md ({len(self.state.research)} chars)")
+        print(f"✓ {self.state.decision} — see reports/ ({len(self.state.research)} chars)")
 
     @listen("expand")
     def expand(self) -> None:
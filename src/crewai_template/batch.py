@@ -0,0 +1,123 @@
+"""Run many kickoffs concurrently from a JSONL file of inputs.
+
+Each line of the input file is one kickoff's input dict (`{"topic": ...}`).
+Runs share a thread pool of BATCH_CONCURRENCY workers; `kickoff` is
+blocking I/O on LLM and tool calls, so threads overlap the waits while one
+process keeps the LLM and tool caches and the per-provider request slots
+(llm_scheduler.py) shared. Every run gets its own `run_id` (taken from the
+input if present, else generated) and passes it to the crew as an input.
+The crew templates its report path on it (`reports/<run_id>/report.md`),
+so concurrent runs never write the same file; the record's `report` is
+that run's interpolated `output_file`. A `run_id` must match `[A-Za-z0-9_-]+`, since
+it ends up in file paths.
+
+Results are appended to the output JSONL as runs finish, in completion
+order. Each line carries the input `index` to match it back to the input.
+A failing run is recorded with its error and does not stop the batch.
+
+Tuning (env vars):
+    BATCH_CONCURRENCY  kickoffs in flight at once (default 4)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_RUN_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def read_inputs(path: str | Path) -> list[dict[str, Any]]:
+    """Input dicts from a JSONL file; blank lines are skipped."""
+    inputs = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}: line {number} is not valid JSON ({e.msg})") from None
+            if not isinstance(value, dict):
+                raise ValueError(f"{path}: line {number} is not a JSON object")
+            inputs.append(value)
+    return inputs
+
+
+def _default_crew() -> Any:
+    # Imported lazily so the batch module stays importable without the crew's deps.
+    from crewai_template.crew import CrewaiTemplate
+
+    return CrewaiTemplate().crew()
+
+
+def run_one(
+    index: int,
+    inputs: dict[str, Any],
+    crew_factory: Callable[[], Any] = _default_crew,
+) -> dict[str, Any]:
+    """Kick off one crew and describe the outcome as a JSON-ready record."""
+    inputs = {**inputs, "run_id": str(inputs.get("run_id") or uuid.uuid4().hex[:8])}
+    record: dict[str, Any] = {"index": index, "run_id": inputs["run_id"], "inputs": inputs}
+    started = time.perf_counter()
+    try:
+        if not _RUN_ID.fullmatch(inputs["run_id"]):
+            raise ValueError(f"invalid run_id {inputs['run_id']!r} (expected letters, digits, '_' or '-')")
+        crew = crew_factory()
+        output = crew.kickoff(inputs=inputs)
+        usage = getattr(output, "token_usage", None)
+        # Tasks interpolate `output_file` from the inputs at kickoff.
+        reports = [task.output_file for task in crew.tasks if task.output_file]
+        record.update(
+            status="ok",
+            report=reports[-1] if reports else None,
+            raw=getattr(output, "raw", None) or str(output),
+            token_usage=usage.model_dump() if hasattr(usage, "model_dump") else None,
+        )
+    except Exception as e:  # noqa: BLE001 — one failed run must not sink the batch
+        logger.exception("run %s (input %d) failed", inputs["run_id"], index)
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def run_batch(
+    inputs: list[dict[str, Any]],
+    concurrency: Optional[int] = None,
+    crew_factory: Callable[[], Any] = _default_crew,
+) -> Iterator[dict[str, Any]]:
+    """Yield one record per input as its run finishes (completion order)."""
+    workers = concurrency or int(os.getenv("BATCH_CONCURRENCY", 4))
+    with ThreadPoolExecutor(max(1, min(workers, len(inputs) or 1)), thread_name_prefix="kickoff") as pool:
+        futures = [
+            pool.submit(run_one, index, item, crew_factory) for index, item in enumerate(inputs)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_batch_file(
+    input_path: str | Path,
+    output_path: str | Path,
+    concurrency: Optional[int] = None,
+    crew_factory: Callable[[], Any] = _default_crew,
+) -> dict[str, int]:
+    """Run every input in `input_path`, streaming records to `output_path`. Returns counts."""
+    inputs = read_inputs(input_path)
+    counts = {"ok": 0, "error": 0}
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as out:
+        for record in run_batch(inputs, concurrency, crew_factory):
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            counts[record["status"]] += 1
+            logger.info("run %s finished: %s (%.1fs)", record["run_id"], record["status"], record["seconds"])
+    return counts
@@ -0,0 +1,224 @@
+"""Compact the context one task hands to the next before it reaches a prompt.
+
+crewAI pastes earlier tasks' raw outputs into the next task's prompt. For
+the analyst that is the researcher's whole dump: scraped pages with the
+same passage quoted from several sources, cookie banners and navigation
+lines. `CompactContextTask` (the analysis and report tasks) cleans that
+context up before the agent sees it:
+
+1. boilerplate is dropped: short passages that look like site chrome
+   ("Accept all cookies", "Subscribe to our newsletter", ...) and short
+   lines repeated across three or more passages (menus, footers);
+2. duplicates are dropped: a passage whose normalised text is already
+   there, or is contained in a longer passage that is kept;
+3. if the context is still over the task's token budget, passages are
+   selected extractively. Each is scored by the task description's
+   terms it contains (rarer terms weigh more), with a bonus for URLs and
+   figures. The best are kept, in their original order, until the
+   budget is full.
+
+Context that is already clean and within budget is passed on unchanged.
+Each compaction logs its token counts before and after, and the crew
+prints them after a kickoff.
+
+Tuning (env vars):
+    CONTEXT_COMPACTION     0 → pass context through untouched (default 1)
+    CONTEXT_TOKEN_BUDGETS  per-task budgets in tokens, 0 = unlimited
+                           (default analysis_task=6000,report_task=4000)
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from crewai import Task
+from pydantic import PrivateAttr
+
+from crewai_template.llm_scheduler import estimate_tokens, parse_limits
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS = "analysis_task=6000,report_task=4000"
+PASSAGE_CHARS = 1200  # long blocks are cut into passages of about this size for selection
+BOILERPLATE_REPEATS = 3
+SHORT = 200
+CONTAINED_WORDS = 5  # shorter passages are only dropped as exact repeats
+
+_BLOCK_BREAK = re.compile(r"\n[ \t]*\n")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_TERM = re.compile(r"[a-z][a-z0-9]{3,}")
+_URL = re.compile(r"https?://")
+_FIGURE = re.compile(r"\d")
+_BOILERPLATE = re.compile(
+    r"cookie|accept all|subscribe|newsletter|sign (?:in|up)|log ?in\b|all rights reserved|privacy policy"
+    r"|terms of (?:use|service)|skip to (?:main )?content|follow us|share (?:this|on)|advertisement"
+    r"|enable javascript|back to top",
+    re.I,
+)
+_STOPWORDS = frozenset(
+    "about above after also and been before being both each from have into just more most must only "
+    "other over same should some such than that their them then there these they this those through "
+    "under very were what when where which while will with your".split()
+)
+
+
+@dataclass(frozen=True)
+class Compaction:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    duplicates: int = 0
+    boilerplate: int = 0  # chrome lines and passages
+    over_budget: int = 0  # passages left out by extractive selection
+
+    def describe(self) -> str:
+        return (
+            f"{self.tokens_before} → {self.tokens_after} tokens ({self.duplicates} duplicate, "
+            f"{self.boilerplate} boilerplate, {self.over_budget} over-budget passages dropped)"
+        )
+
+
+def compact(text: str, budget: int = 0, query: str = "") -> Compaction:
+    """`text` without boilerplate and duplicates, cut to `budget` tokens (0 = no cut)."""
+    before = estimate_tokens(text)
+    blocks = [block.strip() for block in _BLOCK_BREAK.split(text) if block.strip()]
+    blocks, boilerplate = _drop_boilerplate(blocks)
+    blocks, duplicates = _dedupe(blocks)
+    compacted = "\n\n".join(blocks) if boilerplate or duplicates else text
+    over_budget = 0
+    if budget and estimate_tokens(compacted) > budget:
+        passages = [passage for block in blocks for passage in _split(block)]
+        chosen = _select(passages, budget, query)
+        over_budget = len(passages) - len(chosen)
+        compacted = "\n\n".join(passages[i] for i in sorted(chosen))
+    return Compaction(compacted, before, estimate_tokens(compacted), duplicates, boilerplate, over_budget)
+
+
+def compaction_enabled() -> bool:
+    return os.getenv("CONTEXT_COMPACTION", "1") == "1"
+
+
+def token_budget(task_name: Optional[str]) -> int:
+    """CONTEXT_TOKEN_BUDGETS entry for `task_name`, 0 when it has none."""
+    budgets = parse_limits(os.getenv("CONTEXT_TOKEN_BUDGETS", DEFAULT_BUDGETS))
+    return budgets.get((task_name or "").lower(), 0)
+
+
+class CompactContextTask(Task):
+    """A `Task` that compacts the context from earlier tasks to its token budget first."""
+
+    _compaction: Optional[Compaction] = PrivateAttr(default=None)
+
+    @property
+    def compaction(self) -> Optional[Compaction]:
+        """What the last execution's context compaction did, if anything ran."""
+        return self._compaction
+
+    def _execute_core(self, agent: Any, context: Optional[str], tools: Optional[list[Any]]) -> Any:
+        return super()._execute_core(agent, self._compact(context), tools)
+
+    async def _aexecute_core(self, agent: Any, context: Optional[str], tools: Optional[list[Any]]) -> Any:
+        return await super()._aexecute_core(agent, self._compact(context), tools)
+
+    def _compact(self, context: Optional[str]) -> Optional[str]:
+        if not context or not compaction_enabled():
+            return context
+        self._compaction = compact(context, token_budget(self.name), f"{self.description}\n{self.expected_output}")
+        logger.info("%s context: %s", self.name or "task", self._compaction.describe())
+        return self._compaction.text
+
+
+def _key(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _drop_boilerplate(blocks: list[str]) -> tuple[list[str], int]:
+    """Blocks without site chrome, and how many lines and blocks were removed."""
+    # Short lines (not headings) that recur across passages are menus and footers.
+    seen = Counter(
+        key for block in blocks
+        for key in {_key(line) for line in block.splitlines() if _is_chrome_candidate(line)}
+    )
+    repeated = {key for key, count in seen.items() if key and count >= BOILERPLATE_REPEATS}
+    kept, dropped = [], 0
+    for block in blocks:
+        lines = block.splitlines()
+        clean = [line for line in lines if not (_is_chrome_candidate(line) and _key(line) in repeated)]
+        dropped += len(lines) - len(clean)
+        block = "\n".join(clean).strip()
+        if block and len(block) < SHORT and _BOILERPLATE.search(block) and not _URL.search(block):
+            dropped += 1
+        elif block:
+            kept.append(block)
+    return kept, dropped
+
+
+def _is_chrome_candidate(line: str) -> bool:
+    line = line.strip()
+    return bool(line) and len(line) < 80 and not line.startswith("#")
+
+
+def _is_heading(block: str) -> bool:
+    return block.startswith("#") and "\n" not in block
+
+
+def _dedupe(blocks: list[str]) -> tuple[list[str], int]:
+    """Drop repeats, and passages of a few words or more contained in a longer one.
+
+    Separators and headings always stay: they give the rest its structure.
+    """
+    keys = [f" {_key(block)} " for block in blocks]
+    kept: list[str] = []
+    drop: set[int] = set()
+    for i in sorted(range(len(blocks)), key=lambda i: -len(keys[i])):
+        if not keys[i].strip() or _is_heading(blocks[i]):
+            continue
+        if keys[i] in kept or (keys[i].count(" ") > CONTAINED_WORDS and any(keys[i] in other for other in kept)):
+            drop.add(i)
+        else:
+            kept.append(keys[i])
+    return [block for i, block in enumerate(blocks) if i not in drop], len(drop)
+
+
+def _split(block: str) -> Iterable[str]:
+    if len(block) <= PASSAGE_CHARS:
+        yield block
+        return
+    chunk = ""
+    for sentence in filter(None, (s.strip() for s in _SENTENCE_BREAK.split(block))):
+        if chunk and len(chunk) + len(sentence) >= PASSAGE_CHARS:
+            yield chunk
+            chunk = sentence
+        else:
+            chunk = f"{chunk} {sentence}" if chunk else sentence
+    if chunk:
+        yield chunk
+
+
+def _select(passages: list[str], budget: int, query: str) -> list[int]:
+    terms = [set(_TERM.findall(passage.lower())) - _STOPWORDS for passage in passages]
+    wanted = set(_TERM.findall(query.lower())) - _STOPWORDS
+    frequency = Counter(term for passage_terms in terms for term in passage_terms & wanted)
+    weight = {term: math.log(1 + len(passages) / count) for term, count in frequency.items()}
+
+    def score(i: int) -> float:
+        passage = passages[i]
+        if not _key(passage) or _is_heading(passage):
+            return math.inf  # separators and headings keep the structure readable
+        relevance = sum(weight.get(term, 0.0) for term in terms[i])
+        evidence = 1.0 * bool(_URL.search(passage)) + 0.5 * bool(_FIGURE.search(passage))
+        return (relevance + evidence) / math.log(2 + len(passage) / 100)
+
+    chosen, used = [], 0
+    for i in sorted(range(len(passages)), key=lambda i: (-score(i), i)):
+        cost = estimate_tokens(passages[i])
+        if used + cost <= budget:
+            chosen.append(i)
+            used += cost
+    return chosen
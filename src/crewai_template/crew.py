@@ -4,12 +4,24 @@ Showcased patterns (top-to-bottom):
 - @CrewBase + YAML config
 - @before_kickoff input transformation
 - Per-agent LLM right-sizing (Gemini Flash / Sonnet 4.6 / Opus 4.7)
-- BaseTool subclass (WebScraperTool, DataAnalyzerTool) and @tool decorator (word_count)
+- BaseTool subclass (WebScraperTool, BatchWebScraperTool, DataAnalyzerTool) and
+  @tool decorator (word_count)
 - SerperDevTool web search wired into the researcher
 - async_execution=True on the research task (intra-crew parallelism)
-- output_pydantic structured output on the analysis task
-- Function guardrail with retries on the report task
+- Context between tasks deduplicated, stripped of boilerplate and cut to a
+  per-task token budget (compaction.py)
+- output_pydantic structured output on the analysis task, repaired locally
+  or field by field before any full re-conversion (repair.py)
+- Function guardrail registry with retries on the report task, checked
+  on the streaming prefix so doomed drafts stop early (guardrails.py)
+- Report written per run (reports/{run_id}/report.md), atomically or in memory (reports.py)
+- Editor tokens streamed to stdout / a partial file as they arrive (streaming.py)
 - Crew-level memory + knowledge_sources with explicit embedder
+- Every agent's LLM behind a persistent response cache (llm_cache.py) and
+  per-provider request slots shared by concurrent crews (llm_scheduler.py)
+- Static agent / task prompt prefixes marked for provider prompt caching,
+  with cached tokens reported per agent (prompt_cache.py)
+- Researcher tools behind a result cache keyed by normalized arguments
 - Commented MCP block at the bottom
 """
 # crewai's @CrewBase rewrites `agents_config` / `tasks_config` from str → dict
@@ -29,12 +41,21 @@ from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledge
 from crewai.project import CrewBase, after_kickoff, agent, before_kickoff, crew, task
 from crewai_tools import SerperDevTool
 
+from crewai_template.compaction import CompactContextTask
+from crewai_template.llm_cache import cache_llm, get_llm_cache
+from crewai_template.llm_scheduler import agent_priority, schedule_llm
+from crewai_template.prompt_cache import cache_static_prompts, cached_token_usage, usage_snapshot
+from crewai_template.repair import RepairingConverter, get_repair_stats
+from crewai_template.reports import ReportTask, in_memory
 from crewai_template.schemas import AnalysisReport, ensure_markdown_report
+from crewai_template.streaming import ReportStream, early_abort, sinks_from_env
 from crewai_template.tools import (
+    BatchWebScraperTool,
     DataAnalyzerTool,
     WebScraperTool,
     word_count,
 )
+from crewai_template.tools.tool_cache import cache_tool, normalize_query, normalize_url
 
 
 @CrewBase
@@ -43,23 +64,69 @@ class CrewaiTemplate:
 
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
+    _report_stream: ReportStream | None = None
+    _usage_baseline: dict = {}
 
     # ── lifecycle ───────────────────────────────────────────────────────
     @before_kickoff
     def _prep(self, inputs: dict) -> dict:
         inputs.setdefault("current_year", str(datetime.now().year))
         inputs.setdefault("run_id", uuid.uuid4().hex[:8])
+        # REPORT_STREAM=stdout,file → the editor's report appears as it is written;
+        # REPORT_EARLY_ABORT stops a draft as soon as the guardrail can't pass.
+        if self._report_stream is not None:
+            self._report_stream.detach()  # a previous kickoff that never reached the report
+        sinks = sinks_from_env()
+        self._report_stream = (
+            ReportStream(self.report_task(), sinks, abort=True).attach() if sinks or early_abort() else None
+        )
+        self._usage_baseline = usage_snapshot(self._agents_by_name())
         return inputs
 
+    def _agents_by_name(self) -> dict[str, Agent]:
+        return {"researcher": self.researcher(), "analyst": self.analyst(), "editor": self.editor()}
+
     @after_kickoff
     def _summarise(self, output):
-        print(f"\n— crew finished — wrote {len(getattr(output, 'raw', '') or '')} chars to report.md\n")
+        # output_file holds this run's path once the kickoff has interpolated it.
+        path = self.report_task().output_file
+        where = f"memory (get_report({path!r}))" if in_memory() else path
+        print(f"\n— crew finished — wrote {len(getattr(output, 'raw', '') or '')} chars to {where}")
+        cache = get_llm_cache()
+        if cache is not None:
+            stats = cache.stats()
+            print(
+                f"— LLM cache — {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), ~{stats['saved_seconds']:.0f}s of calls skipped"
+            )
+        for task in (self.analysis_task(), self.report_task()):
+            if task.compaction is not None:
+                print(f"— {task.name} context — {task.compaction.describe()}")
+        usage = cached_token_usage(self._agents_by_name(), self._usage_baseline)
+        if any(u["prompt_tokens"] for u in usage.values()):
+            print("— prompt cache — " + ", ".join(
+                f"{name} {u['cached_prompt_tokens']}/{u['prompt_tokens']} prompt tokens cached ({u['cached_share']:.0%})"
+                for name, u in usage.items()
+            ))
+        repairs = get_repair_stats().stats()
+        if repairs["repaired"] or repairs["patched"] or repairs["fallback"]:
+            print(
+                f"— output repair — {repairs['repaired']} fixed locally, {repairs['patched']} patched by field, "
+                f"{repairs['fallback']} re-converted ({repairs['retries_avoided']} full retries avoided)"
+            )
+        print()
         return output
 
     # ── agents ──────────────────────────────────────────────────────────
     # Each agent is right-sized to its workload. If the relevant API key
     # isn't set, the agent falls back to the env-default `MODEL` so the
-    # template still runs with only `OPENAI_API_KEY`.
+    # template still runs with only `OPENAI_API_KEY`. Whichever LLM an agent
+    # ends up with goes through the response cache, so a rerun of the same
+    # topic replays identical calls from disk (LLM_CACHE_* in .env.example),
+    # and cache misses queue for their provider's concurrency and RPM/TPM
+    # budgets, editor first (LLM_* in .env.example). Anthropic requests
+    # carry a cache breakpoint after the static head of the task prompt
+    # (PROMPT_CACHE in .env.example).
 
     @agent
     def researcher(self) -> Agent:
@@ -70,12 +137,22 @@ class CrewaiTemplate:
             if os.getenv("GEMINI_API_KEY")
             else None  # falls back to env MODEL (default openai/gpt-4.1-mini)
         )
-        return Agent(
+        # Duplicate searches / scrapes / counts return from the tool cache
+        # (TOOL_CACHE_* in .env.example); failed scrapes are never stored.
+        search = cache_tool(SerperDevTool(), ttl=6 * 3600, normalize={"search_query": normalize_query})
+        scraper = cache_tool(
+            WebScraperTool(),
+            normalize={"url": normalize_url},
+            cacheable=lambda _args, result: not result.startswith(("Failed to scrape", "Error processing")),
+        )
+        researcher = Agent(
             config=self.agents_config["researcher"],  # type: ignore[index]
-            tools=[SerperDevTool(), WebScraperTool(), word_count],
+            tools=[search, BatchWebScraperTool(), scraper, cache_tool(word_count, ttl=30 * 24 * 3600)],
             llm=researcher_llm,
             verbose=True,
         )
+        cache_llm(schedule_llm(cache_static_prompts(researcher.llm), agent_priority("researcher")))
+        return researcher
 
     @agent
     def analyst(self) -> Agent:
@@ -91,29 +168,34 @@ class CrewaiTemplate:
             if os.getenv("ANTHROPIC_API_KEY")
             else None  # falls back to env MODEL
         )
-        return Agent(
+        analyst = Agent(
             config=self.agents_config["analyst"],  # type: ignore[index]
             tools=[DataAnalyzerTool()],
             llm=analyst_llm,
             verbose=True,
         )
+        cache_llm(schedule_llm(cache_static_prompts(analyst.llm), agent_priority("analyst")))
+        return analyst
 
     @agent
     def editor(self) -> Agent:
-        # Long-form writing + 1M context: the editor consumes the full
-        # research dump + analyst report. Opus 4.7's 1M context handles
-        # this without truncation. `reasoning=True` adds a planning pass.
+        # Long-form writing: the editor turns the analyst's report, compacted
+        # to its CONTEXT_TOKEN_BUDGETS share, into the brief, so its prompts
+        # stay small. Opus 4.7 is here for prose quality, not context
+        # length. `reasoning=True` adds a planning pass.
         editor_llm = (
             LLM(model="anthropic/claude-opus-4-7", temperature=0.5)
             if os.getenv("ANTHROPIC_API_KEY")
             else None  # falls back to env MODEL
         )
-        return Agent(
+        editor = Agent(
             config=self.agents_config["editor"],  # type: ignore[index]
             llm=editor_llm,
             reasoning=True,
             verbose=True,
         )
+        cache_llm(schedule_llm(cache_static_prompts(editor.llm), agent_priority("editor")))
+        return editor
 
     # ── tasks ───────────────────────────────────────────────────────────
     @task
@@ -125,20 +207,23 @@ class CrewaiTemplate:
 
     @task
     def analysis_task(self) -> Task:
-        return Task(
+        # The research dump is deduplicated and cut to the analyst's budget first.
+        return CompactContextTask(
             config=self.tasks_config["analysis_task"],  # type: ignore[index]
             context=[self.research_task()],
             output_pydantic=AnalysisReport,
+            converter_cls=RepairingConverter,
         )
 
     @task
     def report_task(self) -> Task:
-        return Task(
+        # One file per run, so concurrent kickoffs never clobber each other.
+        return ReportTask(
             config=self.tasks_config["report_task"],  # type: ignore[index]
             context=[self.analysis_task()],
             guardrail=ensure_markdown_report,
             guardrail_max_retries=2,  # type: ignore[call-arg] — accepted by crewai 1.14 runtime; type stubs lag
-            output_file="report.md",
+            output_file="reports/{run_id}/report.md",
             markdown=True,
         )
 
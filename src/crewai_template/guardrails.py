@@ -0,0 +1,138 @@
+"""Composable output guardrails that can also judge a text still being generated.
+
+A `GuardrailRegistry` holds named `Rule`s and runs all of them over one
+scan of the text. The scan finds the headings, the length and a leading
+code fence in a single pass, so adding a rule costs no extra pass.
+Failing rules are reported together, and the retry prompt lists every
+problem at once instead of one per Opus generation.
+
+A rule with a `horizon` can be decided from the first `horizon`
+characters. `prefix_problem(text)` runs those rules on a streaming
+prefix (streaming.py), so a draft without a title, or wrapped in a code
+fence, is rejected, and its generation aborted, a few hundred characters
+in. Rules without a horizon, such as length floors and required
+sections, run only on the finished text.
+
+`report_guardrails` is the registry behind `schemas.ensure_markdown_report`.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$", re.M)
+FENCE = "```"
+
+
+@dataclass(frozen=True)
+class TextScan:
+    text: str  # leading whitespace stripped
+    headings: tuple[tuple[int, str, int], ...]  # (level, title, offset)
+
+    @classmethod
+    def of(cls, text: str) -> "TextScan":
+        text = text.lstrip()
+        headings = tuple((len(m.group(1)), m.group(2), m.start()) for m in _HEADING.finditer(text))
+        return cls(text, headings)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """`check(scan, final)` returns a problem, or None while the text can still pass.
+
+    `horizon` > 0: the rule is decided within the first `horizon`
+    characters, so it also runs on streaming prefixes. 0: final text only.
+    """
+
+    name: str
+    check: Callable[[TextScan, bool], Optional[str]]
+    horizon: int = 0
+
+
+def heading_within(chars: int) -> Rule:
+    def check(scan: TextScan, final: bool) -> Optional[str]:
+        if any(level == 1 and offset < chars for level, _, offset in scan.headings):
+            return None
+        if final or len(scan.text) >= chars:
+            return f"Report must open with a '# ' markdown heading within its first {chars} characters."
+        return None
+
+    return Rule("heading_within", check, horizon=chars)
+
+
+def no_wrapping_fence() -> Rule:
+    def check(scan: TextScan, final: bool) -> Optional[str]:
+        if scan.text.startswith(FENCE):
+            return "Do not wrap the report in ``` code fences; write plain markdown."
+        return None
+
+    return Rule("no_wrapping_fence", check, horizon=len(FENCE))
+
+
+def required_section(title: str, level: int = 2) -> Rule:
+    def check(scan: TextScan, final: bool) -> Optional[str]:
+        if any(lvl == level and text.strip().lower() == title.lower() for lvl, text, _ in scan.headings):
+            return None
+        return f"Report must include a '{'#' * level} {title}' section." if final else None
+
+    return Rule(f"section:{title}", check)
+
+
+def min_length(chars: int) -> Rule:
+    def check(scan: TextScan, final: bool) -> Optional[str]:
+        if final and len(scan.text) < chars:
+            return f"Report is too short ({len(scan.text)} chars). Expand to ≥{chars} chars."
+        return None
+
+    return Rule("min_length", check)
+
+
+class GuardrailRegistry:
+    """Named rules run together; callable as a crewAI function guardrail."""
+
+    def __init__(self, rules: Iterable[Rule] = ()) -> None:
+        self._rules: dict[str, Rule] = {}
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule: Rule) -> Rule:
+        """Add `rule`, replacing any rule of the same name."""
+        self._rules[rule.name] = rule
+        return rule
+
+    def unregister(self, name: str) -> None:
+        self._rules.pop(name, None)
+
+    @property
+    def rules(self) -> list[Rule]:
+        return list(self._rules.values())
+
+    def problems(self, text: str, final: bool = True) -> list[str]:
+        scan = TextScan.of(text)
+        rules = self._rules.values() if final else (r for r in self._rules.values() if r.horizon)
+        return [problem for rule in rules if (problem := rule.check(scan, final))]
+
+    def prefix_problem(self, text: str) -> Optional[str]:
+        """First problem already certain from a streaming prefix, or None."""
+        horizon = max((rule.horizon for rule in self._rules.values()), default=0)
+        if not horizon:
+            return None
+        # Prefix rules are decided within their horizon, so that's all they need to see.
+        head = text.lstrip()[:horizon]
+        return next(iter(self.problems(head, final=False)), None)
+
+    def __call__(self, result: Any) -> Tuple[bool, str]:
+        text = (getattr(result, "raw", None) or str(result)) or ""
+        problems = self.problems(text)
+        if problems:
+            return False, " ".join(problems)
+        return True, text
+
+
+report_guardrails = GuardrailRegistry([
+    heading_within(200),
+    no_wrapping_fence(),
+    required_section("Recommendations"),
+    min_length(200),
+])
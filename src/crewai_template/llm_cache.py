@@ -0,0 +1,232 @@
+"""Persistent LLM response cache shared by the crew's agents (SQLite, stdlib only).
+
+A rerun of the same topic sends the same prompts, so each response is
+stored under a content address: a SHA-256 over the model and every
+sampling parameter that changes the output (temperature, reasoning
+effort, stop words, ...), the messages, the tool schemas and the
+structured-output schema. Any difference in any of them is a miss, and a
+hit returns exactly what the provider returned (text, native tool calls
+or a parsed model) without the round trip.
+
+Calls that execute functions inside the LLM (`available_functions`) are
+never cached, since their side effects would be skipped. Set
+LLM_CACHE_BYPASS=1, or wrap code in `bypass_llm_cache()`, to skip lookups
+and refresh the stored responses instead.
+
+Values are pickled, so only point LLM_CACHE_PATH at a file you trust.
+
+Tuning (env vars, read when the cache is first opened):
+    LLM_CACHE_PATH    SQLite file (default .cache/llm.sqlite3; set to "off"
+                      to disable caching)
+    LLM_CACHE_TTL     seconds a response is reused (default 604800 = 7d)
+    LLM_CACHE_MAX_MB  size bound before LRU eviction (default 128)
+    LLM_CACHE_BYPASS  1 → always call the provider, still store responses
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from crewai_template.sqlite_store import SharedStore, connect, evict_lru
+
+# Bump when the table or the key changes; older cache files are simply rebuilt.
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+DROP TABLE IF EXISTS responses;
+CREATE TABLE responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    value       BLOB NOT NULL,
+    latency     REAL NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX responses_accessed_at ON responses (accessed_at);
+"""
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+def cache_key(llm: Any, messages: Any, tools: Any = None, response_model: Any = None) -> str:
+    """Content address of one LLM request.
+
+    The LLM's own `to_config_dict()` supplies the parameters: everything
+    needed to rebuild it, minus credentials and client settings.
+    """
+    params = llm.to_config_dict() if hasattr(llm, "to_config_dict") else {"model": llm.model}
+    schema = response_model.model_json_schema() if hasattr(response_model, "model_json_schema") else None
+    payload = json.dumps(
+        {"params": params, "messages": messages, "tools": tools, "response_model": schema},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe, size- and TTL-bounded response store with hit-rate counters."""
+
+    def __init__(self, path: str | Path, ttl: float = 7 * 24 * 3600, max_bytes: int = 128 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn = connect(self.path, _SCHEMA, _SCHEMA_VERSION)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "uncacheable": 0}
+        self._saved_seconds = 0.0
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """`(True, response)` for a fresh entry, else `(False, None)`. Counts the outcome."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, latency FROM responses WHERE key = ? AND created_at >= ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+            self._saved_seconds += row[1]
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, model: str, value: Any, latency: float) -> None:
+        try:
+            blob = pickle.dumps(value)
+        except Exception:  # noqa: BLE001 — provider objects holding clients, locks, ...
+            self.record("uncacheable")
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, blob, latency, len(blob), now, now),
+            )
+            self._evict(now)
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "saved_seconds": self._saved_seconds,
+                "entries": entries,
+                "bytes": total,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        evict_lru(self._conn, "responses", "key", self.max_bytes)
+
+
+def _open_from_env() -> Optional[LLMCache]:
+    path = os.getenv("LLM_CACHE_PATH", ".cache/llm.sqlite3")
+    if not path or path.lower() == "off":
+        return None
+    return LLMCache(
+        path,
+        ttl=float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600)),
+        max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", 128)) * 1024 * 1024),
+    )
+
+
+_shared: SharedStore[LLMCache] = SharedStore(_open_from_env)
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache shared by every agent's LLM, or None when disabled."""
+    return _shared.get()
+
+
+def reset_llm_cache() -> None:
+    """Close the shared cache so LLM_CACHE_* is read again when it is next needed."""
+    _shared.reset()
+
+
+@contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    """Call the provider for every request in this block (responses are still stored)."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_llm(llm: Any) -> Any:
+    """Route `llm.call` / `llm.acall` through the shared cache; returns `llm`.
+
+    Patches the instance, since `LLM(...)` hands back a provider-specific
+    class. A no-op for None and for an LLM that is already wrapped.
+    """
+    if llm is None or getattr(llm, "_response_cache", False):
+        return llm
+    call, acall = llm.call, llm.acall
+
+    def lookup(messages, tools, response_model, available_functions):
+        cache = get_llm_cache()
+        if cache is None:
+            return None, None, None
+        if available_functions:
+            cache.record("uncacheable")
+            return cache, None, None
+        key = cache_key(llm, messages, tools, response_model)
+        if _bypass.get() or os.getenv("LLM_CACHE_BYPASS") == "1":
+            cache.record("bypassed")
+            return cache, key, None
+        hit, value = cache.get(key)
+        return cache, key, (value,) if hit else None
+
+    @functools.wraps(call)
+    def cached_call(
+        messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None,
+        response_model=None,
+    ):
+        cache, key, hit = lookup(messages, tools, response_model, available_functions)
+        if hit is not None:
+            return hit[0]
+        started = time.perf_counter()
+        value = call(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+        if key is not None and value is not None:
+            cache.put(key, llm.model, value, time.perf_counter() - started)
+        return value
+
+    @functools.wraps(acall)
+    async def cached_acall(
+        messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None,
+        response_model=None,
+    ):
+        cache, key, hit = lookup(messages, tools, response_model, available_functions)
+        if hit is not None:
+            return hit[0]
+        started = time.perf_counter()
+        value = await acall(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+        if key is not None and value is not None:
+            cache.put(key, llm.model, value, time.perf_counter() - started)
+        return value
+
+    # object.__setattr__: pydantic would reject `call` as an unknown field.
+    object.__setattr__(llm, "call", cached_call)
+    object.__setattr__(llm, "acall", cached_acall)
+    object.__setattr__(llm, "_response_cache", True)
+    return llm
@@ -0,0 +1,331 @@
+"""Process-wide admission control for LLM requests, per provider.
+
+Several crews in one process (a batch, a service) share the same API
+keys. Left alone, they burst past the provider's limits, collect 429s,
+and every retry feeds the storm. `schedule_llm` puts each agent's LLM
+behind this scheduler, so a request goes out only when its provider has
+room in three budgets:
+
+- concurrency: how many requests are in flight at once;
+- RPM: requests per minute, as a token bucket;
+- TPM: prompt tokens per minute, as a token bucket, estimated up front
+  from the message size (~4 characters per token).
+
+Waiting requests queue per provider by priority, lowest number first.
+The crew gives the editor 0, the analyst 1 and the researcher 2, so a
+report that is nearly done never waits behind another crew's searches.
+Ties are first come, first served. Only the head of the queue is
+admitted, so a large prompt at the front isn't starved by small ones.
+
+A call made while already holding that provider's slot (crewAI's `call`
+retrying itself without `stop`, an `acall` that delegates to `call`)
+passes straight through instead of queueing behind itself. Cache hits
+(llm_cache.py) never get here. `stats()` reports per provider in-flight
+requests, queue depth and time spent waiting.
+
+Tuning (env vars, read when the scheduler is first built):
+    LLM_MAX_CONCURRENCY       in-flight requests per provider (default 8)
+    LLM_PROVIDER_CONCURRENCY  per-provider overrides, e.g. "anthropic=2"
+    LLM_PROVIDER_RPM          requests/minute per provider, e.g.
+                              "anthropic=50,openai=500" (default unlimited)
+    LLM_PROVIDER_TPM          prompt tokens/minute per provider, e.g.
+                              "anthropic=40000" (default unlimited)
+    LLM_AGENT_PRIORITY        queue priority per agent, lower first
+                              (default "editor=0,analyst=1,researcher=2")
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from crewai_template.tools.rate_limit import TokenBucket
+
+DEFAULT_PRIORITY = 1
+CHARS_PER_TOKEN = 4
+# Buckets hold 10 seconds of budget, so a cold start can't spend a whole
+# minute's allowance in one burst.
+BURST_SECONDS = 10.0
+
+# Providers whose slot the current thread / task already holds.
+_holding: contextvars.ContextVar[frozenset[str]] = contextvars.ContextVar("llm_holding", default=frozenset())
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    """`"anthropic=2, gemini=16"` → `{"anthropic": 2, "gemini": 16}`."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        if not value.strip().isdigit():
+            raise ValueError(f"invalid limit {item!r} (expected name=N)")
+        limits[name.strip().lower()] = int(value)
+    return limits
+
+
+def provider_of(llm: Any) -> str:
+    """Provider name of an LLM: its `provider` field, else the model prefix."""
+    provider = getattr(llm, "provider", None)
+    if provider:
+        return str(provider).lower()
+    model = str(getattr(llm, "model", ""))
+    return model.split("/", 1)[0].lower() if "/" in model else "openai"
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Rough prompt size of `messages` (a string or a list of message dicts)."""
+    if isinstance(messages, str):
+        return len(messages) // CHARS_PER_TOKEN + 1
+    return sum(len(str(m.get("content") or "")) // CHARS_PER_TOKEN + 4 for m in messages or ()) + 1
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    wake: Callable[[], None] = field(compare=False)
+    queued_at: float = field(compare=False)
+    admitted: bool = field(default=False, compare=False)
+
+
+@dataclass
+class _Provider:
+    concurrency: int
+    requests: Optional[TokenBucket]
+    tokens: Optional[TokenBucket]
+    in_flight: int = 0
+    queue: list[_Waiter] = field(default_factory=list)
+    admitted: int = 0
+    peak_queued: int = 0
+    wait_seconds: float = 0.0
+
+
+class LLMScheduler:
+    """Priority queue and budgets per provider, shared by threads and event loops."""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        concurrency_limits: Optional[dict[str, int]] = None,
+        rpm: Optional[dict[str, int]] = None,
+        tpm: Optional[dict[str, int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.concurrency_limits = concurrency_limits or {}
+        self.rpm = rpm or {}
+        self.tpm = tpm or {}
+        self._clock = clock
+        self._providers: dict[str, _Provider] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, provider: str, priority: int = DEFAULT_PRIORITY, tokens: int = 1) -> Iterator[None]:
+        """Wait for admission, then hold one of `provider`'s request slots."""
+        if provider in _holding.get():
+            yield
+            return
+        event = threading.Event()
+        waiter = self._enqueue(provider, priority, tokens, event.set)
+        try:
+            while not event.wait(self._dispatch(provider)):
+                pass
+        except BaseException:
+            self._abandon(provider, waiter)
+            raise
+        token = _holding.set(_holding.get() | {provider})
+        try:
+            yield
+        finally:
+            _holding.reset(token)
+            self._release(provider)
+
+    @asynccontextmanager
+    async def aslot(self, provider: str, priority: int = DEFAULT_PRIORITY, tokens: int = 1) -> AsyncIterator[None]:
+        """`slot` for coroutines: waits on a future, never blocks the loop or a thread."""
+        if provider in _holding.get():
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: admitted.done() or admitted.set_result(None))
+
+        waiter = self._enqueue(provider, priority, tokens, wake)
+        try:
+            while not waiter.admitted:
+                await asyncio.wait([admitted], timeout=self._dispatch(provider))
+        except BaseException:
+            self._abandon(provider, waiter)
+            raise
+        token = _holding.set(_holding.get() | {provider})
+        try:
+            yield
+        finally:
+            _holding.reset(token)
+            self._release(provider)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per provider: in-flight requests, queue depth (now and peak), admissions and total wait."""
+        with self._lock:
+            return {
+                name: {
+                    "in_flight": state.in_flight,
+                    "queued": len(state.queue),
+                    "peak_queued": state.peak_queued,
+                    "admitted": state.admitted,
+                    "wait_seconds": state.wait_seconds,
+                }
+                for name, state in self._providers.items()
+            }
+
+    def _state(self, provider: str) -> _Provider:
+        state = self._providers.get(provider)
+        if state is None:
+            now = self._clock()
+            state = _Provider(
+                concurrency=max(1, self.concurrency_limits.get(provider, self.concurrency)),
+                requests=_bucket(self.rpm.get(provider), now),
+                tokens=_bucket(self.tpm.get(provider), now),
+            )
+            self._providers[provider] = state
+        return state
+
+    def _enqueue(self, provider: str, priority: int, tokens: int, wake: Callable[[], None]) -> _Waiter:
+        with self._lock:
+            state = self._state(provider)
+            waiter = _Waiter(priority, next(self._seq), tokens, wake, self._clock())
+            heapq.heappush(state.queue, waiter)
+            state.peak_queued = max(state.peak_queued, len(state.queue))
+            return waiter
+
+    def _dispatch(self, provider: str) -> Optional[float]:
+        """Admit queued requests while the budgets allow.
+
+        Returns how long until the buckets can take the head of the queue,
+        or None when only a finishing request can make room.
+        """
+        woken = []
+        delay = None
+        with self._lock:
+            state = self._state(provider)
+            while state.queue and state.in_flight < state.concurrency:
+                head = state.queue[0]
+                now = self._clock()
+                delay = _shortfall(state, head, now) or None
+                if delay:
+                    break
+                heapq.heappop(state.queue)
+                head.admitted = True
+                state.in_flight += 1
+                state.admitted += 1
+                state.wait_seconds += now - head.queued_at
+                woken.append(head.wake)
+        for wake in woken:
+            wake()
+        return delay
+
+    def _release(self, provider: str) -> None:
+        with self._lock:
+            self._state(provider).in_flight -= 1
+        self._dispatch(provider)
+
+    def _abandon(self, provider: str, waiter: _Waiter) -> None:
+        """The caller gave up (cancelled, interrupted): leave the queue or free the slot."""
+        with self._lock:
+            state = self._state(provider)
+            if not waiter.admitted:
+                state.queue.remove(waiter)
+                heapq.heapify(state.queue)
+                return
+        self._release(provider)
+
+
+def _bucket(per_minute: Optional[int], now: float) -> Optional[TokenBucket]:
+    if not per_minute:
+        return None
+    capacity = max(1.0, per_minute * BURST_SECONDS / 60)
+    return TokenBucket(rate=per_minute / 60, capacity=capacity, tokens=capacity, updated=now)
+
+
+def _shortfall(state: _Provider, waiter: _Waiter, now: float) -> float:
+    """Seconds until the buckets can admit `waiter`; at 0 its budget is taken."""
+    # A prompt larger than the whole bucket waits for a full one, not forever.
+    needs = [
+        (bucket, min(amount, bucket.capacity))
+        for bucket, amount in ((state.requests, 1), (state.tokens, waiter.tokens))
+        if bucket is not None
+    ]
+    delay = max((bucket.wait_time(now, amount) for bucket, amount in needs), default=0.0)
+    if not delay:
+        for bucket, amount in needs:
+            bucket.tokens -= amount
+    return delay
+
+
+_lock = threading.Lock()
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by every crew's LLMs."""
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(
+                concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+                concurrency_limits=parse_limits(os.getenv("LLM_PROVIDER_CONCURRENCY", "")),
+                rpm=parse_limits(os.getenv("LLM_PROVIDER_RPM", "")),
+                tpm=parse_limits(os.getenv("LLM_PROVIDER_TPM", "")),
+            )
+        return _scheduler
+
+
+def reset_llm_scheduler() -> None:
+    """Forget every provider's queue and budgets; env is re-read on next use."""
+    global _scheduler
+    with _lock:
+        _scheduler = None
+
+
+def agent_priority(name: str) -> int:
+    """Queue priority of the crew's agent `name` (LLM_AGENT_PRIORITY)."""
+    priorities = parse_limits(os.getenv("LLM_AGENT_PRIORITY", "editor=0,analyst=1,researcher=2"))
+    return priorities.get(name.lower(), DEFAULT_PRIORITY)
+
+
+def schedule_llm(llm: Any, priority: int = DEFAULT_PRIORITY) -> Any:
+    """Send `llm.call` / `llm.acall` through the shared scheduler; returns `llm`.
+
+    Apply before `cache_llm`, so cache hits skip the queue. None and an
+    already scheduled LLM come back unchanged.
+    """
+    if llm is None or getattr(llm, "_scheduled", False):
+        return llm
+    call, acall = llm.call, llm.acall
+    provider = provider_of(llm)
+
+    @functools.wraps(call)
+    def scheduled_call(messages, *args, **kwargs):
+        with get_llm_scheduler().slot(provider, priority, estimate_tokens(messages)):
+            return call(messages, *args, **kwargs)
+
+    @functools.wraps(acall)
+    async def scheduled_acall(messages, *args, **kwargs):
+        async with get_llm_scheduler().aslot(provider, priority, estimate_tokens(messages)):
+            return await acall(messages, *args, **kwargs)
+
+    object.__setattr__(llm, "call", scheduled_call)
+    object.__setattr__(llm, "acall", scheduled_acall)
+    object.__setattr__(llm, "_scheduled", True)
+    return llm
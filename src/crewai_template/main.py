@@ -9,6 +9,7 @@ CLI cheatsheet (run inside the container — `docker compose run --rm crew …`)
     crewai replay -t <task_id>  # re-run starting from a stored task
     crewai reset-memories --all # wipe short/long/entity memory
     crewai chat                 # interactive REPL with the crew
+    batch inputs.jsonl [out]    # many kickoffs concurrently (see batch.py)
 
 Don't add business logic here — that belongs in `crew.py`.
 """
@@ -21,6 +22,7 @@ from datetime import datetime
 
 # Importing this module auto-registers the ConsoleListener event listener.
 from crewai_template import observability  # noqa: F401
+from crewai_template.batch import run_batch_file
 from crewai_template.crew import CrewaiTemplate
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -36,7 +38,7 @@ def run() -> object:
     logger.info("kickoff inputs: %s", inputs)
     # Alternatives:
     #   await CrewaiTemplate().crew().kickoff_async(inputs=inputs)
-    #   CrewaiTemplate().crew().kickoff_for_each([{"topic": t} for t in topics])
+    #   many topics at once → batch() below
     return CrewaiTemplate().crew().kickoff(inputs=inputs)
 
 
@@ -65,5 +67,14 @@ def test() -> None:
     )
 
 
+def batch() -> None:
+    """`batch <inputs.jsonl> [results.jsonl]` — one kickoff per input line, BATCH_CONCURRENCY at a time."""
+    if len(sys.argv) < 2:
+        sys.exit("usage: batch <inputs.jsonl> [results.jsonl]")
+    output = sys.argv[2] if len(sys.argv) > 2 else "results.jsonl"
+    counts = run_batch_file(sys.argv[1], output)
+    logger.info("batch finished: %d ok, %d failed → %s", counts["ok"], counts["error"], output)
+
+
 if __name__ == "__main__":
     run()
@@ -0,0 +1,141 @@
+"""Provider prompt caching for the crew's static agent and task prompts.
+
+Every LLM call of every run resends each agent's role, goal and backstory
+(the system prompt) and its task's long instructions. Providers can serve
+a repeated prompt prefix from cache at a fraction of the input price, but
+only if the prefix is byte-identical and, for Anthropic, ends at a
+`cache_control` breakpoint. So:
+
+- the YAML configs keep run inputs out of the static text. Agent roles,
+  goals and backstories contain no `{topic}`, and each task description
+  opens with its instructions and names the topic only at the end;
+- crewAI marks the end of the system prompt and of the task prompt as
+  breakpoints (`crewai.llms.cache.mark_cache_breakpoint`). The task
+  prompt's breakpoint only helps within one task's tool loop, because
+  the prompt contains the topic and the upstream context;
+- `cache_static_prompts(llm)` adds one breakpoint where the task
+  template's static head ends. For Anthropic it splits the task prompt
+  there into two user turns, which the API joins back into one, with the
+  first marked for caching. The instructions are then cached across
+  runs and topics. OpenAI and Gemini cache matching prefixes
+  automatically, so for them the stable ordering is enough, and the
+  messages are passed through untouched.
+
+`cached_token_usage(agents, baseline)` reports each agent's prompt and
+cached-prompt tokens for a kickoff; the crew prints it afterwards.
+Anthropic only caches prefixes of 1024 tokens or more (2048 on Haiku),
+tools and system prompt included, and the cache lives five minutes.
+
+Tuning (env vars):
+    PROMPT_CACHE  0 → leave prompts as crewAI builds them (default 1)
+"""
+from __future__ import annotations
+
+import functools
+import os
+from typing import Any
+
+from crewai.llms.cache import CACHE_BREAKPOINT_KEY, mark_cache_breakpoint
+from crewai.types.usage_metrics import UsageMetrics
+
+from crewai_template.llm_scheduler import provider_of
+
+EXPLICIT_CACHE_PROVIDERS = frozenset({"anthropic"})
+
+
+def static_head(task: Any) -> str:
+    """The part of `task`'s description template before its first `{input}`."""
+    template = getattr(task, "_original_description", None) or getattr(task, "description", "") or ""
+    return template.split("{", 1)[0]
+
+
+def split_static_prefix(messages: Any, head: str) -> Any:
+    """`messages` with the first user turn containing `head` split after it.
+
+    The first part is marked as a cache breakpoint; the second keeps the
+    original turn's other keys, breakpoint included. Anything else comes
+    back as is.
+    """
+    if not head.strip() or not isinstance(messages, list):
+        return messages
+    for i, message in enumerate(messages):
+        if not isinstance(message, dict) or message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if not isinstance(content, str):
+            continue
+        end = content.find(head)
+        if end == -1:
+            continue
+        end += len(head)
+        if end >= len(content):
+            return messages  # the whole turn is static; crewAI's own breakpoint covers it
+        static = mark_cache_breakpoint({"role": "user", "content": content[:end]})
+        return [*messages[:i], static, {**message, "content": content[end:]}, *messages[i + 1:]]
+    return messages
+
+
+def cache_static_prompts(llm: Any) -> Any:
+    """Mark the static head of each task prompt sent through `llm`; returns `llm`.
+
+    Apply before `schedule_llm` and `cache_llm`. Only providers with
+    explicit cache breakpoints are wrapped; None, other providers and an
+    already wrapped LLM come back unchanged.
+    """
+    if (
+        llm is None
+        or getattr(llm, "_static_prompts", False)
+        or provider_of(llm) not in EXPLICIT_CACHE_PROVIDERS
+        or os.getenv("PROMPT_CACHE", "1") != "1"
+    ):
+        return llm
+    call, acall = llm.call, llm.acall
+
+    @functools.wraps(call)
+    def caching_call(messages, *args, **kwargs):
+        return call(_split_for(messages, _from_task(args, kwargs)), *args, **kwargs)
+
+    @functools.wraps(acall)
+    async def caching_acall(messages, *args, **kwargs):
+        return await acall(_split_for(messages, _from_task(args, kwargs)), *args, **kwargs)
+
+    object.__setattr__(llm, "call", caching_call)
+    object.__setattr__(llm, "acall", caching_acall)
+    object.__setattr__(llm, "_static_prompts", True)
+    return llm
+
+
+def _from_task(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    # call(messages, tools, callbacks, available_functions, from_task, ...); cache_llm passes them by position.
+    return kwargs["from_task"] if "from_task" in kwargs else (args[3] if len(args) > 3 else None)
+
+
+def _split_for(messages: Any, task: Any) -> Any:
+    if task is None or not any(isinstance(m, dict) and m.get(CACHE_BREAKPOINT_KEY) for m in messages or ()):
+        return messages  # only prompts crewAI built for a task carry breakpoints
+    return split_static_prefix(messages, static_head(task))
+
+
+def usage_snapshot(agents: dict[str, Any]) -> dict[str, UsageMetrics]:
+    """Each agent's lifetime LLM usage so far, to diff a kickoff against."""
+    return {name: _usage(agent) for name, agent in agents.items()}
+
+
+def cached_token_usage(agents: dict[str, Any], baseline: dict[str, UsageMetrics]) -> dict[str, dict[str, Any]]:
+    """Prompt, cached and cache-write tokens per agent since `baseline`."""
+    report = {}
+    for name, agent in agents.items():
+        usage = _usage(agent).delta_since(baseline.get(name, UsageMetrics()))
+        report[name] = {
+            "prompt_tokens": usage.prompt_tokens,
+            "cached_prompt_tokens": usage.cached_prompt_tokens,
+            "cache_creation_tokens": usage.cache_creation_tokens,
+            "cached_share": usage.cached_prompt_tokens / usage.prompt_tokens if usage.prompt_tokens else 0.0,
+        }
+    return report
+
+
+def _usage(agent: Any) -> UsageMetrics:
+    llm = getattr(agent, "llm", None)
+    summary = getattr(llm, "get_token_usage_summary", None)
+    return summary() if summary is not None else UsageMetrics()
@@ -0,0 +1,275 @@
+"""Repair near-miss structured output locally instead of re-generating it.
+
+When the analyst's output fails `AnalysisReport` validation, for example
+with a `confidence` of 1.2, a finding without evidence, or JSON wrapped
+in prose, crewAI's converter sends the whole text back through the LLM.
+`RepairingConverter` (the analysis task's `converter_cls`) tries
+cheaper fixes first:
+
+1. tolerant extraction: the first JSON object in the text, after
+   stripping code fences, trailing commas and Python literals;
+2. schema-guided coercion: numeric strings and percentages become
+   numbers, and values outside a field's `ge`/`le` bounds are clamped
+   (85 → 0.85 for a 0–1 field). A lone item becomes a one-item list;
+3. a patch prompt: when fields are still invalid or missing, the LLM is
+   asked for those fields only, by path, and its answer is merged in.
+
+Only if all of that fails does the converter fall back to crewAI's full
+re-conversion. `get_repair_stats()` counts each outcome, and its
+`retries_avoided` figure is what the crew prints after a kickoff.
+
+Tuning (env vars):
+    REPAIR_PATCH_ATTEMPTS  patch prompts before falling back (default 1)
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import typing
+from typing import Any, Optional
+
+from annotated_types import Ge, Le
+from crewai.utilities.converter import Converter
+from pydantic import BaseModel, ValidationError
+
+_FENCE = re.compile(r"```[a-zA-Z]*\n?|```")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_NUMBER = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(%?)\s*$")
+
+# (validated model or None, the document so far, why it failed)
+_Attempt = tuple[Optional[BaseModel], Any, Optional[ValidationError]]
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """The first JSON object in `text`, tolerating fences and common slips, or None."""
+    text = _FENCE.sub("", text)
+    start = text.find("{")
+    while start != -1:
+        candidate = _balanced(text, start)
+        if candidate is not None:
+            for attempt in (candidate, _loosen(candidate)):
+                try:
+                    return json.loads(attempt, strict=False)
+                except json.JSONDecodeError:
+                    pass
+        start = text.find("{", start + 1)
+    return None
+
+
+def coerce(data: Any, model: type[BaseModel]) -> Any:
+    """`data` nudged toward `model`'s schema; anything it can't fix is left for validation."""
+    if not isinstance(data, dict):
+        return data
+    fixed = dict(data)
+    for name, field in model.model_fields.items():
+        if name in fixed:
+            fixed[name] = _coerce_value(fixed[name], field.annotation, field.metadata)
+    return fixed
+
+
+def invalid_paths(error: ValidationError) -> dict[str, str]:
+    """`{"findings.1.evidence": "Field required", ...}` from a validation error."""
+    return {".".join(str(part) for part in e["loc"]): e["msg"] for e in error.errors()}
+
+
+def apply_patch(data: dict[str, Any], patch: Any) -> dict[str, Any]:
+    """Set each `"a.0.b": value` of `patch` in a copy of `data`."""
+    data = json.loads(json.dumps(data))
+    if not isinstance(patch, dict):
+        return data
+    for path, value in patch.items():
+        *parents, leaf = [int(p) if p.isdigit() else p for p in str(path).split(".")]
+        node: Any = data
+        try:
+            for part in parents:
+                node = node[part]
+            if isinstance(node, list) and isinstance(leaf, int) and leaf == len(node):
+                node.append(value)
+            else:
+                node[leaf] = value
+        except (KeyError, IndexError, TypeError):
+            continue
+    return data
+
+
+class RepairStats:
+    """Counts how each structured output was obtained."""
+
+    OUTCOMES = ("valid", "repaired", "patched", "fallback")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.OUTCOMES, 0)
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counts, "retries_avoided": self._counts["repaired"] + self._counts["patched"]}
+
+
+class RepairingConverter(Converter):
+    """crewAI `Converter` that repairs locally and patches by field before re-converting."""
+
+    def to_pydantic(self, current_attempt: int = 1) -> BaseModel:
+        if current_attempt > 1:  # crewAI retrying its own full conversion
+            return super().to_pydantic(current_attempt)
+        model, data, error = self._local()
+        if model is not None:
+            return model
+        for _ in range(_patch_attempts(data)):
+            model, data, error = self._patched(data, self.llm.call(self._patch_messages(data, error)))
+            if model is not None:
+                return model
+        get_repair_stats().record("fallback")
+        return super().to_pydantic(current_attempt)
+
+    async def ato_pydantic(self, current_attempt: int = 1) -> BaseModel:
+        if current_attempt > 1:
+            return await super().ato_pydantic(current_attempt)
+        model, data, error = self._local()
+        if model is not None:
+            return model
+        for _ in range(_patch_attempts(data)):
+            model, data, error = self._patched(data, await self.llm.acall(self._patch_messages(data, error)))
+            if model is not None:
+                return model
+        get_repair_stats().record("fallback")
+        return await super().ato_pydantic(current_attempt)
+
+    def _local(self) -> _Attempt:
+        data = extract_json(self.text)
+        if data is None:
+            return None, None, None
+        try:
+            model = self.model.model_validate(data)
+            get_repair_stats().record("valid")
+            return model, data, None
+        except ValidationError:
+            return self._validate(coerce(data, self.model), "repaired")
+
+    def _patched(self, data: dict[str, Any], response: Any) -> _Attempt:
+        patch = response.model_dump() if isinstance(response, BaseModel) else extract_json(str(response))
+        return self._validate(coerce(apply_patch(data, patch), self.model), "patched")
+
+    def _validate(self, data: Any, outcome: str) -> _Attempt:
+        try:
+            model = self.model.model_validate(data)
+        except ValidationError as e:
+            return None, data, e
+        get_repair_stats().record(outcome)
+        return model, data, None
+
+    def _patch_messages(self, data: dict[str, Any], error: ValidationError) -> list[dict[str, str]]:
+        problems = "\n".join(f"- {path}: {msg}" for path, msg in invalid_paths(error).items())
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "You fix individual fields of a JSON document. Reply with one JSON object that maps "
+                    "each listed field path to its corrected value, and nothing else."
+                ),
+            },
+            {
+                "role": "user",
+                "content": (
+                    f"Schema:\n{json.dumps(self.model.model_json_schema())}\n\n"
+                    f"Document:\n{json.dumps(data, ensure_ascii=False)}\n\n"
+                    f"Fields to fix:\n{problems}"
+                ),
+            },
+        ]
+
+
+def _patch_attempts(data: Any) -> int:
+    # Without a document to patch there is nothing to ask for field by field.
+    return int(os.getenv("REPAIR_PATCH_ATTEMPTS", 1)) if isinstance(data, dict) else 0
+
+
+def _balanced(text: str, start: int) -> Optional[str]:
+    """The `{...}` starting at `start`, matching braces outside strings."""
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _loosen(candidate: str) -> str:
+    candidate = _TRAILING_COMMA.sub(r"\1", candidate)
+    return re.sub(r"\b(True|False|None)\b", lambda m: _PY_LITERALS[m.group(1)], candidate)
+
+
+def _coerce_value(value: Any, annotation: Any, metadata: list[Any]) -> Any:
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        (item_type,) = typing.get_args(annotation) or (Any,)
+        items = value if isinstance(value, list) else [value]
+        return [_coerce_value(item, item_type, []) for item in items]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return coerce(value, annotation)
+    if annotation is float or annotation is int:
+        return _coerce_number(value, annotation, metadata)
+    if annotation is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _coerce_number(value: Any, kind: type, metadata: list[Any]) -> Any:
+    percent = False
+    if isinstance(value, str):
+        match = _NUMBER.match(value)
+        if not match:
+            return value
+        value, percent = float(match.group(1)), bool(match.group(2))
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    low = next((m.ge for m in metadata if isinstance(m, Ge)), None)
+    high = next((m.le for m in metadata if isinstance(m, Le)), None)
+    # A 0–1 score given as a percentage ("85%", or a whole number like 85).
+    if (percent or (value > 1 and float(value).is_integer())) and low == 0 and high == 1 and value <= 100:
+        value = value / 100
+    if low is not None:
+        value = max(low, value)
+    if high is not None:
+        value = min(high, value)
+    return kind(value)
+
+
+_lock = threading.Lock()
+_stats: Optional[RepairStats] = None
+
+
+def get_repair_stats() -> RepairStats:
+    """Process-wide repair counters."""
+    global _stats
+    with _lock:
+        if _stats is None:
+            _stats = RepairStats()
+        return _stats
+
+
+def reset_repair_stats() -> None:
+    """Zero the counters."""
+    global _stats
+    with _lock:
+        _stats = None
@@ -0,0 +1,93 @@
+"""Where task outputs land: one file per run, written atomically, or memory only.
+
+`report_task`'s `output_file` is templated on `run_id`
+(`reports/{run_id}/report.md`), and crewAI fills it in from the kickoff
+inputs. Concurrent kickoffs in one working directory each get their own
+file. `ReportTask` changes how the file is written:
+
+- file mode (default): the output goes to a temp file in the target
+  directory and is moved into place with `os.replace`. Readers see the
+  previous report or the whole new one, never half a file.
+- memory mode (REPORT_OUTPUT=memory): nothing touches the filesystem.
+  The output is kept in process under its interpolated path, for
+  services that return the report themselves; read it with
+  `get_report(path)`.
+
+Tuning (env vars):
+    REPORT_OUTPUT          "file" (default) or "memory"
+    REPORT_MEMORY_ENTRIES  reports kept in memory mode, oldest dropped first (256)
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from crewai_template.compaction import CompactContextTask
+
+
+def in_memory() -> bool:
+    return os.getenv("REPORT_OUTPUT", "file").lower() == "memory"
+
+
+def write_atomic(path: str | Path, content: str) -> None:
+    """Replace `path` with `content` in one step (temp file + `os.replace`)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
+class ReportTask(CompactContextTask):
+    """A `Task` whose `output_file` is written atomically, or kept in memory.
+
+    Its context is compacted like any `CompactContextTask`'s.
+    """
+
+    def _save_file(self, result: Any) -> None:
+        if self.output_file is None:
+            raise ValueError("output_file is not set.")
+        content = json.dumps(result, ensure_ascii=False, indent=2) if isinstance(result, dict) else str(result)
+        if in_memory():
+            _store(self.output_file, content)
+            return
+        try:
+            write_atomic(self.output_file, content)
+        except OSError as e:
+            raise RuntimeError(f"Failed to save output file: {e}") from e
+
+
+_lock = threading.Lock()
+_reports: OrderedDict[str, str] = OrderedDict()
+
+
+def _store(path: str, content: str) -> None:
+    with _lock:
+        _reports[path] = content
+        _reports.move_to_end(path)
+        while len(_reports) > int(os.getenv("REPORT_MEMORY_ENTRIES", 256)):
+            _reports.popitem(last=False)
+
+
+def get_report(path: str) -> Optional[str]:
+    """A report kept in memory mode, by its interpolated `output_file`."""
+    with _lock:
+        return _reports.get(path)
+
+
+def reset_reports() -> None:
+    """Drop every report kept in memory."""
+    with _lock:
+        _reports.clear()
@@ -1,7 +1,9 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+from crewai_template.guardrails import report_guardrails
+
 
 class KeyFinding(BaseModel):
     title: str = Field(..., description="Headline of the finding.")
@@ -15,10 +17,11 @@ class AnalysisReport(BaseModel):
     recommendations: list[str]
 
 
+def report_prefix_problem(text: str) -> Optional[str]:
+    """Why a report starting with `text` is bound to fail the guardrail, or None."""
+    return report_guardrails.prefix_problem(text)
+
+
 def ensure_markdown_report(result) -> Tuple[bool, str]:
-    text = (getattr(result, "raw", None) or str(result)) or ""
-    if "# " not in text:
-        return False, "Report must include at least one '# ' markdown heading."
-    if len(text) < 200:
-        return False, f"Report is too short ({len(text)} chars). Expand to ≥200 chars."
-    return True, text
+    """Every rule in `guardrails.report_guardrails`, with all failures in one message."""
+    return report_guardrails(result)
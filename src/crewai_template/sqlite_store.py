@@ -0,0 +1,82 @@
+"""Plumbing shared by the SQLite-backed caches (scrape, LLM and tool results).
+
+Each cache owns its table and its notion of expiry; this module has what
+they do identically:
+
+- `connect(path, schema, version)` opens the file in WAL mode and rebuilds
+  the tables when the file was written by another schema version;
+- `evict_lru(conn, table, key, max_bytes)` deletes least-recently-used
+  rows until the table's `size` column fits the bound;
+- `SharedStore(open)` is the lazily opened, process-wide instance behind
+  each cache's `get_*` / `reset_*` pair.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Generic, Optional, Protocol, TypeVar
+
+
+def connect(path: str | Path, schema: str, version: int) -> sqlite3.Connection:
+    """Autocommit WAL connection usable from any thread, with `schema` at `version`.
+
+    `schema` must drop and recreate its tables: a file from an older (or
+    newer) version is rebuilt empty rather than migrated.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != version:
+        conn.executescript(schema + f"PRAGMA user_version = {version};")
+    return conn
+
+
+def evict_lru(conn: sqlite3.Connection, table: str, key: str, max_bytes: int) -> None:
+    """Delete `table`'s least recently accessed rows until SUM(size) <= `max_bytes`.
+
+    `table` needs `size` and `accessed_at` columns; the caller holds its lock.
+    """
+    (total,) = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()
+    if total <= max_bytes:
+        return
+    excess = total - max_bytes
+    victims = []
+    for row_key, size in conn.execute(f"SELECT {key}, size FROM {table} ORDER BY accessed_at"):
+        victims.append((row_key,))
+        excess -= size
+        if excess <= 0:
+            break
+    conn.executemany(f"DELETE FROM {table} WHERE {key} = ?", victims)
+
+
+class _Closable(Protocol):
+    def close(self) -> None: ...
+
+
+T = TypeVar("T", bound=_Closable)
+
+
+class SharedStore(Generic[T]):
+    """One store per process, opened on first use; `open()` may return None (disabled)."""
+
+    def __init__(self, open: Callable[[], Optional[T]]) -> None:
+        self._open = open
+        self._lock = threading.Lock()
+        self._store: Optional[T] = None
+        self._opened = False
+
+    def get(self) -> Optional[T]:
+        with self._lock:
+            if not self._opened:
+                self._opened = True
+                self._store = self._open()
+            return self._store
+
+    def reset(self) -> None:
+        """Close the store; the next `get()` opens it again from the current env."""
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+            self._store, self._opened = None, False
@@ -0,0 +1,335 @@
+"""Stream the report to readers while the editor is still writing it.
+
+Without streaming, nothing is visible until the editor's whole generation
+(plus any guardrail retries) is done. `ReportStream` switches the report
+task's LLM to streaming and forwards the report text to sinks as tokens
+arrive:
+
+- `ConsoleSink` prints to stdout;
+- `FileSink` tails into `<output_file>.partial` next to the report;
+- `AsyncIteratorSink` hands `StreamEvent`s to an `async for` loop, e.g.
+  one feeding a web response.
+
+Only the answer is forwarded. Planning passes and the "Thought: ..."
+preamble of the ReAct format are held back until "Final Answer:" (or a
+leading '# ' title) shows where the report begins. Each LLM call is one
+attempt. The text so far is checked against `schemas.report_prefix_problem`
+(the prefix rules of guardrails.py) as it grows, and an attempt that can
+no longer pass the guardrail is discarded at once. So is one the
+guardrail rejects when it completes, before its retry starts streaming.
+
+With `abort=True` a doomed attempt also stops generating: the chunk
+handler raises `GuardrailAbort` inside the provider's stream, which
+closes it, and the LLM call returns the partial text. The task guardrail
+then rejects that text with the rule's message, and the retry is steered
+by that feedback. No full Opus generation is spent on a draft that was
+rejected in its first few hundred characters.
+
+The report file itself is committed once, atomically, after the guardrail
+passes (`reports.ReportTask`); sinks are then closed with the final text.
+A kickoff served from the LLM cache streams nothing, and its sinks get the
+final text in one piece.
+
+Tuning (env vars):
+    REPORT_STREAM       sinks for the crew's report, e.g. "stdout" or "stdout,file"
+                        (default off)
+    REPORT_EARLY_ABORT  1 → stop generating a report draft that is bound to
+                        fail the guardrail (default 1)
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator, NamedTuple, Optional, TextIO
+
+from crewai.events import LLMStreamChunkEvent, TaskCompletedEvent, TaskFailedEvent, crewai_event_bus
+
+from crewai_template.schemas import report_prefix_problem
+
+FINAL_ANSWER = "Final Answer:"
+
+PrefixCheck = Callable[[str], Optional[str]]
+
+
+class GuardrailAbort(BaseException):
+    """Raised from the stream handler to stop a doomed generation.
+
+    A BaseException so the event bus (which reports handler Exceptions)
+    and the provider's error handling let it through to the LLM call.
+    """
+
+    def __init__(self, problem: str, partial: str) -> None:
+        super().__init__(problem)
+        self.partial = partial
+
+
+class StreamSink:
+    """Receives one task's report as it is generated; override what you need.
+
+    Per attempt: `begin`, any number of `write`s, then `discard` when it
+    won't be the report. After the last attempt: `close(final_text)`,
+    with None when the task failed.
+    """
+
+    def begin(self, task: Any) -> None:
+        pass
+
+    def write(self, text: str) -> None:
+        pass
+
+    def discard(self, reason: str) -> None:
+        pass
+
+    def close(self, text: Optional[str]) -> None:
+        pass
+
+
+class ConsoleSink(StreamSink):
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream or sys.stdout
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+
+    def discard(self, reason: str) -> None:
+        self.write(f"\n\n[draft discarded: {reason}]\n\n")
+
+    def close(self, text: Optional[str]) -> None:
+        self.write("\n")
+
+
+class FileSink(StreamSink):
+    """Writes each attempt to `<output_file>.partial` and removes it at the end."""
+
+    def __init__(self) -> None:
+        self.path: Optional[Path] = None
+        self._file: Optional[TextIO] = None
+
+    def begin(self, task: Any) -> None:
+        self.path = Path(f"{task.output_file}.partial")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+
+    def discard(self, reason: str) -> None:
+        self._file.close()
+        self._file = None
+
+    def close(self, text: Optional[str]) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class StreamEvent(NamedTuple):
+    kind: str  # "text", "discard" (drop the text so far), "done" or "failed"
+    text: str
+
+
+class AsyncIteratorSink(StreamSink):
+    """`async for event in sink` on `loop`; ends after "done" or "failed"."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue[StreamEvent] = asyncio.Queue()
+
+    def write(self, text: str) -> None:
+        self._put(StreamEvent("text", text))
+
+    def discard(self, reason: str) -> None:
+        self._put(StreamEvent("discard", reason))
+
+    def close(self, text: Optional[str]) -> None:
+        self._put(StreamEvent("failed", "") if text is None else StreamEvent("done", text))
+
+    async def __aiter__(self) -> AsyncIterator[StreamEvent]:
+        while True:
+            event = await self._queue.get()
+            yield event
+            if event.kind in ("done", "failed"):
+                return
+
+    def _put(self, event: StreamEvent) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+
+class ReportStream:
+    """Forwards one task's streamed answer to sinks, attempt by attempt."""
+
+    def __init__(
+        self,
+        task: Any,
+        sinks: list[StreamSink],
+        check: PrefixCheck = report_prefix_problem,
+        abort: bool = False,
+    ) -> None:
+        self.task = task
+        self.sinks = sinks
+        self.check = check
+        self.abort = abort
+        self._lock = threading.Lock()
+        self._call: Optional[str] = None
+        self._buffer = ""
+        self._start: Optional[int] = None
+        self._sent = 0
+        self._open = False
+
+    def attach(self) -> "ReportStream":
+        """Turn on streaming for the task's LLM and start listening."""
+        llm = getattr(getattr(self.task, "agent", None), "llm", None)
+        if llm is not None:
+            llm.stream = True
+            if self.abort:
+                _return_partial_on_abort(llm)
+        crewai_event_bus.on(LLMStreamChunkEvent)(self._on_chunk)
+        crewai_event_bus.on(TaskCompletedEvent)(self._on_completed)
+        crewai_event_bus.on(TaskFailedEvent)(self._on_failed)
+        return self
+
+    def detach(self) -> None:
+        crewai_event_bus.off(LLMStreamChunkEvent, self._on_chunk)
+        crewai_event_bus.off(TaskCompletedEvent, self._on_completed)
+        crewai_event_bus.off(TaskFailedEvent, self._on_failed)
+
+    def feed(self, call_id: str, chunk: str) -> None:
+        """One streamed chunk of LLM call `call_id`."""
+        with self._lock:
+            if call_id != self._call:
+                self._discard("the guardrail rejected this draft; retrying")
+                self._call, self._buffer, self._start, self._sent = call_id, "", None, 0
+            elif self._start == -1:
+                return  # this attempt is already discarded
+            self._buffer += chunk
+            if self._start is None:
+                self._start = _answer_start(self._buffer)
+                if self._start is None:
+                    return
+            answer = self._buffer[self._start:].lstrip()
+            problem = self.check(answer)
+            if problem:
+                self._discard(problem)
+                self._start = -1
+                if self.abort:
+                    raise GuardrailAbort(problem, self._buffer)
+                return
+            if not answer:
+                return
+            if not self._open:
+                self._each("begin", self.task)
+                self._open = True
+            self._each("write", answer[self._sent:])
+            self._sent = len(answer)
+
+    def finish(self, text: Optional[str]) -> None:
+        """The task is over: `text` passed the guardrail, or None when it failed."""
+        with self._lock:
+            if text is not None and not self._sent:
+                # Nothing was streamed (a cache hit, or every draft discarded).
+                self._each("begin", self.task)
+                self._each("write", text)
+            elif text is None:
+                self._discard("the task failed")
+            self._each("close", text)
+            self._open = False
+
+    def _on_chunk(self, _source: Any, event: LLMStreamChunkEvent) -> None:
+        if event.task_id == str(self.task.id) and event.tool_call is None and event.chunk:
+            self.feed(event.call_id, event.chunk)
+
+    def _on_completed(self, _source: Any, event: TaskCompletedEvent) -> None:
+        if event.task_id == str(self.task.id):
+            self.finish(getattr(event.output, "raw", None) or str(event.output))
+            self.detach()
+
+    def _on_failed(self, _source: Any, event: TaskFailedEvent) -> None:
+        if event.task_id == str(self.task.id):
+            self.finish(None)
+            self.detach()
+
+    def _discard(self, reason: str) -> None:
+        if self._open:
+            self._each("discard", reason)
+            self._open = False
+        self._sent = 0
+
+    def _each(self, method: str, *args: Any) -> None:
+        for sink in self.sinks:
+            getattr(sink, method)(*args)
+
+
+def _answer_start(text: str) -> Optional[int]:
+    """Where the answer begins in an LLM call's output, or None if not known yet."""
+    marker = text.find(FINAL_ANSWER)
+    if marker != -1:
+        return marker + len(FINAL_ANSWER)
+    if text.lstrip().startswith("# "):
+        return 0
+    return None
+
+
+def _return_partial_on_abort(llm: Any) -> None:
+    """Make `llm.call` / `llm.acall` return the partial text when a stream is aborted."""
+    if getattr(llm, "_guardrail_abort", False):
+        return
+    call, acall = llm.call, llm.acall
+
+    @functools.wraps(call)
+    def aborting_call(messages, *args, **kwargs):
+        try:
+            return call(messages, *args, **kwargs)
+        except GuardrailAbort as e:
+            return e.partial
+
+    @functools.wraps(acall)
+    async def aborting_acall(messages, *args, **kwargs):
+        try:
+            return await acall(messages, *args, **kwargs)
+        except GuardrailAbort as e:
+            return e.partial
+
+    object.__setattr__(llm, "call", aborting_call)
+    object.__setattr__(llm, "acall", aborting_acall)
+    object.__setattr__(llm, "_guardrail_abort", True)
+
+
+def sinks_from_env() -> list[StreamSink]:
+    """Sinks named in REPORT_STREAM ("stdout", "file")."""
+    factories = {"stdout": ConsoleSink, "file": FileSink}
+    sinks = []
+    for name in filter(None, (part.strip().lower() for part in os.getenv("REPORT_STREAM", "").split(","))):
+        if name == "off":
+            continue
+        if name not in factories:
+            raise ValueError(f"unknown REPORT_STREAM sink {name!r} (expected one of {', '.join(factories)})")
+        sinks.append(factories[name]())
+    return sinks
+
+
+def early_abort() -> bool:
+    return os.getenv("REPORT_EARLY_ABORT", "1") == "1"
+
+
+@contextmanager
+def stream_report(
+    task: Any,
+    sinks: list[StreamSink],
+    check: PrefixCheck = report_prefix_problem,
+    abort: bool = False,
+) -> Iterator[ReportStream]:
+    """Stream `task`'s report to `sinks` for the duration of the block."""
+    stream = ReportStream(task, sinks, check, abort).attach()
+    try:
+        yield stream
+    finally:
+        stream.detach()
@@ -1,8 +1,9 @@
 from crewai_template.tools.custom_tool import character_count, word_count
 from crewai_template.tools.data_analyzer import DataAnalyzerTool
-from crewai_template.tools.web_scraper import WebScraperTool
+from crewai_template.tools.web_scraper import BatchWebScraperTool, WebScraperTool
 
 __all__ = [
+    "BatchWebScraperTool",
     "DataAnalyzerTool",
     "WebScraperTool",
     "character_count",
@@ -1,17 +1,33 @@
-import json
 import logging
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Type
+from typing import Optional, Type
 
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from crewai_template.tools.dataset import DATE, NUMERIC, TABULAR, Dataset, load_dataset
+from crewai_template.tools.dataset_files import load_file
+from crewai_template.tools.trends import TrendSummary, summarize
 
 logger = logging.getLogger(__name__)
 
+_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_PERCENT = re.compile(r'\b\d+%\b')
+_CURRENCY = re.compile(r'\$\d+')
+
 class DataAnalyzerInput(BaseModel):
     """Input schema for DataAnalyzerTool."""
-    data: str = Field(..., description="Data to analyze (JSON, CSV format, or structured text)")
+    data: Optional[str] = Field(
+        default=None,
+        description="Data to analyze inline (JSON, CSV format, or structured text). Omit when using file_path."
+    )
+    file_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Path to a local data file (CSV/TSV, JSONL, Parquet, Feather) to analyze instead of inline data. "
+            "Prefer this for anything larger than a few rows."
+        )
+    )
     analysis_type: str = Field(
         default="summary",
         description="Type of analysis: 'summary', 'trends', 'patterns', 'statistics', or 'insights'"
@@ -21,16 +37,29 @@ class DataAnalyzerInput(BaseModel):
         description="Specific area to focus the analysis on"
     )
 
+    @model_validator(mode="after")
+    def _one_source(self) -> "DataAnalyzerInput":
+        if (self.data is None) == (self.file_path is None):
+            raise ValueError("Provide exactly one of 'data' or 'file_path'")
+        return self
+
 class DataAnalyzerTool(BaseTool):
     name: str = "Advanced Data Analyzer"
     description: str = (
         "Analyzes structured and unstructured data to extract insights, identify patterns, "
         "and generate statistical summaries. Supports multiple analysis types including "
-        "trend analysis, pattern recognition, and comprehensive data insights."
+        "trend analysis, pattern recognition, and comprehensive data insights. "
+        "Pass local files by path (file_path) rather than pasting their contents."
     )
     args_schema: Type[BaseModel] = DataAnalyzerInput
 
-    def _run(self, data: str, analysis_type: str = "summary", focus_area: Optional[str] = None) -> str:
+    def _run(
+        self,
+        data: Optional[str] = None,
+        analysis_type: str = "summary",
+        focus_area: Optional[str] = None,
+        file_path: Optional[str] = None,
+    ) -> str:
         """
         Analyze data and return insights based on the specified analysis type.
 
@@ -38,6 +67,7 @@ class DataAnalyzerTool(BaseTool):
             data: The data to analyze (JSON, CSV, or structured text)
             analysis_type: Type of analysis to perform
             focus_area: Specific area to focus on
+            file_path: Local data file to analyze instead of `data`
 
         Returns:
             Formatted analysis results with insights and recommendations
@@ -45,30 +75,28 @@ class DataAnalyzerTool(BaseTool):
         try:
             logger.info(f"Starting {analysis_type} analysis on data")
 
-            # Parse the data
-            parsed_data = self._parse_data(data)
-
-            # Perform analysis based on type
-            if analysis_type == "summary":
-                result = self._generate_summary(parsed_data, focus_area)
-            elif analysis_type == "trends":
-                result = self._analyze_trends(parsed_data, focus_area)
-            elif analysis_type == "patterns":
-                result = self._identify_patterns(parsed_data, focus_area)
-            elif analysis_type == "statistics":
-                result = self._calculate_statistics(parsed_data, focus_area)
-            elif analysis_type == "insights":
-                result = self._extract_insights(parsed_data, focus_area)
+            # Parsed + profiled once per distinct input; see tools/dataset.py
+            if file_path is not None:
+                dataset = load_file(file_path)
+            elif data is not None:
+                dataset = load_dataset(data)
             else:
-                result = self._generate_summary(parsed_data, focus_area)
+                raise ValueError("Provide either data or file_path")
+
+            key = (analysis_type, focus_area)
+            result = dataset.results.get(key)
+            if result is None:
+                result = self._analyze(dataset, analysis_type, focus_area)
+                dataset.results[key] = result
 
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # No timestamp: the report is part of the analyst's next prompt, and
+            # identical data must give an identical prompt for the LLM cache to hit.
+            source = f"\nSource: {file_path}" if file_path else ""
 
             return f"""
 📊 Data Analysis Report
-Generated: {timestamp}
 Analysis Type: {analysis_type.title()}
-Focus Area: {focus_area or 'General'}
+Focus Area: {focus_area or 'General'}{source}
 
 {result}
 
@@ -81,32 +109,25 @@ Focus Area: {focus_area or 'General'}
             logger.error(error_msg)
             return error_msg
 
-    def _parse_data(self, data: str) -> Dict[str, Any]:
-        """Parse input data into a structured format."""
-        try:
-            # Try parsing as JSON first
-            return {"type": "json", "content": json.loads(data)}
-        except json.JSONDecodeError:
-            # Try parsing as CSV-like data
-            lines = data.strip().split('\n')
-            if len(lines) > 1 and (',' in lines[0] or '\t' in lines[0]):
-                separator = ',' if ',' in lines[0] else '\t'
-                headers = [h.strip() for h in lines[0].split(separator)]
-                rows = []
-                for line in lines[1:]:
-                    if line.strip():
-                        rows.append([cell.strip() for cell in line.split(separator)])
-                return {"type": "table", "headers": headers, "rows": rows}
-            else:
-                # Treat as unstructured text
-                return {"type": "text", "content": data}
-
-    def _generate_summary(self, data: Dict[str, Any], focus_area: Optional[str]) -> str:
+    def _analyze(self, data: Dataset, analysis_type: str, focus_area: Optional[str]) -> str:
+        """Dispatch to the requested analysis type."""
+        if analysis_type == "trends":
+            return self._analyze_trends(data, focus_area)
+        elif analysis_type == "patterns":
+            return self._identify_patterns(data, focus_area)
+        elif analysis_type == "statistics":
+            return self._calculate_statistics(data, focus_area)
+        elif analysis_type == "insights":
+            return self._extract_insights(data, focus_area)
+        return self._generate_summary(data, focus_area)
+
+    def _generate_summary(self, data: Dataset, focus_area: Optional[str]) -> str:
         """Generate a comprehensive summary of the data."""
-        if data["type"] == "json":
-            content = data["content"]
+        if data.kind == "json":
+            content = data.content
             summary = f"📋 Data Summary:\n"
-            summary += f"• Data Type: JSON with {len(content)} top-level items\n"
+            if isinstance(content, (dict, list)):
+                summary += f"• Data Type: JSON with {len(content)} top-level items\n"
 
             if isinstance(content, dict):
                 summary += f"• Keys: {', '.join(list(content.keys())[:5])}\n"
@@ -116,23 +137,25 @@ Focus Area: {focus_area or 'General'}
                 summary += f"• List with {len(content)} items\n"
                 if content and isinstance(content[0], dict):
                     summary += f"• Sample keys: {', '.join(list(content[0].keys())[:3])}\n"
+            elif content is None:
+                summary += "• Data Type: JSON, streamed from file\n"
 
-        elif data["type"] == "table":
-            headers = data["headers"]
-            rows = data["rows"]
+            headers = data.headers
+            summary += f"• Records: {data.row_count}\n"
+            summary += f"• Fields (flattened): {len(headers)} ({', '.join(headers[:5])}{'...' if len(headers) > 5 else ''})\n"
+
+        elif data.kind == "table":
+            headers = data.headers
             summary = f"📊 Table Summary:\n"
             summary += f"• Columns: {len(headers)} ({', '.join(headers[:3])}{'...' if len(headers) > 3 else ''})\n"
-            summary += f"• Rows: {len(rows)}\n"
-            summary += f"• Total Data Points: {len(headers) * len(rows)}\n"
+            summary += f"• Rows: {data.row_count}\n"
+            summary += f"• Total Data Points: {len(headers) * data.row_count}\n"
 
         else:
-            content = data["content"]
-            word_count = len(content.split())
-            line_count = len(content.split('\n'))
             summary = f"📝 Text Summary:\n"
-            summary += f"• Word Count: {word_count}\n"
-            summary += f"• Line Count: {line_count}\n"
-            summary += f"• Character Count: {len(content)}\n"
+            summary += f"• Word Count: {data.text.word_count}\n"
+            summary += f"• Line Count: {data.text.line_count}\n"
+            summary += f"• Character Count: {len(data.content)}\n"
 
         if focus_area:
             summary += f"\n🎯 Focus Area Analysis: {focus_area}\n"
@@ -140,175 +163,183 @@ Focus Area: {focus_area or 'General'}
 
         return summary
 
-    def _analyze_trends(self, data: Dict[str, Any], focus_area: Optional[str]) -> str:
+    def _analyze_trends(self, data: Dataset, focus_area: Optional[str]) -> str:
         """Analyze trends in the data."""
         trends = "📈 Trend Analysis:\n\n"
 
-        if data["type"] == "table":
-            headers = data["headers"]
-            rows = data["rows"]
-
-            # Look for numeric columns
-            numeric_cols = []
-            for i, header in enumerate(headers):
-                try:
-                    # Check if most values in this column are numeric
-                    numeric_count = 0
-                    for row in rows[:10]:  # Sample first 10 rows
-                        if i < len(row):
-                            try:
-                                float(row[i])
-                                numeric_count += 1
-                            except ValueError:
-                                pass
-                    if numeric_count > len(rows[:10]) * 0.5:  # More than 50% numeric
-                        numeric_cols.append((i, header))
-                except:
-                    pass
+        if data.kind in TABULAR:
+            numeric_cols = [column for column in data.columns if column.kind == NUMERIC]
 
             if numeric_cols:
                 trends += f"• Found {len(numeric_cols)} numeric columns for trend analysis\n"
-                for col_idx, col_name in numeric_cols[:3]:
-                    values = []
-                    for row in rows:
-                        if col_idx < len(row):
-                            try:
-                                values.append(float(row[col_idx]))
-                            except ValueError:
-                                pass
-
-                    if len(values) > 1:
-                        if values[-1] > values[0]:
-                            trend_direction = "📈 Increasing"
-                        elif values[-1] < values[0]:
-                            trend_direction = "📉 Decreasing"
-                        else:
-                            trend_direction = "➡️ Stable"
-
-                        trends += f"• {col_name}: {trend_direction} (from {values[0]:.2f} to {values[-1]:.2f})\n"
+                summaries = [(column, summarize(column.trend)) for column in numeric_cols]
+                moving = [(column, s) for column, s in summaries if s and (s.direction != "stable" or s.changepoints)]
+                moving.sort(key=lambda item: -item[1].r_squared)
+                for column, summary in moving:
+                    trends += self._describe_trend(column.name, summary)
+                stable = [column.name for column, s in summaries if s and s.direction == "stable" and not s.changepoints]
+                if stable:
+                    trends += f"• ➡️ Stable (no linear trend or changepoint): {self._name_list(stable)}\n"
+                short = [column.name for column, s in summaries if s is None]
+                if short:
+                    trends += f"• ⚠️ Too few values for a trend (fewer than 3 finite numbers): {self._name_list(short)}\n"
             else:
                 trends += "• No clear numeric trends detected in the data\n"
 
-        elif data["type"] == "text":
-            # Analyze text trends (word frequency, sentiment indicators)
-            content = data["content"].lower()
-            words = re.findall(r'\b\w+\b', content)
-            word_freq = {}
-            for word in words:
-                if len(word) > 3:  # Focus on meaningful words
-                    word_freq[word] = word_freq.get(word, 0) + 1
-
-            top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
+        elif data.kind == "text":
+            # Analyze text trends (word frequency)
             trends += "• Top trending words:\n"
-            for word, count in top_words:
+            for word, count in data.text.terms.words.most_common(5):
                 trends += f"  - {word}: {count} occurrences\n"
 
         return trends
 
-    def _identify_patterns(self, data: Dict[str, Any], focus_area: Optional[str]) -> str:
+    @staticmethod
+    def _name_list(names: list[str], limit: int = 10) -> str:
+        return ", ".join(names[:limit]) + (f" and {len(names) - limit} more" if len(names) > limit else "")
+
+    @staticmethod
+    def _describe_trend(name: str, summary: TrendSummary) -> str:
+        """One column's fitted trend, rolling-window drift and level shifts."""
+        arrow = {"increasing": "📈 Increasing", "decreasing": "📉 Decreasing"}.get(summary.direction, "➡️ Stable")
+        text = f"• {name}: {arrow} ({summary.slope:+.4g} per row, R² = {summary.r_squared:.2f})\n"
+        if summary.early_mean is not None:
+            text += (
+                f"  - Rolling 10% windows: {summary.early_mean:.2f} at the start → {summary.late_mean:.2f} at the end"
+                f" (high {summary.peak[1]:.2f} from row {summary.peak[0]:,},"
+                f" low {summary.trough[1]:.2f} from row {summary.trough[0]:,})\n"
+            )
+        for point in summary.changepoints:
+            text += (
+                f"  - Change near row {point.row:,}: level {point.before:.2f} → {point.after:.2f},"
+                f" slope {point.slope_before:+.4g} → {point.slope_after:+.4g} per row\n"
+            )
+        return text
+
+    def _identify_patterns(self, data: Dataset, focus_area: Optional[str]) -> str:
         """Identify patterns in the data."""
         patterns = "🔍 Pattern Analysis:\n\n"
 
-        if data["type"] == "table":
-            headers = data["headers"]
-            rows = data["rows"]
-
-            # Look for patterns in categorical data
-            for col_idx, header in enumerate(headers):
-                values = []
-                for row in rows:
-                    if col_idx < len(row) and row[col_idx]:
-                        values.append(row[col_idx])
-
-                if values:
-                    unique_values = list(set(values))
-                    if len(unique_values) < len(values) * 0.8:  # Some repetition
-                        value_counts = {}
-                        for val in values:
-                            value_counts[val] = value_counts.get(val, 0) + 1
-
-                        most_common = max(value_counts.items(), key=lambda x: x[1])
-                        patterns += f"• {header}: Most common value is '{most_common[0]}' ({most_common[1]} times)\n"
-
-        elif data["type"] == "text":
-            content = data["content"]
-
-            # Look for repeated phrases
-            sentences = re.split(r'[.!?]+', content)
-            if len(sentences) > 1:
-                patterns += f"• Text structure: {len(sentences)} sentences detected\n"
+        if data.kind in TABULAR:
+            # Look for repeated values
+            for column in data.columns:
+                hitters = column.values
+                if not hitters.total:
+                    continue
+                value, count = hitters.most_common(1)[0]
+                if hitters.exact and len(hitters.counts) < hitters.total * 0.8:  # Some repetition
+                    patterns += f"• {column.name}: Most common value is '{value}' ({count} times)\n"
+                elif not hitters.exact and count > 1:
+                    # High-cardinality column: only the sketch's guaranteed heavy hitters are known
+                    patterns += f"• {column.name}: Most common value is '{value}' (at least {count} times)\n"
+
+        elif data.kind == "text":
+            content = data.content
+
+            if len(data.text.sentences) > 1:
+                patterns += f"• Text structure: {len(data.text.sentences)} sentences detected\n"
+
+            phrases = data.text.terms.repeated_phrases()
+            if phrases:
+                # Counts are lower bounds once the phrase summary has overflowed.
+                qualifier = "" if data.text.terms.phrases.exact else "at least "
+                patterns += "• Repeated phrases:\n"
+                for phrase, count in phrases:
+                    patterns += f"  - '{phrase}' ({qualifier}{count} times)\n"
 
             # Look for common patterns
-            if re.search(r'\d{4}-\d{2}-\d{2}', content):
+            if _DATE.search(content):
                 patterns += "• Contains date patterns (YYYY-MM-DD format)\n"
-            if re.search(r'\b\d+%\b', content):
+            if _PERCENT.search(content):
                 patterns += "• Contains percentage values\n"
-            if re.search(r'\$\d+', content):
+            if _CURRENCY.search(content):
                 patterns += "• Contains currency values\n"
 
         return patterns
 
-    def _calculate_statistics(self, data: Dict[str, Any], focus_area: Optional[str]) -> str:
-        """Calculate basic statistics for numeric data."""
+    def _calculate_statistics(self, data: Dataset, focus_area: Optional[str]) -> str:
+        """Calculate per-column statistics and correlations between numeric columns."""
         stats = "📊 Statistical Analysis:\n\n"
 
-        if data["type"] == "table":
-            headers = data["headers"]
-            rows = data["rows"]
-
-            for col_idx, header in enumerate(headers):
-                values = []
-                for row in rows:
-                    if col_idx < len(row):
-                        try:
-                            values.append(float(row[col_idx]))
-                        except ValueError:
-                            pass
-
-                if len(values) > 0:
-                    avg = sum(values) / len(values)
-                    min_val = min(values)
-                    max_val = max(values)
-
-                    stats += f"• {header}:\n"
-                    stats += f"  - Average: {avg:.2f}\n"
-                    stats += f"  - Range: {min_val:.2f} to {max_val:.2f}\n"
-                    stats += f"  - Count: {len(values)} values\n\n"
-
-        elif data["type"] == "text":
-            content = data["content"]
-            words = content.split()
-            sentences = re.split(r'[.!?]+', content)
+        if data.kind in TABULAR:
+            for column in data.columns:
+                if not column.count:
+                    continue
+
+                stats += f"• {column.name}:\n"
+                if column.kind == NUMERIC:
+                    values = column.numbers
+                    p5, p25, median, p75, p95 = column.quantiles.quantiles((0.05, 0.25, 0.5, 0.75, 0.95))
+                    stats += f"  - Average: {values.mean:.2f}\n"
+                    stats += f"  - Std Dev: {values.std:.2f}\n"
+                    stats += f"  - Range: {values.min:.2f} to {values.max:.2f}\n"
+                    stats += f"  - Quartiles: {p25:.2f} / {median:.2f} / {p75:.2f} (25th / median / 75th)\n"
+                    stats += f"  - 5th to 95th percentile: {p5:.2f} to {p95:.2f}\n"
+                elif column.kind == DATE:
+                    stats += f"  - Range: {column.label(column.dates.min)} to {column.label(column.dates.max)}\n"
+                else:
+                    distinct, exact = column.distinct_count
+                    value, count = column.values.most_common(1)[0]
+                    stats += f"  - Distinct values: {distinct if exact else f'~{distinct:,} (approximate)'}\n"
+                    stats += f"  - Most common: '{value}' ({count}{'' if column.values.exact else '+'} times)\n"
+                stats += f"  - Count: {column.count} values\n"
+                if column.missing:
+                    stats += f"  - Missing: {column.missing} values\n"
+                stats += "\n"
+
+            if data.correlations:
+                stats += "🔗 Correlations (Pearson r over rows where both values are present):\n"
+                for left, right, moments in self._strongest_correlations(data):
+                    r = moments.correlation
+                    stats += f"• {left} ↔ {right}: {r:+.2f} ({self._describe_correlation(r)}, n={moments.count})\n"
+
+        elif data.kind == "text":
+            word_count = data.text.word_count
+            sentences = data.text.sentences
 
             stats += f"• Text Statistics:\n"
-            stats += f"  - Words: {len(words)}\n"
+            stats += f"  - Words: {word_count}\n"
             stats += f"  - Sentences: {len([s for s in sentences if s.strip()])}\n"
-            stats += f"  - Avg words per sentence: {len(words) / max(len(sentences), 1):.1f}\n"
-            stats += f"  - Characters: {len(content)}\n"
+            stats += f"  - Avg words per sentence: {word_count / max(len(sentences), 1):.1f}\n"
+            stats += f"  - Characters: {len(data.content)}\n"
 
         return stats
 
-    def _extract_insights(self, data: Dict[str, Any], focus_area: Optional[str]) -> str:
+    def _extract_insights(self, data: Dataset, focus_area: Optional[str]) -> str:
         """Extract actionable insights from the data."""
         insights = "💡 Key Insights & Recommendations:\n\n"
 
-        # Combine multiple analysis types for comprehensive insights
-        summary = self._generate_summary(data, focus_area)
-        trends = self._analyze_trends(data, focus_area)
-        patterns = self._identify_patterns(data, focus_area)
-
         insights += "🔍 Data Overview:\n"
-        if data["type"] == "table":
-            insights += f"• Structured dataset with {len(data['rows'])} records\n"
-            insights += f"• {len(data['headers'])} attributes available for analysis\n"
-        elif data["type"] == "json":
-            insights += "• JSON data structure detected - good for API integration\n"
+        strongest = None
+        if data.kind in TABULAR:
+            if data.kind == "json":
+                insights += "• JSON data structure detected - good for API integration\n"
+            insights += f"• Structured dataset with {data.row_count} records\n"
+            insights += f"• {len(data.headers)} attributes available for analysis\n"
+            incomplete = [column for column in data.columns if column.missing]
+            if incomplete:
+                worst = max(incomplete, key=lambda column: column.missing)
+                insights += (
+                    f"• {len(incomplete)} columns have missing values; "
+                    f"{worst.name} is {worst.missing / max(data.row_count, 1):.0%} empty\n"
+                )
+            ranked = self._strongest_correlations(data)
+            if ranked and abs(ranked[0][2].correlation) >= 0.4:
+                strongest = ranked[0]
+                left, right, moments = strongest
+                insights += (
+                    f"• {left} and {right} show a {self._describe_correlation(moments.correlation)} correlation "
+                    f"(r = {moments.correlation:+.2f})\n"
+                )
         else:
             insights += "• Unstructured text data - suitable for NLP analysis\n"
 
         insights += "\n🎯 Actionable Recommendations:\n"
         insights += "• Consider visualizing numeric trends with charts\n"
-        insights += "• Look for correlations between different data points\n"
+        if strongest:
+            insights += f"• Investigate what drives the {strongest[0]} / {strongest[1]} relationship\n"
+        else:
+            insights += "• Look for correlations between different data points\n"
         insights += "• Validate data quality and handle missing values\n"
 
         if focus_area:
@@ -316,30 +347,44 @@ Focus Area: {focus_area or 'General'}
 
         return insights
 
-    def _analyze_focus_area(self, data: Dict[str, Any], focus_area: str) -> str:
+    def _strongest_correlations(self, data: Dataset, limit: int = 10) -> list:
+        """Correlated column pairs, strongest |r| first."""
+        return sorted(data.correlations, key=lambda pair: -abs(pair[2].correlation))[:limit]
+
+    def _describe_correlation(self, r: float) -> str:
+        strength = abs(r)
+        if strength >= 0.7:
+            label = "strong"
+        elif strength >= 0.4:
+            label = "moderate"
+        elif strength >= 0.2:
+            label = "weak"
+        else:
+            return "negligible"
+        return f"{label} {'positive' if r > 0 else 'negative'}"
+
+    def _analyze_focus_area(self, data: Dataset, focus_area: str) -> str:
         """Analyze data with specific focus on a particular area."""
         focus_analysis = ""
         focus_lower = focus_area.lower()
 
-        if data["type"] == "text":
-            content = data["content"].lower()
+        if data.kind == "text":
+            content = data.content.lower()
             if focus_lower in content:
                 # Count mentions and extract context
                 mentions = content.count(focus_lower)
                 focus_analysis += f"• '{focus_area}' mentioned {mentions} times in the text\n"
 
                 # Extract sentences containing the focus area
-                sentences = re.split(r'[.!?]+', data["content"])
-                relevant_sentences = [s.strip() for s in sentences if focus_lower in s.lower()][:3]
+                relevant_sentences = [s.strip() for s in data.text.sentences if focus_lower in s.lower()][:3]
                 if relevant_sentences:
                     focus_analysis += "• Relevant context:\n"
                     for sentence in relevant_sentences:
                         focus_analysis += f"  - {sentence[:100]}...\n"
 
-        elif data["type"] == "table":
-            headers = data["headers"]
+        elif data.kind in TABULAR:
             # Look for columns related to focus area
-            relevant_cols = [h for h in headers if focus_lower in h.lower()]
+            relevant_cols = [h for h in data.headers if focus_lower in h.lower()]
             if relevant_cols:
                 focus_analysis += f"• Found relevant columns: {', '.join(relevant_cols)}\n"
 
@@ -0,0 +1,558 @@
+"""Parsed, profiled datasets for `DataAnalyzerTool`.
+
+`load_dataset(data)` parses the input once and precomputes everything the
+analysis types need. Tables are streamed through a dialect-sniffing
+`csv.reader` a chunk of rows at a time: each chunk is transposed into
+typed `array('d')` columns and folded into per-column accumulators
+(mean/variance/min/max, quantile sketch, heavy hitters, HyperLogLog
+distinct count — see `sketches.py`; trend fit and bucketed series — see
+`trends.py`) plus pairwise correlations between numeric columns, so
+memory per column stays constant however many rows there are.
+`profile_csv` / `read_csv` take an iterator of lines or a file path
+directly. JSON records are flattened (dotted key paths, array lengths)
+into the same column profiles by `profile_records`. Text gets a
+word/sentence breakdown plus top words and repeated phrases (see
+`frequency.py`).
+
+Datasets are held in a bounded LRU keyed by a content hash, so the
+analyst calling the tool again on the same data with a different
+`analysis_type` skips parsing and profiling.
+
+Tuning (env vars):
+    DATA_ANALYZER_CACHE_SIZE  datasets kept in memory (default 32)
+    DATA_ANALYZER_TOP_K       frequent values tracked per column; counts
+                              are exact below this many distinct values
+                              (default 256)
+    DATA_ANALYZER_CORRELATION_COLUMNS
+                              numeric columns entering the correlation
+                              matrix (default 20 → 190 pairs)
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from itertools import chain, combinations, compress, repeat, zip_longest
+from math import fsum, isfinite
+from operator import and_, mul, sub
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from crewai_template.tools.frequency import TermFrequencies, count_terms
+from crewai_template.tools.sketches import CoMoments, HeavyHitters, HyperLogLog, Moments, QuantileSketch
+from crewai_template.tools.trends import TrendSketch
+
+NUMERIC = "numeric"
+CATEGORICAL = "categorical"
+DATE = "date"
+
+TABULAR = frozenset({"table", "json"})  # dataset kinds profiled into columns
+
+CHUNK_ROWS = 4096  # rows transposed and folded into the profiles at a time
+SNIFF_BYTES = 64 * 1024
+READ_BUFFER_BYTES = 1024 * 1024
+
+_SENTENCE_END = re.compile(r"[.!?]+")
+
+
+@dataclass
+class ColumnProfile:
+    """Streaming profile of one table column, in constant memory.
+
+    Every non-empty cell is tried as a number, then as an ISO date; the
+    column's `kind` is whichever reading covers most cells. NaN/inf and
+    blank cells count as missing.
+    """
+
+    name: str
+    rows: int = 0
+    empty: int = 0
+    numbers: Moments = field(default_factory=Moments)
+    dates: Moments = field(default_factory=Moments)  # POSIX seconds, UTC
+    values: HeavyHitters = field(default_factory=HeavyHitters)  # raw non-empty cells
+    quantiles: QuantileSketch = field(default_factory=QuantileSketch)  # numbers only
+    distinct: HyperLogLog = field(default_factory=HyperLogLog)  # raw cells, while not numeric
+    trend: TrendSketch = field(default_factory=TrendSketch)  # numbers against row position
+
+    @property
+    def kind(self) -> str:
+        present = self.rows - self.empty
+        if self.numbers.count > present * 0.5:
+            return NUMERIC
+        if self.dates.count > present * 0.5:
+            return DATE
+        return CATEGORICAL
+
+    @property
+    def stats(self) -> Optional[Moments]:
+        """Numeric (or date) moments for the column's kind; None for categoricals."""
+        return {NUMERIC: self.numbers, DATE: self.dates}.get(self.kind)
+
+    @property
+    def count(self) -> int:
+        stats = self.stats
+        return stats.count if stats is not None else self.rows - self.empty
+
+    @property
+    def missing(self) -> int:
+        return self.rows - self.count
+
+    @property
+    def distinct_count(self) -> tuple[int, bool]:
+        """(number of distinct values, whether it is exact)."""
+        if self.values.exact:
+            return len(self.values.counts), True
+        return round(self.distinct.estimate()), False
+
+    def label(self, value: float) -> str:
+        """Display form of a numeric/date value."""
+        return _format_date(value) if self.kind == DATE else f"{value:.2f}"
+
+    def fold(self, cells: Sequence[Any]) -> tuple[array, bytearray]:
+        """Add one chunk of this column's cells (row order, blanks included).
+
+        Cells are CSV strings, or already-typed values from JSON/Arrow
+        sources (None, numbers, bools, dates, nested values).
+
+        Returns the chunk's numbers aligned to its rows, with a mask of the
+        cells that held one.
+        """
+        values, mask, present, others, dates = array("d"), bytearray(), [], [], array("d")
+        for cell in cells:
+            value = None
+            if cell.__class__ is str:
+                cell = cell.strip()
+                if cell:
+                    try:
+                        value = float(cell)
+                    except ValueError:
+                        others.append(cell)
+                        present.append(cell)
+                    else:
+                        if isfinite(value):
+                            present.append(cell)
+                        else:
+                            value = None
+            elif cell is not None:
+                if isinstance(cell, bool):
+                    present.append("true" if cell else "false")
+                elif isinstance(cell, (int, float, Decimal)):
+                    if isfinite(cell):
+                        value = float(cell)
+                        present.append(cell)
+                elif isinstance(cell, date):
+                    dates.append(_timestamp(cell))
+                    present.append(cell.isoformat())
+                else:
+                    present.append(json.dumps(cell, default=str, sort_keys=True))
+            values.append(0.0 if value is None else value)
+            mask.append(value is not None)
+        offset = self.rows
+        self.rows += len(cells)
+        self.empty += len(cells) - len(present)
+        numbers = array("d", compress(values, mask))
+        self.numbers.update(numbers)
+        self.quantiles.update(numbers)
+        if numbers:
+            self.trend.update(offset, values, mask)
+        if others:
+            dates.extend(d for d in map(_parse_date, others) if d is not None)
+        self.dates.update(dates)
+        counts = Counter(present)
+        self.values.update(counts)
+        if self.kind != NUMERIC:
+            # Distinct counts only matter for categoricals; skip hashing every float.
+            self.distinct.update(counts.keys())
+        return values, mask
+
+
+@dataclass(frozen=True)
+class TableShard:
+    """Part of a table to profile: some of its columns, or only its first chunks.
+
+    Used by the process pool in `parallel.py`; the default is the whole table.
+    """
+
+    columns: Optional[tuple[int, ...]] = None  # source column indexes; None = all
+    correlate: bool = True  # compute the correlation matrix over these columns
+    max_chunks: Optional[int] = None  # stop reading after this many chunks
+
+
+class TableProfiler:
+    """Builds column profiles from rows, columns or records fed a chunk at a time."""
+
+    def __init__(
+        self, headers: Sequence[str] = (), top_k: Optional[int] = None, shard: TableShard = TableShard()
+    ) -> None:
+        self.top_k = top_k or int(os.getenv("DATA_ANALYZER_TOP_K", 256))
+        self.max_correlated = int(os.getenv("DATA_ANALYZER_CORRELATION_COLUMNS", 20)) if shard.correlate else 0
+        self.headers: list[str] = []
+        self.columns: list[ColumnProfile] = []
+        self._index: dict[str, int] = {}
+        # Column-index pair → running correlation; fixed from the first chunk's numeric columns.
+        self._pairs: Optional[dict[tuple[int, int], CoMoments]] = None
+        # Which cells of a row `add_rows` keeps, when profiling a shard of the columns.
+        self._source = shard.columns
+        self.row_count = 0
+        for name in headers if shard.columns is None else [headers[i] for i in shard.columns]:
+            self._add_column(name)
+
+    def add_rows(self, rows: Sequence[Sequence[str]]) -> None:
+        if not rows:
+            return
+        # Transpose the chunk; short rows are padded with blank (missing) cells.
+        by_column = list(zip_longest(*rows, fillvalue=""))
+        blank = ("",) * len(rows)
+        source = range(len(self.columns)) if self._source is None else self._source
+        self.add_columns([by_column[i] if i < len(by_column) else blank for i in source])
+
+    def add_columns(self, by_column: Sequence[Sequence[Any]]) -> None:
+        """Add a chunk given as one equal-length cell sequence per (profiled) column."""
+        if not by_column or not len(by_column[0]):
+            return
+        aligned = [column.fold(cells) for column, cells in zip(self.columns, by_column)]
+        self.row_count += len(by_column[0])
+
+        if self._pairs is None:
+            numeric = [i for i, column in enumerate(self.columns) if column.kind == NUMERIC]
+            self._pairs = {pair: CoMoments() for pair in combinations(numeric[: self.max_correlated], 2)}
+        # Gap-free columns are centred once per chunk, leaving each pair one pass.
+        centred: dict[int, tuple[float, array, float]] = {}
+        for (i, j), moments in self._pairs.items():
+            (xs, x_mask), (ys, y_mask) = aligned[i], aligned[j]
+            if 0 in x_mask or 0 in y_mask:
+                both = bytes(map(and_, x_mask, y_mask))
+                moments.update(array("d", compress(xs, both)), array("d", compress(ys, both)))
+                continue
+            for k in (i, j):
+                if k not in centred:
+                    centred[k] = _centre(aligned[k][0])
+            (mean_x, dx, m2_x), (mean_y, dy, m2_y) = centred[i], centred[j]
+            moments.merge(CoMoments(len(xs), mean_x, mean_y, m2_x, m2_y, fsum(map(mul, dx, dy))))
+
+    def add_records(self, records: Sequence[dict[str, Any]]) -> None:
+        """Add a chunk of flat key → value records; unseen keys become new columns."""
+        if not records:
+            return
+        for record in records:
+            for key in record:
+                if key not in self._index:
+                    self._add_column(key)
+        self.add_columns([[record.get(name) for record in records] for name in self.headers])
+
+    def dataset(self, digest: str = "", kind: str = "table") -> Dataset:
+        correlations = [
+            (self.columns[i].name, self.columns[j].name, moments)
+            for (i, j), moments in (self._pairs or {}).items()
+            if self.columns[i].kind == self.columns[j].kind == NUMERIC and moments.correlation is not None
+        ]
+        return Dataset(
+            kind=kind,
+            digest=digest,
+            headers=self.headers,
+            row_count=self.row_count,
+            columns=self.columns,
+            correlations=correlations,
+        )
+
+    def _add_column(self, name: str) -> None:
+        # A column first seen mid-stream is missing from every earlier row.
+        column = ColumnProfile(name, rows=self.row_count, empty=self.row_count, values=HeavyHitters(self.top_k))
+        self._index[name] = len(self.columns)
+        self.headers.append(name)
+        self.columns.append(column)
+
+
+@dataclass
+class TextProfile:
+    word_count: int  # whitespace-separated tokens
+    sentences: list[str]
+    line_count: int
+    terms: TermFrequencies  # top words and repeated phrases
+
+
+@dataclass
+class Dataset:
+    kind: str  # "json" | "table" | "text"
+    digest: str
+    content: Any = None  # parsed JSON (inline data only) or raw text
+    headers: list[str] = field(default_factory=list)
+    row_count: int = 0
+    columns: list[ColumnProfile] = field(default_factory=list)
+    # (column, column, co-moments) for numeric pairs with a defined correlation
+    correlations: list[tuple[str, str, CoMoments]] = field(default_factory=list)
+    text: Optional[TextProfile] = None
+    # Rendered analyses, keyed by (analysis_type, focus_area).
+    results: dict[tuple[str, Optional[str]], str] = field(default_factory=dict)
+
+
+def _parse(data: str, digest: str) -> Dataset:
+    try:
+        # Try parsing as JSON first
+        content = json.loads(data)
+    except json.JSONDecodeError:
+        pass
+    else:
+        dataset = profile_records(json_records(content), digest)
+        dataset.content = content
+        return dataset
+
+    # JSON Lines pasted inline: one JSON value per line
+    if data.lstrip()[:1] in ("{", "[") and (records := _inline_jsonl(data)) is not None:
+        return profile_records(records, digest)
+
+    # Try parsing as CSV-like data
+    if (table := profile_csv(_iter_lines(data), digest)) is not None:
+        return table
+
+    # Treat as unstructured text
+    return Dataset(kind="text", digest=digest, content=data, text=_profile_text(data))
+
+
+def _inline_jsonl(data: str) -> Optional[list[Any]]:
+    try:
+        return list(jsonl_values(data.splitlines(), "data"))
+    except ValueError:
+        return None
+
+
+def jsonl_values(lines: Iterable[str | bytes], name: str) -> Iterator[Any]:
+    """The JSON value on each non-blank line; ValueError names the first bad one."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{name}: line {number} is not valid JSON ({e.msg})") from e
+
+
+def json_records(content: Any) -> Sequence[Any]:
+    """The records of a parsed JSON document.
+
+    That is a top-level array's items; else the longest array of objects
+    directly under a top-level object (an API response's `data` or
+    `results`); else the document itself as a single record.
+    """
+    if isinstance(content, list):
+        return content
+    if isinstance(content, dict):
+        arrays = [value for value in content.values() if isinstance(value, list) and value and isinstance(value[0], dict)]
+        if arrays:
+            return max(arrays, key=len)
+    return [content]
+
+
+def profile_records(records: Iterable[Any], digest: str = "") -> Dataset:
+    """Flatten and profile JSON records a chunk at a time (see `flatten_record`)."""
+    profiler = TableProfiler()
+    chunk = []
+    for record in records:
+        chunk.append(flatten_record(record))
+        if len(chunk) == CHUNK_ROWS:
+            profiler.add_records(chunk)
+            chunk = []
+    profiler.add_records(chunk)
+    return profiler.dataset(digest, kind="json")
+
+
+def flatten_record(record: Any) -> dict[str, Any]:
+    """One JSON record as flat columns.
+
+    Nested objects become dotted key paths (`user.address.city`), and an
+    array becomes its length (`tags.length`). A record that isn't an
+    object is a single `value` column.
+    """
+    flat: dict[str, Any] = {}
+    _flatten(record if isinstance(record, dict) else {"value": record}, "", flat)
+    return flat
+
+
+def _flatten(obj: dict[str, Any], prefix: str, flat: dict[str, Any]) -> None:
+    for key, value in obj.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _flatten(value, f"{path}.", flat)
+        elif isinstance(value, list):
+            flat[f"{path}.length"] = len(value)
+        else:
+            flat[path] = value
+
+
+def profile_csv(lines: Iterable[str], digest: str = "", shard: TableShard = TableShard()) -> Optional[Dataset]:
+    """Profile delimited text in one streaming pass, or None if it isn't a table.
+
+    `lines` is any iterable of lines (an open file, a generator, ...); only
+    one chunk of rows is held at a time. The dialect is sniffed from the
+    first `SNIFF_BYTES`, and the first row is the header.
+    """
+    lines = iter(lines)
+    head, size = [], 0
+    for line in lines:
+        if not head and not line.strip():
+            continue  # leading blank lines
+        head.append(line)
+        size += len(line)
+        if size >= SNIFF_BYTES:
+            break
+    dialect = _sniff_dialect("".join(head))
+    if dialect is None:
+        return None
+
+    reader = csv.reader(chain(head, lines), dialect)
+    profiler = TableProfiler([h.strip() for h in next(reader)], shard=shard)
+    chunk, chunks = [], 0
+    for row in reader:
+        if len(row) <= 1 and not (row and row[0].strip()):
+            continue  # blank line
+        chunk.append(row)
+        if len(chunk) == CHUNK_ROWS:
+            profiler.add_rows(chunk)
+            chunk, chunks = [], chunks + 1
+            if chunks == shard.max_chunks:
+                break
+    profiler.add_rows(chunk)
+    return profiler.dataset(digest)
+
+
+def read_csv(path: str | os.PathLike, digest: str = "", shard: TableShard = TableShard()) -> Optional[Dataset]:
+    """Stream a CSV/TSV file from disk through `profile_csv`."""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace", buffering=READ_BUFFER_BYTES) as f:
+        return profile_csv(f, digest, shard)
+
+
+def read_text(path: str | os.PathLike, digest: str = "") -> Dataset:
+    """Read a whole file and parse it like inline `data` (JSON, table or text)."""
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        return _parse(f.read(), digest)
+
+
+def _sniff_dialect(sample: str) -> Optional[type[csv.Dialect]]:
+    """A CSV dialect if `sample` looks like a header line plus data rows."""
+    sample = sample.strip()
+    if "\n" not in sample:
+        return None
+    first = sample.split("\n", 1)[0]
+    try:
+        # Drop a possibly cut-off last line before sniffing.
+        dialect = csv.Sniffer().sniff(sample[: sample.rfind("\n")], delimiters=",\t;|")
+        if dialect.delimiter in first:
+            return dialect
+    except csv.Error:
+        pass
+    if "," in first:
+        return csv.excel
+    if "\t" in first:
+        return csv.excel_tab
+    return None
+
+
+def _centre(values: array) -> tuple[float, array, float]:
+    """Mean, deviations from it, and their sum of squares."""
+    mean = fsum(values) / len(values)
+    deltas = array("d", map(sub, values, repeat(mean, len(values))))
+    return mean, deltas, fsum(map(mul, deltas, deltas))
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Lines of `text` with their endings, without splitting it all up front."""
+    start = 0
+    while (end := text.find("\n", start)) != -1:
+        yield text[start:end + 1]
+        start = end + 1
+    if start < len(text):
+        yield text[start:]
+
+
+def _parse_date(cell: str) -> Optional[float]:
+    if not cell[:4].isdigit():
+        return None  # ISO 8601 always leads with the year; skip the parse attempt
+    try:
+        parsed = datetime.fromisoformat(cell)
+    except ValueError:
+        return None
+    return _timestamp(parsed)
+
+
+def _timestamp(value: date) -> float:
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _format_date(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    if moment.time() == time():
+        return moment.date().isoformat()
+    return moment.isoformat(sep=" ", timespec="minutes")
+
+
+def _profile_text(content: str) -> TextProfile:
+    sentences = _SENTENCE_END.split(content)
+    return TextProfile(
+        word_count=len(content.split()),
+        sentences=sentences,
+        line_count=content.count("\n") + 1,
+        terms=count_terms(sentences, int(os.getenv("DATA_ANALYZER_TOP_K", 256))),
+    )
+
+
+class DatasetCache:
+    """Thread-safe LRU of parsed datasets keyed by content hash (or file identity)."""
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Dataset] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, data: str) -> Dataset:
+        digest = hashlib.sha256(data.encode("utf-8", "surrogatepass")).hexdigest()
+        return self.get_or_build(digest, lambda: _parse(data, digest))
+
+    def get_or_build(self, key: str, build: Callable[[], Dataset]) -> Dataset:
+        with self._lock:
+            if (dataset := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                return dataset
+        dataset = build()
+        with self._lock:
+            self._entries[key] = dataset
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dataset
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_lock = threading.Lock()
+_cache: Optional[DatasetCache] = None
+
+
+def get_dataset_cache() -> DatasetCache:
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = DatasetCache(int(os.getenv("DATA_ANALYZER_CACHE_SIZE", 32)))
+        return _cache
+
+
+def load_dataset(data: str) -> Dataset:
+    """Parse + profile `data`, or return the cached dataset for identical content."""
+    return get_dataset_cache().load(data)
+
+
+def reset_dataset_cache() -> None:
+    """Drop cached datasets and re-read env on next use. Mainly for tests."""
+    global _cache
+    with _lock:
+        _cache = None
@@ -0,0 +1,208 @@
+"""Local-file input for `DataAnalyzerTool`.
+
+Agents pass a path instead of pasting the dataset into the tool call, so
+the heavy data never transits the LLM context. Files are streamed a chunk
+at a time into the same column profiles as inline tables:
+
+- CSV/TSV (and anything else that sniffs as delimited text) through the
+  buffered `csv` reader in `dataset.read_csv`;
+- JSONL / NDJSON a chunk of records at a time, and JSON documents whose
+  top level is an array an item at a time. Records are flattened into
+  columns (dotted key paths, array lengths);
+- Parquet and Feather/Arrow IPC through pyarrow's memory-mapped
+  record-batch readers. pyarrow is optional:
+  `pip install 'crewai_template[parquet]'`.
+
+Large table files can be profiled across a process pool (opt-in, see
+`parallel.py`). Paths must resolve inside DATA_ANALYZER_ROOT (default:
+the working directory). Profiles are cached by (path, size, mtime), so a
+file is only read again after it changes.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from crewai_template.tools.dataset import (
+    CHUNK_ROWS,
+    READ_BUFFER_BYTES,
+    Dataset,
+    TableProfiler,
+    TableShard,
+    get_dataset_cache,
+    json_records,
+    jsonl_values,
+    profile_records,
+    read_csv,
+    read_text,
+)
+from crewai_template.tools.parallel import profile_sharded, wants_parallel
+
+JSONL_SUFFIXES = frozenset({".jsonl", ".ndjson"})
+PARQUET_SUFFIXES = frozenset({".parquet", ".pq"})
+ARROW_SUFFIXES = frozenset({".feather", ".arrow", ".ipc"})
+JSON_SUFFIXES = frozenset({".json"})
+TEXT_SUFFIXES = frozenset({".txt", ".md", ".log"})
+
+_SPACE = re.compile(r"\s*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def resolve_data_path(path: str | os.PathLike) -> Path:
+    """Absolute path of an existing file under DATA_ANALYZER_ROOT, or raise."""
+    root = Path(os.getenv("DATA_ANALYZER_ROOT", ".")).resolve()
+    candidate = (root / Path(path).expanduser()).resolve()
+    if not candidate.is_relative_to(root):
+        raise ValueError(f"{path} is outside the data directory {root} (see DATA_ANALYZER_ROOT)")
+    if not candidate.is_file():
+        raise FileNotFoundError(f"No such data file: {path}")
+    return candidate
+
+
+def load_file(path: str | os.PathLike) -> Dataset:
+    """Profile a local data file, or return the cached profile if it hasn't changed."""
+    resolved = resolve_data_path(path)
+    stat = resolved.stat()
+    key = f"file:{resolved}:{stat.st_size}:{stat.st_mtime_ns}"
+    return get_dataset_cache().get_or_build(key, lambda: _profile(resolved, key, stat.st_size))
+
+
+def _profile(path: Path, digest: str, size: int) -> Dataset:
+    suffix = path.suffix.lower()
+    if wants_parallel(size) and suffix not in JSONL_SUFFIXES | JSON_SUFFIXES | TEXT_SUFFIXES:
+        return profile_sharded(read_file, path, digest)
+    return read_file(path, digest)
+
+
+def read_file(path: Path, digest: str = "", shard: TableShard = TableShard()) -> Dataset:
+    """Dispatch on the file suffix; unknown suffixes are sniffed as CSV, then read as text.
+
+    `shard` applies to tables (CSV, Parquet, Arrow) only.
+    """
+    suffix = path.suffix.lower()
+    if suffix in JSONL_SUFFIXES:
+        return read_jsonl(path, digest)
+    if suffix in JSON_SUFFIXES:
+        return read_json(path, digest)
+    if suffix in PARQUET_SUFFIXES or suffix in ARROW_SUFFIXES:
+        return read_arrow(path, digest, shard)
+    if suffix not in TEXT_SUFFIXES and (table := read_csv(path, digest, shard)) is not None:
+        return table
+    return read_text(path, digest)
+
+
+def read_jsonl(path: Path, digest: str = "") -> Dataset:
+    """One JSON value per line, each a record (see `dataset.flatten_record`)."""
+    with open(path, "rb", buffering=READ_BUFFER_BYTES) as f:
+        return profile_records(jsonl_values(f, path.name), digest)
+
+
+def read_json(path: Path, digest: str = "") -> Dataset:
+    """A JSON document; a top-level array is decoded one item at a time.
+
+    Any other document has to be parsed whole before its records are
+    known (see `dataset.json_records`).
+    """
+    with open(path, encoding="utf-8-sig", errors="replace", buffering=READ_BUFFER_BYTES) as f:
+        head = f.read(READ_BUFFER_BYTES)
+        if head.lstrip().startswith("["):
+            return profile_records(_json_array_items(f, head, path.name), digest)
+        try:
+            content = json.loads(head + f.read())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path.name}: not valid JSON ({e.msg} at line {e.lineno})") from e
+    return profile_records(json_records(content), digest)
+
+
+def _json_array_items(f: TextIO, buffer: str, name: str) -> Iterator[Any]:
+    """Decode the items of the array that `buffer` (+ the rest of `f`) starts with.
+
+    Only the current item and one read buffer are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    pos = _SPACE.match(buffer).end() + 1  # past the "["
+    consumed = 0  # characters dropped from the front of the buffer
+    eof = False
+
+    def refill() -> None:
+        nonlocal buffer, pos, consumed, eof
+        more = f.read(READ_BUFFER_BYTES)
+        eof = not more
+        consumed += pos
+        buffer, pos = buffer[pos:] + more, 0
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            pos = _SPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                raise ValueError(f"{name}: JSON array is not closed")
+            refill()
+
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            if not eof and _NUMBER_TAIL.fullmatch(buffer, end):
+                raise ValueError  # the buffer ended inside a number that may continue
+        except ValueError:
+            if eof:
+                raise ValueError(f"{name}: invalid JSON at character {consumed + pos}") from None
+            refill()
+            continue
+        yield item
+        pos = end
+        separator = next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"{name}: expected ',' or ']' at character {consumed + pos}")
+        pos += 1
+
+
+def read_arrow(path: Path, digest: str = "", shard: TableShard = TableShard()) -> Dataset:
+    """Parquet or Arrow IPC, a record batch at a time from a memory map.
+
+    A shard's columns are projected by pyarrow, so the other columns are never decoded.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError(
+            f"Reading {path.suffix} files needs pyarrow: pip install 'crewai_template[parquet]'"
+        ) from e
+
+    if path.suffix.lower() in PARQUET_SUFFIXES:
+        parquet = pq.ParquetFile(path, memory_map=True)
+        names = parquet.schema_arrow.names
+        profiler = TableProfiler(names, shard=shard)
+        selected = None if shard.columns is None else [names[i] for i in shard.columns]
+        for batch in islice(parquet.iter_batches(batch_size=CHUNK_ROWS, columns=selected), shard.max_chunks):
+            profiler.add_columns([column.to_pylist() for column in batch.columns])
+        return profiler.dataset(digest)
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        profiler = TableProfiler(reader.schema.names, shard=shard)
+        for piece in islice(_ipc_chunks(reader), shard.max_chunks):
+            if shard.columns is not None:
+                piece = piece.select(list(shard.columns))
+            profiler.add_columns([column.to_pylist() for column in piece.columns])
+    return profiler.dataset(digest)
+
+
+def _ipc_chunks(reader) -> Iterator:
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        for offset in range(0, batch.num_rows, CHUNK_ROWS):
+            yield batch.slice(offset, CHUNK_ROWS)
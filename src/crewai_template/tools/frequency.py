@@ -0,0 +1,89 @@
+"""Word and phrase frequencies for text datasets, in bounded memory.
+
+Text is tokenized a batch of sentences at a time with precompiled
+regexes. Each batch is counted exactly with a `Counter` and folded into
+`HeavyHitters` summaries, the same engine that tracks a table column's
+frequent values. Memory is therefore capped by the summary capacity, not
+by the vocabulary of the text:
+
+- `words`: lower-cased words longer than 3 characters;
+- `phrases`: 2- and 3-word n-grams (token tuples) inside one line of one
+  sentence. Only those that start and end on a non-stopword are
+  reported, for example "machine learning" but not "of the".
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain, islice
+from typing import Iterable
+
+from crewai_template.tools.sketches import HeavyHitters
+
+PHRASE_LENGTHS = (2, 3)
+BATCH_SENTENCES = 1024
+
+_WORD = re.compile(r"\b\w+\b")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from had has have he her his i if in into is it its "
+    "not of on or our she so than that the their them then there these they this to was we were "
+    "what when which who will with you your".split()
+)
+
+
+@dataclass
+class TermFrequencies:
+    # Words tracked. Phrases get 16x: most n-grams occur once and stopword
+    # ones crowd the top, and this keeps counts exact for a few pages of text.
+    capacity: int = 256
+    words: HeavyHitters = field(init=False)
+    phrases: HeavyHitters = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.words = HeavyHitters(self.capacity)
+        self.phrases = HeavyHitters(16 * self.capacity)
+
+    def update(self, sentences: Iterable[str]) -> None:
+        """Count one batch of sentences."""
+        lines = [_WORD.findall(line) for sentence in sentences for line in sentence.lower().splitlines()]
+        tokens = Counter(chain.from_iterable(lines))
+        grams = Counter(chain.from_iterable(
+            zip(*(islice(words, i, None) for i in range(n))) for words in lines for n in PHRASE_LENGTHS
+        ))
+        # Counting stays in C: phrases are kept as token tuples and only
+        # filtered and joined when reported.
+        self.words.update(Counter({token: count for token, count in tokens.items() if len(token) > 3}))
+        self.phrases.update(grams)
+
+    def repeated_phrases(self, limit: int = 5) -> list[tuple[str, int]]:
+        """Phrases seen at least twice, longest wins.
+
+        A phrase is dropped when it only occurs inside a longer repeated
+        phrase. For example "learning models" goes when every occurrence
+        is part of "machine learning models".
+        """
+        candidates = [
+            (" ".join(gram), count)
+            for gram, count in self.phrases.most_common()
+            if count > 1 and _phrase_edge(gram[0]) and _phrase_edge(gram[-1])
+        ][:limit * 10]
+        kept = []
+        for phrase, count in candidates:
+            padded = f" {phrase} "
+            if not any(count <= other and padded in f" {longer} " for longer, other in candidates if longer != phrase):
+                kept.append((phrase, count))
+        return kept[:limit]
+
+
+def count_terms(sentences: Iterable[str], capacity: int = 256) -> TermFrequencies:
+    """Word and phrase frequencies of `sentences`, counted `BATCH_SENTENCES` at a time."""
+    terms = TermFrequencies(capacity)
+    sentences = iter(sentences)
+    while batch := list(islice(sentences, BATCH_SENTENCES)):
+        terms.update(batch)
+    return terms
+
+
+def _phrase_edge(token: str) -> bool:
+    return token.isalpha() and token not in _STOPWORDS
@@ -0,0 +1,271 @@
+"""Streaming HTML → clean-text extraction for the scraping tools.
+
+`TextExtractor` is an incremental `html.parser.HTMLParser`: it drops
+script/style/nav/footer/header subtrees as it parses instead of building a
+tree and decomposing them, normalises whitespace line-by-line, and reports
+`done` as soon as `max_chars` of clean text exist — so a multi-MB page that
+will be truncated to 5000 chars anyway is mostly never parsed.
+
+The output is meant to match the original BeautifulSoup pipeline, kept
+below as `soup_extract` for equivalence tests and
+`benchmarks/bench_html_extract.py`, including bs4's collapsing of
+whitespace-only text between tags. The tests check that on sample and
+randomly chunked pages; it is not proven for every document.
+"""
+from __future__ import annotations
+
+import codecs
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, Optional
+
+EXCLUDED_TAGS = frozenset({"script", "style", "nav", "footer", "header"})
+PREFORMATTED_TAGS = frozenset({"pre", "textarea"})  # bs4 keeps their whitespace as is
+ASCII_SPACES = " \n\t\x0c\r"
+FEED_CHUNK_BYTES = 64 * 1024
+# str.splitlines() boundaries.
+LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+@dataclass
+class Extraction:
+    text: str
+    links: list[tuple[str, str]] = field(default_factory=list)
+    text_complete: bool = True  # False → text is a prefix (> max_chars) of the page text
+    links_complete: bool = False  # True → every qualifying link on the page
+
+
+class TextExtractor(HTMLParser):
+    """Incremental extractor. `feed()` chunks until `done`, then `close()` and `result()`."""
+
+    def __init__(self, max_chars: Optional[int] = None, collect_links: bool = False) -> None:
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.collect_links = collect_links
+        self._excluded: list[str] = []
+        self._preformatted = 0
+        self._blank = ""  # whitespace-only text so far in the current text node
+        self._in_text = False  # the current text node has had other characters
+        self._pending: list[str] = []
+        self._pending_len = 0
+        self._chunks: list[str] = []
+        self._length = 0
+        self._links: list[Optional[tuple[str, str]]] = []
+        self._open_links: list[tuple[int, str, list[str]]] = []
+        self._stopped = False
+        self._truncated = False
+
+    @property
+    def done(self) -> bool:
+        """Enough text has been produced and nothing else needs the rest of the page."""
+        return not self.collect_links and self._over_budget()
+
+    def feed(self, data: str) -> None:
+        if not self.done:
+            super().feed(data)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        self._end_node()
+        if tag in PREFORMATTED_TAGS:
+            self._preformatted += 1
+        if tag in EXCLUDED_TAGS:
+            self._excluded.append(tag)
+        elif tag == "a" and self.collect_links and not self._excluded:
+            href = next((value for name, value in attrs if name == "href"), None)
+            if href is not None:
+                self._links.append(None)  # placeholder keeps document order
+                self._open_links.append((len(self._links) - 1, href, []))
+
+    def handle_endtag(self, tag: str) -> None:
+        self._end_node()
+        if tag in PREFORMATTED_TAGS and self._preformatted:
+            self._preformatted -= 1
+        if tag in EXCLUDED_TAGS and tag in self._excluded:
+            while self._excluded.pop() != tag:
+                pass
+        elif tag == "a" and self._open_links and not self._excluded:
+            self._finish_link(*self._open_links.pop())
+
+    def handle_data(self, data: str) -> None:
+        if self._excluded:
+            return
+        if not (self._in_text or self._preformatted or data.strip(ASCII_SPACES)):
+            # A text node can arrive in several pieces; wait to see whether it is all whitespace.
+            self._blank += data
+            return
+        data, self._blank = self._blank + data, ""
+        self._in_text = True
+        self._handle_text(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._end_node()
+
+    def handle_decl(self, decl: str) -> None:
+        self._end_node()
+
+    def handle_pi(self, data: str) -> None:
+        self._end_node()
+
+    def unknown_decl(self, data: str) -> None:
+        self._end_node()
+
+    def _end_node(self) -> None:
+        """A text node ended. Like bs4's endData, whitespace-only text collapses to a newline or a space."""
+        self._in_text = False
+        if self._blank:
+            blank, self._blank = self._blank, ""
+            self._handle_text("\n" if "\n" in blank else " ")
+
+    def _handle_text(self, data: str) -> None:
+        for _, _, parts in self._open_links:
+            parts.append(data)
+        if self._over_budget():
+            self._truncated = True
+            return
+        lines = data.splitlines(keepends=True)
+        if not lines:
+            return
+        # Carry an unfinished trailing line over to the next data event.
+        tail = lines.pop() if lines[-1][-1] not in LINE_BREAKS else None
+        if lines:
+            lines[0] = "".join(self._pending) + lines[0]
+            self._pending, self._pending_len = [], 0
+            for line in lines:
+                self._emit_line(line)
+        if tail is not None:
+            spans_break = bool(self._pending) and self._pending[-1][-1:] == " " and tail[:1] == " "
+            self._pending.append(tail)
+            self._pending_len += len(tail)
+            if "  " in tail or spans_break:
+                # Phrases before the last double space are final even though
+                # the line isn't — emit them so minified pages still stop early.
+                pending = "".join(self._pending)
+                cut = pending.rfind("  ")
+                self._emit_line(pending[:cut])
+                rest = pending[cut + 2:]
+                self._pending, self._pending_len = [rest], len(rest)
+
+    def close(self) -> None:
+        if self.done:
+            self._stopped = True  # the rest of the document was never parsed
+        else:
+            super().close()
+            self._end_node()
+        if self._pending:
+            self._emit_line("".join(self._pending))
+            self._pending, self._pending_len = [], 0
+        while self._open_links:
+            self._finish_link(*self._open_links.pop())
+
+    def result(self) -> Extraction:
+        return Extraction(
+            text=" ".join(self._chunks),
+            links=[link for link in self._links if link is not None],
+            text_complete=not (self._stopped or self._truncated),
+            links_complete=self.collect_links and not self._stopped,
+        )
+
+    def _over_budget(self) -> bool:
+        """Whether the text so far (including the unfinished phrase) exceeds `max_chars`."""
+        if self.max_chars is None:
+            return False
+        separator = 1 if self._chunks else 0
+        if self._length > self.max_chars:
+            return True
+        if self._length + separator + self._pending_len <= self.max_chars:
+            return False
+        head = "".join(self._pending).strip()
+        return bool(head) and self._length + separator + len(head) > self.max_chars
+
+    def _emit_line(self, line: str) -> None:
+        for phrase in line.strip().split("  "):
+            phrase = phrase.strip()
+            if phrase:
+                self._length += len(phrase) + (1 if self._chunks else 0)
+                self._chunks.append(phrase)
+
+    def _finish_link(self, slot: int, href: str, parts: list[str]) -> None:
+        link_text = "".join(parts).strip()
+        if href.startswith("http") and link_text:
+            self._links[slot] = (link_text, href)
+
+
+def sniff_encoding(content_type: Optional[str], head: bytes) -> str:
+    """Charset from the Content-Type header, a BOM, or a <meta> tag; UTF-8 otherwise."""
+    if content_type and (match := _HEADER_CHARSET.search(content_type)):
+        candidate = match.group(1)
+    elif head.startswith(codecs.BOM_UTF8):
+        candidate = "utf-8-sig"
+    elif head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        candidate = "utf-16"
+    elif match := _META_CHARSET.search(head[:4096]):
+        candidate = match.group(1).decode("ascii", "replace")
+    else:
+        return "utf-8"
+    try:
+        return codecs.lookup(candidate).name
+    except LookupError:
+        return "utf-8"
+
+
+def decode_stream(chunks: Iterable[bytes], content_type: Optional[str] = None) -> Iterator[str]:
+    """Incrementally decode byte chunks, sniffing the charset from the first one."""
+    decoder = None
+    for chunk in chunks:
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(sniff_encoding(content_type, chunk))(errors="replace")
+        if text := decoder.decode(chunk):
+            yield text
+    if decoder is not None and (tail := decoder.decode(b"", final=True)):
+        yield tail
+
+
+def extract_stream(
+    chunks: Iterable[str],
+    max_chars: Optional[int] = None,
+    collect_links: bool = False,
+) -> Extraction:
+    """Feed decoded HTML chunks until the extractor has what it needs."""
+    extractor = TextExtractor(max_chars=max_chars, collect_links=collect_links)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+    extractor.close()
+    return extractor.result()
+
+
+def extract_html(
+    html: bytes,
+    content_type: Optional[str] = None,
+    max_chars: Optional[int] = None,
+    collect_links: bool = False,
+) -> Extraction:
+    """Extract from an in-memory body, decoding and feeding it in slices."""
+    slices = (html[i:i + FEED_CHUNK_BYTES] for i in range(0, len(html), FEED_CHUNK_BYTES))
+    return extract_stream(decode_stream(slices, content_type), max_chars=max_chars, collect_links=collect_links)
+
+
+def soup_extract(html: bytes | str) -> tuple[str, list[tuple[str, str]]]:
+    """Reference full-tree BeautifulSoup pipeline (the scraper's original path)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(list(EXCLUDED_TAGS)):
+        element.decompose()
+
+    lines = (line.strip() for line in soup.get_text().splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = " ".join(chunk for chunk in chunks if chunk)
+
+    links = []
+    for link in soup.find_all("a", href=True):
+        href = link["href"]
+        link_text = link.get_text().strip()
+        if href.startswith("http") and link_text:
+            links.append((link_text, href))
+    return text, links
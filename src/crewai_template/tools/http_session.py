@@ -0,0 +1,170 @@
+"""Shared, connection-pooled HTTP session for the scraping tools.
+
+Every `WebScraperTool` fetches through one process-wide `PooledHTTPAdapter`,
+so DNS + TCP + TLS setup is paid once per host and the connection is reused
+across tool calls, agents, and crews running in the same process.
+
+- urllib3's pools are thread-safe; `requests.Session` isn't documented as
+  such, so each thread gets its own lightweight session mounted on the
+  shared adapter.
+- Transient failures (connect errors, 429, 5xx) are retried with
+  exponential backoff, honouring `Retry-After`.
+- Responses are requested compressed (gzip/deflate, plus br/zstd when the
+  optional decoders are installed).
+
+Tuning (env vars, read when the adapter is first built):
+    SCRAPER_POOL_CONNECTIONS  number of per-host pools kept (default 32)
+    SCRAPER_POOL_MAXSIZE      keep-alive connections per host (default 10)
+    SCRAPER_MAX_RETRIES       retries per request (default 2)
+    SCRAPER_BACKOFF_FACTOR    backoff base in seconds (default 0.5)
+
+`pool_stats()` reports connection reuse so you can confirm pooling under load.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class PoolStats:
+    """Process-wide connection counters. A hit is a request served on a kept-alive connection."""
+
+    requests: int = 0
+    new_connections: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hits": self.requests - self.new_connections,
+                "misses": self.new_connections,
+            }
+
+
+_stats = PoolStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _get_conn(self, timeout=None):
+        _stats.record_request()
+        return super()._get_conn(timeout)
+
+    def _new_conn(self):
+        _stats.record_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _get_conn(self, timeout=None):
+        _stats.record_request()
+        return super()._get_conn(timeout)
+
+    def _new_conn(self):
+        _stats.record_new_connection()
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """`HTTPAdapter` whose per-host pools feed `pool_stats()`."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _build_adapter() -> PooledHTTPAdapter:
+    retries = _env_int("SCRAPER_MAX_RETRIES", 2)
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=_env_float("SCRAPER_BACKOFF_FACTOR", 0.5),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    return PooledHTTPAdapter(
+        pool_connections=_env_int("SCRAPER_POOL_CONNECTIONS", 32),
+        pool_maxsize=_env_int("SCRAPER_POOL_MAXSIZE", 10),
+        max_retries=retry,
+    )
+
+
+_lock = threading.Lock()
+_adapter: PooledHTTPAdapter | None = None
+_generation = 0
+_local = threading.local()
+
+
+def _shared_adapter() -> tuple[PooledHTTPAdapter, int]:
+    global _adapter
+    with _lock:
+        if _adapter is None:
+            _adapter = _build_adapter()
+        return _adapter, _generation
+
+
+def get_session() -> requests.Session:
+    """Return this thread's session, mounted on the process-wide pooled adapter."""
+    adapter, generation = _shared_adapter()
+    session = getattr(_local, "session", None)
+    if session is None or getattr(_local, "generation", None) != generation:
+        session = requests.Session()
+        session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _local.session = session
+        _local.generation = generation
+    return session
+
+
+def pool_stats() -> dict[str, int]:
+    """Connection reuse counters since process start (or the last `reset_session()`)."""
+    return _stats.snapshot()
+
+
+def reset_session() -> None:
+    """Close pooled connections and rebuild from env on next use. Mainly for tests."""
+    global _adapter, _generation, _stats
+    with _lock:
+        if _adapter is not None:
+            _adapter.close()
+        _adapter = None
+        _generation += 1
+        _stats = PoolStats()
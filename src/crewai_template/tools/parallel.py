@@ -0,0 +1,133 @@
+"""Opt-in multi-process profiling for large table files.
+
+Profiling a column is pure Python, so one big CSV pins a core and holds
+the GIL against the crew's other threads. With DATA_ANALYZER_WORKERS > 1,
+CSV/TSV, Parquet and Arrow files of at least
+DATA_ANALYZER_PARALLEL_MIN_BYTES are profiled by column shards in a
+process pool:
+
+- the parent reads the first chunk to see which columns are numeric;
+- the columns entering the correlation matrix (the first numeric ones,
+  exactly as in a serial pass) form one shard with their pairs, since a
+  pair needs both columns' values side by side;
+- the remaining columns are spread over the shards by estimated cost;
+- every worker re-reads the file and folds only its own columns (Parquet
+  and Arrow decode only those), and the parent puts the finished profiles
+  back in header order.
+
+Each column is profiled whole by one worker, so the result is identical
+to a serial pass and nothing has to be merged. Smaller files, JSON and
+text, and inline data stay in-process.
+
+Tuning (env vars):
+    DATA_ANALYZER_WORKERS            worker processes; 0 or 1 disables (default 0)
+    DATA_ANALYZER_PARALLEL_MIN_BYTES files smaller than this stay in-process
+                                     (default 32 MiB; workers pay a one-off
+                                     import on spawn)
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from crewai_template.tools.dataset import NUMERIC, Dataset, TableShard
+
+# A correlation pair's cost relative to folding one column (measured: one
+# cross-product pass against the per-cell parse).
+PAIR_COST = 0.06
+
+Reader = Callable[[Path, str, TableShard], Dataset]
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def get_process_pool() -> tuple[Optional[ProcessPoolExecutor], int]:
+    """The shared pool and its size, or (None, 0) when parallel profiling is off."""
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None:
+            workers = int(os.getenv("DATA_ANALYZER_WORKERS", 0))
+            if workers <= 1:
+                return None, 0
+            # Spawned, not forked: the crew process runs threads (scrapers, LLM calls).
+            _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool, _pool_workers
+
+
+def reset_process_pool() -> None:
+    """Shut the pool down and re-read env on next use. Mainly for tests."""
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+def wants_parallel(size: int) -> bool:
+    """Whether a file of `size` bytes is worth sharding."""
+    return size >= int(os.getenv("DATA_ANALYZER_PARALLEL_MIN_BYTES", 32 * 1024 * 1024))
+
+
+def profile_sharded(read: Reader, path: Path, digest: str = "") -> Dataset:
+    """Profile a table file by column shards across the process pool.
+
+    `read(path, digest, shard)` profiles one shard; it must be a module-level
+    function so workers can unpickle it. Falls back to one in-process read
+    when the pool is off, or the file isn't a table of several columns.
+    """
+    pool, workers = get_process_pool()
+    if pool is None:
+        return read(path, digest, TableShard())
+    head = read(path, digest, TableShard(max_chunks=1))
+    if head.kind != "table" or len(head.columns) < 2:
+        return read(path, digest, TableShard())
+
+    numeric = [i for i, column in enumerate(head.columns) if column.kind == NUMERIC]
+    correlated = numeric[: int(os.getenv("DATA_ANALYZER_CORRELATION_COLUMNS", 20))]
+    shards = plan_shards(len(head.columns), correlated, workers)
+    parts = [future.result() for future in [pool.submit(read, path, digest, shard) for shard in shards]]
+
+    columns = [None] * len(head.columns)
+    for shard, part in zip(shards, parts):
+        for index, column in zip(shard.columns, part.columns):
+            columns[index] = column
+    return Dataset(
+        kind="table",
+        digest=digest,
+        headers=head.headers,
+        row_count=parts[0].row_count,
+        columns=columns,
+        correlations=[pair for part in parts for pair in part.correlations],
+    )
+
+
+def plan_shards(width: int, correlated: list[int], workers: int) -> list[TableShard]:
+    """Split `width` columns into at most `workers` shards of similar cost.
+
+    With two or more `correlated` columns they share the first shard, which
+    also computes their pairs; every other column goes to the cheapest
+    shard so far.
+    """
+    members: list[list[int]] = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    if len(correlated) > 1:
+        members[0] = list(correlated)
+        loads[0] = len(correlated) + PAIR_COST * len(correlated) * (len(correlated) - 1) / 2
+    taken = set(members[0])
+    for index in range(width):
+        if index not in taken:
+            cheapest = loads.index(min(loads))
+            members[cheapest].append(index)
+            loads[cheapest] += 1
+    return [
+        TableShard(columns=tuple(sorted(indexes)), correlate=k == 0 and len(correlated) > 1)
+        for k, indexes in enumerate(members)
+        if indexes
+    ]
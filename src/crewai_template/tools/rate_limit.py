@@ -0,0 +1,160 @@
+"""Per-host politeness scheduler for the scraping tools.
+
+One token bucket per hostname, shared by every thread and crew in the
+process: requests to different hosts never wait on each other, while
+back-to-back requests to the same host are spaced to the configured rate.
+A full bucket admits its first `burst` requests immediately.
+
+Tuning (env vars, read when the limiter is first built):
+    SCRAPER_RATE_PER_HOST   sustained requests/second per host (default 1.0)
+    SCRAPER_BURST_PER_HOST  requests admitted back-to-back (default 1)
+    SCRAPER_HONOR_ROBOTS    1 → slow down to a host's robots.txt Crawl-delay
+                            (costs one robots.txt fetch per host; default 0)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float
+
+    def reserve(self, now: float) -> float:
+        """Take one token, returning how long the caller must wait for it."""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def wait_time(self, now: float, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now); takes nothing."""
+        self._refill(now)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """Thread-safe map of hostname → `TokenBucket`."""
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 1,
+        honor_robots: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.honor_robots = honor_robots
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lookups: dict[str, threading.Event] = {}  # robots.txt fetches in flight
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Block until `url`'s host may be fetched. Returns the seconds waited."""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        bucket = self._bucket(parts.scheme, host)
+        with self._lock:
+            wait = bucket.reserve(self._clock())
+        if wait > 0:
+            logger.debug("Rate limiting %s for %.2fs", host, wait)
+            self._sleep(wait)
+        return wait
+
+    def _bucket(self, scheme: str, host: str) -> TokenBucket:
+        """`host`'s bucket, created on first use.
+
+        The robots.txt lookup runs outside the lock: other hosts go ahead,
+        and only the first requests to this host wait for its result.
+        """
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is not None:
+                return bucket
+            if not (self.honor_robots and host):
+                bucket = self._buckets[host] = self._new_bucket(None)
+                return bucket
+            lookup = self._lookups.get(host)
+            owner = lookup is None
+            if owner:
+                lookup = self._lookups[host] = threading.Event()
+        if not owner:
+            lookup.wait()
+            with self._lock:
+                return self._buckets[host]
+        delay = None
+        try:
+            delay = self._crawl_delay(scheme, host)
+        finally:
+            with self._lock:
+                bucket = self._buckets[host] = self._new_bucket(delay)
+                del self._lookups[host]
+            lookup.set()
+        return bucket
+
+    def _new_bucket(self, delay: Optional[float]) -> TokenBucket:
+        rate, capacity = self.rate, float(self.burst)
+        if delay and delay > 1 / rate:
+            rate, capacity = 1 / delay, 1.0
+        return TokenBucket(rate=rate, capacity=capacity, tokens=capacity, updated=self._clock())
+
+    def _crawl_delay(self, scheme: str, host: str) -> Optional[float]:
+        # Imported here to keep the limiter importable without the HTTP stack.
+        from crewai_template.tools.http_session import USER_AGENT, get_session
+
+        try:
+            response = get_session().get(f"{scheme or 'https'}://{host}/robots.txt", timeout=5)
+            if response.status_code != 200:
+                return None
+            parser = RobotFileParser()
+            parser.parse(response.text.splitlines())
+            delay = parser.crawl_delay(USER_AGENT)
+            if delay is None and (rrate := parser.request_rate(USER_AGENT)):
+                delay = rrate.seconds / rrate.requests
+            return float(delay) if delay is not None else None
+        except Exception as e:
+            logger.debug("robots.txt lookup failed for %s: %s", host, e)
+            return None
+
+
+_lock = threading.Lock()
+_limiter: Optional[HostRateLimiter] = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter shared by every scraper instance."""
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = HostRateLimiter(
+                rate=float(os.getenv("SCRAPER_RATE_PER_HOST", 1.0)),
+                burst=int(os.getenv("SCRAPER_BURST_PER_HOST", 1)),
+                honor_robots=os.getenv("SCRAPER_HONOR_ROBOTS", "0") == "1",
+            )
+        return _limiter
+
+
+def reset_rate_limiter() -> None:
+    """Drop all per-host buckets and re-read env on next use. Mainly for tests."""
+    global _limiter
+    with _lock:
+        _limiter = None
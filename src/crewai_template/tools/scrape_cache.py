@@ -0,0 +1,212 @@
+"""Persistent page cache for the scraping tools (SQLite, stdlib only).
+
+Each row holds the raw response body (zlib-compressed) *and* the extracted
+clean text + links, so a cache hit skips both the network and the HTML
+parse. Entries are fresh for `ttl` seconds; after that the scraper
+revalidates with `If-None-Match` / `If-Modified-Since` and a 304 simply
+refreshes the row. The file is kept under `max_bytes` by evicting the
+least-recently-used rows, and rows stale for longer than `max_stale` are
+dropped outright.
+
+Tuning (env vars, read when the cache is first opened):
+    SCRAPER_CACHE_PATH       SQLite file (default .cache/scraper.sqlite3;
+                             set to "off" to disable caching)
+    SCRAPER_CACHE_TTL        freshness window in seconds (default 21600 = 6h)
+    SCRAPER_CACHE_MAX_MB     size bound before LRU eviction (default 256)
+    SCRAPER_CACHE_MAX_STALE  seconds a stale row is kept for revalidation
+                             (default 604800 = 7d)
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from crewai_template.sqlite_store import SharedStore, connect, evict_lru
+from crewai_template.tools.html_extract import Extraction
+
+# Bump when the table changes; older cache files are simply rebuilt.
+_SCHEMA_VERSION = 3
+_SCHEMA = """
+DROP TABLE IF EXISTS pages;
+CREATE TABLE pages (
+    url            TEXT PRIMARY KEY,
+    etag           TEXT,
+    last_modified  TEXT,
+    content_type   TEXT,
+    body           BLOB,
+    text           TEXT NOT NULL,
+    links          TEXT NOT NULL,
+    text_complete  INTEGER NOT NULL,
+    links_complete INTEGER NOT NULL,
+    body_complete  INTEGER NOT NULL,
+    size           INTEGER NOT NULL,
+    fetched_at     REAL NOT NULL,
+    accessed_at    REAL NOT NULL
+);
+CREATE INDEX pages_accessed_at ON pages (accessed_at);
+"""
+_COLUMNS = (
+    "text, links, etag, last_modified, content_type, text_complete, links_complete, body_complete, fetched_at"
+)
+
+
+@dataclass
+class CachedPage:
+    url: str
+    text: str
+    links: list[tuple[str, str]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    # The scraper stops reading once it has enough text, so a page may hold
+    # only a prefix of the text, none of the links, and a truncated body.
+    text_complete: bool = True
+    links_complete: bool = True
+    body_complete: bool = True
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_extraction(cls, url: str, extraction: Extraction, **fields) -> "CachedPage":
+        return cls(
+            url=url,
+            text=extraction.text,
+            links=extraction.links,
+            text_complete=extraction.text_complete,
+            links_complete=extraction.links_complete,
+            **fields,
+        )
+
+    def covers(self, max_chars: Optional[int], links: bool) -> bool:
+        """Whether this entry can answer a request without re-extracting."""
+        text_ok = self.text_complete or (max_chars is not None and len(self.text) > max_chars)
+        return text_ok and (self.links_complete or not links)
+
+    def validators(self) -> dict[str, str]:
+        """Conditional-request headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """Thread-safe, size- and TTL-bounded page store."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float = 6 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_stale: float = 7 * 24 * 3600,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self._conn = connect(self.path, _SCHEMA, _SCHEMA_VERSION)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page (fresh or stale) and mark it recently used."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        text, links, etag, last_modified, content_type, text_complete, links_complete, body_complete, fetched_at = row
+        return CachedPage(
+            url=url,
+            text=text,
+            links=[tuple(link) for link in json.loads(links)],
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            text_complete=bool(text_complete),
+            links_complete=bool(links_complete),
+            body_complete=bool(body_complete),
+            fetched_at=fetched_at,
+        )
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at < self.ttl
+
+    def get_body(self, url: str) -> Optional[bytes]:
+        """Raw response body (possibly a prefix — see `body_complete`), for re-extracting without a refetch."""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM pages WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row and row[0] is not None else None
+
+    def put(self, page: CachedPage, body: Optional[bytes] = None) -> None:
+        blob = zlib.compress(body) if body is not None else None
+        links = json.dumps(page.links)
+        size = len(blob or b"") + len(page.text.encode()) + len(links)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    page.url, page.etag, page.last_modified, page.content_type, blob, page.text, links,
+                    page.text_complete, page.links_complete, page.body_complete, size, page.fetched_at, now,
+                ),
+            )
+            self._evict(now)
+
+    def touch(self, page: CachedPage) -> None:
+        """Mark a revalidated (304) page fresh again."""
+        page.fetched_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (page.fetched_at, page.fetched_at, page.url),
+            )
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            return {**self._stats, "entries": entries, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM pages WHERE fetched_at < ?", (now - self.ttl - self.max_stale,))
+        evict_lru(self._conn, "pages", "url", self.max_bytes)
+
+
+def _open_from_env() -> Optional[ScrapeCache]:
+    path = os.getenv("SCRAPER_CACHE_PATH", ".cache/scraper.sqlite3")
+    if not path or path.lower() == "off":
+        return None
+    return ScrapeCache(
+        path,
+        ttl=float(os.getenv("SCRAPER_CACHE_TTL", 6 * 3600)),
+        max_bytes=int(float(os.getenv("SCRAPER_CACHE_MAX_MB", 256)) * 1024 * 1024),
+        max_stale=float(os.getenv("SCRAPER_CACHE_MAX_STALE", 7 * 24 * 3600)),
+    )
+
+
+_shared: SharedStore[ScrapeCache] = SharedStore(_open_from_env)
+
+
+def get_scrape_cache() -> Optional[ScrapeCache]:
+    """Process-wide cache shared by every scraper, or None when disabled."""
+    return _shared.get()
+
+
+def reset_scrape_cache() -> None:
+    """Close the shared cache; the next `get_scrape_cache()` re-reads SCRAPER_CACHE_*."""
+    _shared.reset()
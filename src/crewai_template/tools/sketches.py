@@ -0,0 +1,277 @@
+"""Constant-memory, mergeable accumulators for streaming data profiles.
+
+Every accumulator takes values a batch at a time (an `array('d')` or a
+`Counter` per chunk of rows) so the inner loops run in C, and two
+accumulators built over different parts of a stream can be `merge()`d into
+the one you would have got from a single pass (or, for the approximate
+sketches, one with the same error guarantees).
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from itertools import accumulate, repeat
+from math import fsum, inf, log, sqrt
+from operator import mul, sub
+from typing import Hashable, Iterable, Optional, Sequence
+
+
+@dataclass
+class Moments:
+    """Count, mean, variance, extremes and first/last value of a numeric stream.
+
+    Batches are reduced exactly (`fsum` over deviations from the batch mean)
+    and combined with Chan et al.'s pairwise update, which stays numerically
+    stable where a running sum of squares would not.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    min: float = inf
+    max: float = -inf
+    first: Optional[float] = None
+    last: Optional[float] = None
+
+    def update(self, values: array) -> None:
+        n = len(values)
+        if not n:
+            return
+        mean = fsum(values) / n
+        deltas = array("d", map(sub, values, repeat(mean, n)))
+        self.merge(Moments(n, mean, fsum(map(mul, deltas, deltas)), min(values), max(values), values[0], values[-1]))
+
+    def merge(self, other: Moments) -> None:
+        """Fold in `other`, which covers values that come *after* ours."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max, self.first, self.last = other.min, other.max, other.first, other.last
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.last = other.last
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+
+@dataclass
+class HeavyHitters:
+    """Misra–Gries frequent-items summary holding at most `capacity` counters.
+
+    While fewer than `capacity` distinct values have been seen the counts
+    are exact. After that, each reported count undercounts the true one by
+    at most `error` (≤ n / (capacity + 1)), and any value occurring more
+    often than that is guaranteed to be present.
+    """
+
+    capacity: int = 256
+    counts: Counter = field(default_factory=Counter)
+    total: int = 0
+    error: int = 0
+
+    @property
+    def exact(self) -> bool:
+        return self.error == 0
+
+    def update(self, counts: Counter) -> None:
+        """Add a batch of exact counts (e.g. `Counter(chunk)`)."""
+        self.total += sum(counts.values())
+        if len(counts) > self.capacity:
+            # Summarize a wide batch on its own first (same bound, as with
+            # merge), so folding it in touches at most `capacity` keys.
+            cut = counts.most_common(self.capacity + 1)[-1][1]
+            self.error += cut
+            counts = Counter({value: n - cut for value, n in counts.items() if n > cut})
+        self.counts.update(counts)
+        self._truncate()
+
+    def merge(self, other: HeavyHitters) -> None:
+        self.total += other.total
+        self.error += other.error
+        self.counts.update(other.counts)
+        self._truncate()
+
+    def most_common(self, n: Optional[int] = None) -> list[tuple[object, int]]:
+        return self.counts.most_common(n)
+
+    def _truncate(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        # Subtract the (capacity + 1)-th largest count from every counter and
+        # drop those that reach zero; mergeable per Agarwal et al. (2012).
+        cut = self.counts.most_common(self.capacity + 1)[-1][1]
+        self.error += cut
+        self.counts = Counter({value: n - cut for value, n in self.counts.items() if n > cut})
+
+
+class QuantileSketch:
+    """KLL-style compactor hierarchy for approximate quantiles.
+
+    Level `h` holds values that each stand for 2**h inputs. When a level
+    outgrows its capacity it is sorted and every other value (random
+    offset) is promoted to the next level, so all the work is C-level
+    sorts and slices. Exact until more than `k` values have been seen;
+    with the default k, a million values fit in under 1k retained floats at
+    well under 1% rank error.
+    """
+
+    def __init__(self, k: int = 512, seed: int = 0) -> None:
+        self.k = k
+        self.count = 0
+        self.levels: list[array] = [array("d")]
+        self._rng = random.Random(seed)
+
+    def update(self, values: array) -> None:
+        self.levels[0].extend(values)
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(array("d"))
+        for level, values in zip(self.levels, other.levels):
+            level.extend(values)
+        self.count += other.count
+        self._compress()
+
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        """Linearly interpolated quantiles (numpy's default method when exact)."""
+        if not self.count:
+            return [float("nan")] * len(qs)
+        items = sorted((value, 1 << h) for h, level in enumerate(self.levels) for value in level)
+        values = [value for value, _ in items]
+        ends = list(accumulate(weight for _, weight in items))  # rank of each item's last copy, +1
+
+        def at(rank: int) -> float:
+            return values[bisect_right(ends, rank)]
+
+        result = []
+        for q in qs:
+            rank = q * (self.count - 1)
+            low = int(rank)
+            value = at(low)
+            if rank > low:
+                value += (at(low + 1) - value) * (rank - low)
+            result.append(value)
+        return result
+
+    def _capacity(self, h: int) -> int:
+        # Lower levels get geometrically less room (KLL's c = 2/3).
+        return max(8, int(self.k * (2 / 3) ** (len(self.levels) - 1 - h)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(array("d"))
+                ordered = sorted(level)
+                # An odd value out stays behind so total weight is preserved.
+                keep = array("d", ordered[-1:] if len(ordered) % 2 else ())
+                if keep:
+                    del ordered[-1]
+                self.levels[h + 1].extend(ordered[self._rng.getrandbits(1)::2])
+                self.levels[h] = keep
+            h += 1
+
+
+class HyperLogLog:
+    """Approximate distinct count in 2**precision bytes (~1.6% error at the default 12).
+
+    Values are hashed with BLAKE2b of their `str()` rather than `hash()`,
+    so sketches built in different processes merge correctly.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        """Add values; feed each chunk's distinct values (e.g. a Counter's keys)."""
+        shift = 64 - self.precision
+        low_mask = (1 << shift) - 1
+        registers = self.registers
+        for value in values:
+            hashed = int.from_bytes(blake2b(str(value).encode(), digest_size=8).digest(), "big")
+            index = hashed >> shift
+            rank = shift - (hashed & low_mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: HyperLogLog) -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / fsum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * log(m / zeros)  # linear counting for small cardinalities
+        return raw
+
+
+@dataclass
+class CoMoments:
+    """Running Pearson correlation of paired values (rows where both are present)."""
+
+    count: int = 0
+    mean_x: float = 0.0
+    mean_y: float = 0.0
+    m2_x: float = 0.0
+    m2_y: float = 0.0
+    c_xy: float = 0.0
+
+    def update(self, xs: array, ys: array) -> None:
+        n = len(xs)
+        if not n:
+            return
+        mean_x, mean_y = fsum(xs) / n, fsum(ys) / n
+        dx = array("d", map(sub, xs, repeat(mean_x, n)))
+        dy = array("d", map(sub, ys, repeat(mean_y, n)))
+        self.merge(CoMoments(
+            n, mean_x, mean_y, fsum(map(mul, dx, dx)), fsum(map(mul, dy, dy)), fsum(map(mul, dx, dy))
+        ))
+
+    def merge(self, other: CoMoments) -> None:
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean_x, self.mean_y = other.count, other.mean_x, other.mean_y
+            self.m2_x, self.m2_y, self.c_xy = other.m2_x, other.m2_y, other.c_xy
+            return
+        total = self.count + other.count
+        weight = self.count * other.count / total
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.m2_y += other.m2_y + dy * dy * weight
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.mean_x += dx * other.count / total
+        self.mean_y += dy * other.count / total
+        self.count = total
+
+    @property
+    def correlation(self) -> Optional[float]:
+        """Pearson r, or None with fewer than 3 pairs or a constant side."""
+        if self.count < 3 or self.m2_x <= 0 or self.m2_y <= 0:
+            return None
+        return max(-1.0, min(1.0, self.c_xy / sqrt(self.m2_x * self.m2_y)))
@@ -0,0 +1,254 @@
+"""Result cache for any `BaseTool`: an in-process LRU in front of SQLite.
+
+Agents repeat tool calls within a run ("search OpenCV", "search  opencv ")
+and across runs. `cache_tool(tool)` routes the tool's `_run` through this
+cache (`func` for `@tool` functions), so every path crewAI uses to call
+it (ReAct text, native function calling, `tool.run()`) gets the same
+treatment. A hit returns the stored result unchanged, and the agent sees
+it as a normal observation.
+
+Keys are the tool name plus its arguments after normalization:
+
+- arguments are bound to the tool's signature, so positional, keyword and
+  defaulted calls collapse to one key;
+- string values are stripped, and per-argument normalizers can go
+  further (`normalize_query` for search strings, `normalize_url` for
+  URLs);
+- name and arguments are hashed as canonical JSON.
+
+A result is only stored when the tool's own `cache_function(args, result)`
+allows it (crewAI's hook; it always does by default) or the `cacheable`
+predicate given to `cache_tool`. Each tool has its own TTL.
+
+Tuning (env vars, read when the cache is first opened):
+    TOOL_CACHE_PATH            SQLite file (default .cache/tools.sqlite3;
+                               "memory" keeps only the in-process tier,
+                               "off" disables caching)
+    TOOL_CACHE_TTL             default seconds a result is reused (3600)
+    TOOL_CACHE_MAX_MB          disk size bound before LRU eviction (64)
+    TOOL_CACHE_MEMORY_ENTRIES  results kept in process (512)
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from crewai_template.sqlite_store import SharedStore, connect, evict_lru
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+DROP TABLE IF EXISTS results;
+CREATE TABLE results (
+    key         TEXT PRIMARY KEY,
+    tool        TEXT NOT NULL,
+    value       BLOB NOT NULL,
+    size        INTEGER NOT NULL,
+    expires_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX results_accessed_at ON results (accessed_at);
+"""
+
+_SPACE = re.compile(r"\s+")
+
+Normalizer = Callable[[Any], Any]
+
+
+def normalize_query(value: Any) -> Any:
+    """Case- and whitespace-insensitive search string."""
+    return _SPACE.sub(" ", value).strip().casefold() if isinstance(value, str) else value
+
+
+def normalize_url(value: Any) -> Any:
+    """URL without fragment or trailing slash, with lower-cased scheme and host."""
+    if not isinstance(value, str):
+        return value
+    parts = urlsplit(value.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def tool_key(name: str, arguments: Mapping[str, Any]) -> str:
+    payload = json.dumps({"tool": name, "args": arguments}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ToolCache:
+    """Two-tier (memory LRU + optional SQLite) result store with per-entry expiry."""
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        memory_entries: int = 512,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._conn = connect(path, _SCHEMA, _SCHEMA_VERSION)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """`(True, result)` for an unexpired entry, else `(False, None)`. Counts the outcome."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return True, entry[1]
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats["disk_hits"] += 1
+            value = pickle.loads(row[0])
+            self._remember(key, row[1], value)
+        return True, value
+
+    def put(self, key: str, tool: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        try:
+            blob = pickle.dumps(value)
+        except Exception:  # noqa: BLE001 — keep unpicklable results in memory only
+            blob = None
+        with self._lock:
+            self._remember(key, now + ttl, value)
+            if self._conn is not None and blob is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, tool, blob, len(blob), now + ttl, now),
+                )
+                self._evict(now)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            entries, total = (0, 0)
+            if self._conn is not None:
+                entries, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "entries": entries,
+                "bytes": total,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+        evict_lru(self._conn, "results", "key", self.max_bytes)
+
+
+def _open_from_env() -> Optional[ToolCache]:
+    path = os.getenv("TOOL_CACHE_PATH", ".cache/tools.sqlite3")
+    if not path or path.lower() == "off":
+        return None
+    return ToolCache(
+        None if path.lower() == "memory" else path,
+        max_bytes=int(float(os.getenv("TOOL_CACHE_MAX_MB", 64)) * 1024 * 1024),
+        memory_entries=int(os.getenv("TOOL_CACHE_MEMORY_ENTRIES", 512)),
+    )
+
+
+_shared: SharedStore[ToolCache] = SharedStore(_open_from_env)
+
+
+def get_tool_cache() -> Optional[ToolCache]:
+    """Process-wide cache shared by every wrapped tool, or None when disabled."""
+    return _shared.get()
+
+
+def reset_tool_cache() -> None:
+    """Drop the in-process tier, close the file, and read TOOL_CACHE_* again on next use."""
+    _shared.reset()
+
+
+def cache_tool(
+    tool: Any,
+    ttl: Optional[float] = None,
+    normalize: Optional[Mapping[str, Normalizer]] = None,
+    cacheable: Optional[Callable[[dict, Any], bool]] = None,
+) -> Any:
+    """Route the tool's implementation through the shared cache; returns `tool`.
+
+    `ttl` defaults to TOOL_CACHE_TTL, `normalize` maps argument names to
+    normalizers, and `cacheable(arguments, result)` defaults to the tool's
+    `cache_function`. Wrapping a tool a second time changes nothing.
+    """
+    if getattr(tool, "_result_cache", False):
+        return tool
+    # `@tool` functions are called through `func` (their `run` skips `_run`).
+    target = "func" if callable(getattr(tool, "func", None)) else "_run"
+    run = getattr(tool, target)
+    signature = inspect.signature(run)
+    normalize = dict(normalize or {})
+    cacheable = cacheable or getattr(tool, "cache_function", None) or (lambda _args, _result: True)
+
+    @functools.wraps(run)
+    def cached_run(*args, **kwargs):
+        cache = get_tool_cache()
+        if cache is None:
+            return run(*args, **kwargs)
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            return run(*args, **kwargs)  # let the tool raise its own error
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        for name, parameter in signature.parameters.items():
+            if parameter.kind is parameter.VAR_KEYWORD:
+                arguments.update(arguments.pop(name))
+        key = tool_key(tool.name, {
+            name: normalize.get(name, _strip)(value) for name, value in arguments.items()
+        })
+        hit, value = cache.get(key)
+        if hit:
+            return value
+        value = run(*args, **kwargs)
+        if cacheable(arguments, value):
+            cache.put(key, tool.name, value, ttl if ttl is not None else float(os.getenv("TOOL_CACHE_TTL", 3600)))
+        return value
+
+    # BaseTool is a pydantic model, so set the override past its validation.
+    object.__setattr__(tool, target, cached_run)
+    object.__setattr__(tool, "_result_cache", True)
+    return tool
+
+
+def _strip(value: Any) -> Any:
+    return value.strip() if isinstance(value, str) else value
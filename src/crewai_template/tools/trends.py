@@ -0,0 +1,244 @@
+"""Trend detection for numeric columns, built in the same streaming pass.
+
+`TrendSketch` rides along with each numeric column profile:
+
+- a least-squares fit of value against row position, from `CoMoments`,
+  so slope and R² need no stored series;
+- a bucketed series: consecutive rows are summed into at most
+  2 × `buckets` buckets, and when it fills, neighbours merge and the
+  bucket width doubles. Memory stays constant and work stays linear in
+  rows.
+
+`summarize()` turns a sketch into a `TrendSummary`. The direction comes
+from the fit, early and late rolling windows come from the buckets, and
+changepoints (jumps or slope changes) are found by binary segmentation
+of the bucket means into line segments.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate, compress, repeat
+from math import fsum, log
+from operator import add, mul, sub
+from statistics import median
+from typing import Optional
+
+from crewai_template.tools.sketches import CoMoments
+
+TREND_BUCKETS = 128
+MIN_R_SQUARED = 0.1  # below this a fitted slope is reported as no clear trend
+WINDOW_FRACTION = 0.1  # rolling windows span 10% of the rows
+MAX_CHANGEPOINTS = 3
+
+
+@dataclass
+class TrendSketch:
+    buckets: int = TREND_BUCKETS
+    width: int = 1  # rows per bucket
+    fit: CoMoments = field(default_factory=CoMoments)  # x = row position, y = value
+    counts: array = field(default_factory=lambda: array("q"))
+    sums: array = field(default_factory=lambda: array("d"))
+    positions: array = field(default_factory=lambda: array("d"))  # sum of row numbers with a value
+
+    def update(self, offset: int, values: array, mask: bytearray) -> None:
+        """Add a chunk of row-aligned values whose first row is row `offset` of the table."""
+        n = len(values)
+        if not n:
+            return
+        if 0 in mask:
+            rows = range(offset, offset + n)
+            self.fit.update(array("d", compress(rows, mask)), array("d", compress(values, mask)))
+        else:
+            self.fit.merge(_consecutive_moments(offset, values))
+
+        end = offset + n
+        while (end - 1) // self.width >= 2 * self.buckets:
+            self._halve()
+        if len(self.counts) < (end - 1) // self.width + 1:
+            grow = (end - 1) // self.width + 1 - len(self.counts)
+            self.counts.extend([0] * grow)
+            self.sums.extend([0.0] * grow)
+            self.positions.extend([0.0] * grow)
+        position = offset
+        while position < end:
+            index = position // self.width
+            stop = min(end, (index + 1) * self.width)
+            segment = mask[position - offset:stop - offset]
+            if present := segment.count(1):
+                self.counts[index] += present
+                self.sums[index] += sum(compress(values[position - offset:stop - offset], segment))
+                if present == stop - position:
+                    self.positions[index] += (position + stop - 1) * present / 2
+                else:
+                    self.positions[index] += sum(compress(range(position, stop), segment))
+            position = stop
+
+    def series(self) -> list[tuple[int, int, float, float]]:
+        """(first row, values present, mean, mean row) for every non-empty bucket."""
+        return [
+            (i * self.width, count, total / count, position / count)
+            for i, (count, total, position) in enumerate(zip(self.counts, self.sums, self.positions))
+            if count
+        ]
+
+    def _halve(self) -> None:
+        if len(self.counts) % 2:
+            self.counts.append(0)
+            self.sums.append(0.0)
+            self.positions.append(0.0)
+        self.counts = array("q", map(add, self.counts[0::2], self.counts[1::2]))
+        self.sums = array("d", map(add, self.sums[0::2], self.sums[1::2]))
+        self.positions = array("d", map(add, self.positions[0::2], self.positions[1::2]))
+        self.width *= 2
+
+
+def _consecutive_moments(offset: int, values: array) -> CoMoments:
+    """`CoMoments` of (row, value) for a gap-free run of rows.
+
+    The row side is closed-form, which saves the x passes of `CoMoments.update`.
+    """
+    n = len(values)
+    mean = fsum(values) / n
+    deltas = array("d", map(sub, values, repeat(mean, n)))
+    return CoMoments(
+        count=n,
+        mean_x=offset + (n - 1) / 2,
+        mean_y=mean,
+        m2_x=n * (n * n - 1) / 12,
+        m2_y=fsum(map(mul, deltas, deltas)),
+        c_xy=fsum(map(mul, _centred_rows(n), deltas)),
+    )
+
+
+@lru_cache(maxsize=8)
+def _centred_rows(n: int) -> array:
+    return array("d", (i - (n - 1) / 2 for i in range(n)))
+
+
+@dataclass
+class Changepoint:
+    row: int  # first row of the new segment
+    before: float  # each segment's fitted level at that row
+    after: float
+    slope_before: float  # change per row
+    slope_after: float
+
+
+@dataclass
+class TrendSummary:
+    direction: str  # "increasing" | "decreasing" | "stable"
+    slope: float  # change per row
+    r_squared: float
+    early_mean: Optional[float] = None  # first WINDOW_FRACTION of rows
+    late_mean: Optional[float] = None  # last WINDOW_FRACTION of rows
+    peak: Optional[tuple[int, float]] = None  # (first row, mean) of the highest rolling window
+    trough: Optional[tuple[int, float]] = None
+    changepoints: list[Changepoint] = field(default_factory=list)
+
+
+def summarize(sketch: TrendSketch) -> Optional[TrendSummary]:
+    """Fit, rolling windows and changepoints; None with fewer than 3 values."""
+    fit = sketch.fit
+    if fit.count < 3:
+        return None
+    slope = fit.c_xy / fit.m2_x if fit.m2_x else 0.0
+    r = fit.correlation
+    r_squared = r * r if r is not None else 0.0
+    direction = "stable"
+    if r_squared >= MIN_R_SQUARED:
+        direction = "increasing" if slope > 0 else "decreasing"
+    summary = TrendSummary(direction=direction, slope=slope, r_squared=r_squared)
+
+    series = sketch.series()
+    if len(series) >= 4:
+        window = max(1, round(len(series) * WINDOW_FRACTION))
+        rolling = _rolling_means(series, window)
+        summary.early_mean, summary.late_mean = rolling[0][1], rolling[-1][1]
+        summary.peak = max(rolling, key=lambda item: item[1])
+        summary.trough = min(rolling, key=lambda item: item[1])
+        summary.changepoints = _changepoints(series)
+    return summary
+
+
+def _rolling_means(series: list[tuple[int, int, float, float]], window: int) -> list[tuple[int, float]]:
+    """Count-weighted mean of every run of `window` consecutive buckets."""
+    counts = [0, *accumulate(count for _, count, _, _ in series)]
+    totals = [0.0, *accumulate(count * mean for _, count, mean, _ in series)]
+    return [
+        (series[i][0], (totals[i + window] - totals[i]) / (counts[i + window] - counts[i]))
+        for i in range(len(series) - window + 1)
+    ]
+
+
+def _changepoints(series: list[tuple[int, int, float, float]]) -> list[Changepoint]:
+    """Breaks in the bucket means, by binary segmentation into line segments.
+
+    Each segment gets its own least-squares line, so a steady slope costs
+    nothing and only a jump or a change of slope earns a split. A split
+    is kept when it cuts the squared error by more than a BIC-style
+    penalty (8 σ² log n), and no segment is shorter than 5% of the
+    buckets. σ is the bucket noise, estimated robustly from
+    the median absolute second difference, which ignores both trend and
+    isolated jumps.
+    """
+    n = len(series)
+    xs = [x for *_, x in series]
+    # Centred, so the prefix sums below don't cancel catastrophically.
+    middle = fsum(xs) / n
+    xs = [x - middle for x in xs]
+    centre = fsum(mean for _, _, mean, _ in series) / n
+    ys = [mean - centre for _, _, mean, _ in series]
+
+    second = [abs(a - 2 * b + c) for a, b, c in zip(ys, ys[1:], ys[2:])]
+    sigma = median(second) / (0.6745 * 6 ** 0.5) if second else 0.0
+    sigma = max(sigma, 1e-9 * max(map(abs, ys)), 1e-300)
+    penalty = 8 * sigma * sigma * log(n)
+
+    sums = [list(accumulate(terms, initial=0.0)) for terms in (
+        xs, ys, [x * x for x in xs], [x * y for x, y in zip(xs, ys)], [y * y for y in ys],
+    )]
+
+    def fit(a: int, b: int) -> tuple[float, float, float]:
+        """(squared error, slope, intercept) of the line through buckets a..b-1."""
+        m = b - a
+        sx, sy, sxx, sxy, syy = (s[b] - s[a] for s in sums)
+        vxx, vxy, vyy = sxx - sx * sx / m, sxy - sx * sy / m, syy - sy * sy / m
+        slope = vxy / vxx if vxx > 0 else 0.0
+        return max(0.0, vyy - slope * vxy), slope, (sy - slope * sx) / m
+
+    # The bucket a break falls in mixes both regimes, so it is left out of
+    # either side's line: segments are [a, k) and [k + 1, b).
+    shortest = max(3, n // 20)
+    splits: list[int] = []
+    segments = [(0, n)]
+    while len(splits) < MAX_CHANGEPOINTS:
+        best = None
+        for a, b in segments:
+            whole = fit(a, b)[0]
+            for k in range(a + shortest, b - shortest):
+                gain = whole - fit(a, k)[0] - fit(k + 1, b)[0]
+                if best is None or gain > best[0]:
+                    best = (gain, k, a, b)
+        if best is None or best[0] <= penalty:
+            break
+        _, k, a, b = best
+        splits.append(k)
+        segments.remove((a, b))
+        segments += [(a, k), (k + 1, b)]
+
+    segments.sort()
+    points = []
+    for k, left, right in zip(sorted(splits), segments, segments[1:]):
+        (slope_before, base_before), (slope_after, base_after) = fit(*left)[1:], fit(*right)[1:]
+        # Both lines evaluated at the mean row of the bucket the break falls in.
+        edge = xs[k]
+        points.append(Changepoint(
+            row=round(series[k][3]),
+            before=centre + base_before + slope_before * edge,
+            after=centre + base_after + slope_after * edge,
+            slope_before=slope_before,
+            slope_after=slope_after,
+        ))
+    return points
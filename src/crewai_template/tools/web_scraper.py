@@ -1,14 +1,50 @@
 import logging
+import math
+import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Optional, Type
 
 import requests
-from bs4 import BeautifulSoup
 from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from crewai_template.tools.html_extract import (
+    FEED_CHUNK_BYTES,
+    Extraction,
+    TextExtractor,
+    decode_stream,
+    extract_html,
+)
+from crewai_template.tools.http_session import get_session
+from crewai_template.tools.rate_limit import get_rate_limiter
+from crewai_template.tools.scrape_cache import CachedPage, ScrapeCache, get_scrape_cache
 
 logger = logging.getLogger(__name__)
 
+# Content types worth parsing; anything else is rejected before the body is read.
+TEXTUAL_CONTENT_TYPES = ("text/", "application/xhtml+xml", "application/xml", "application/json")
+# Magic numbers for payloads served as text/html or octet-stream by mistake.
+BINARY_SIGNATURES = (b"%PDF", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"PK\x03\x04", b"\x1f\x8b", b"OggS", b"ID3")
+
+
+class UnsupportedContentError(ValueError):
+    """The response isn't text we can extract (PDF, image, archive, …)."""
+
+
+def _check_content_type(content_type: Optional[str]) -> None:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("", "application/octet-stream"):
+        return  # unknown — sniff the first bytes instead
+    if not (media_type.startswith(TEXTUAL_CONTENT_TYPES) or media_type.endswith("+xml")):
+        raise UnsupportedContentError(f"unsupported content type {media_type!r}")
+
+
+def _looks_binary(head: bytes) -> bool:
+    return head.startswith(BINARY_SIGNATURES) or b"\x00" in head[:1024]
+
 class WebScraperInput(BaseModel):
     """Input schema for WebScraperTool."""
     url: str = Field(..., description="The URL to scrape content from")
@@ -42,31 +78,12 @@ class WebScraperTool(BaseTool):
         Returns:
             Formatted string with scraped content and optionally links
         """
-        try:
-            # Add delay to be respectful to servers
-            time.sleep(1)
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-
-            logger.info(f"Scraping content from: {url}")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-
-            # Get text content
-            text = soup.get_text()
+        return self._scrape(url, max_content_length, extract_links)
 
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+    def _scrape(self, url: str, max_content_length: int, extract_links: bool, timeout: float = 10) -> str:
+        try:
+            page = self._fetch_page(url, timeout, max_content_length, extract_links)
+            text = page.text
 
             # Truncate if necessary
             if len(text) > max_content_length:
@@ -76,12 +93,7 @@ class WebScraperTool(BaseTool):
 
             # Extract links if requested
             if extract_links:
-                links = []
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    link_text = link.get_text().strip()
-                    if href.startswith('http') and link_text:
-                        links.append(f"- {link_text}: {href}")
+                links = [f"- {link_text}: {href}" for link_text, href in page.links]
 
                 if links:
                     result += f"\n\nFound {len(links)} links:\n" + "\n".join(links[:10])
@@ -99,3 +111,220 @@ class WebScraperTool(BaseTool):
             error_msg = f"Error processing content from {url}: {str(e)}"
             logger.error(error_msg)
             return error_msg
+
+    def _fetch_page(
+        self,
+        url: str,
+        timeout: float = 10,
+        max_chars: Optional[int] = None,
+        links: bool = False,
+    ) -> CachedPage:
+        """Return the page's clean text + links, from the shared cache when possible.
+
+        Extraction stops once `max_chars` of text exist (unless `links` needs
+        the whole page), so the returned text may be a prefix of the page.
+        """
+        cache = get_scrape_cache()
+        cached = cache.get(url) if cache else None
+        # A cached prefix whose body was cut short can't be upgraded locally.
+        if cached and not (cached.body_complete or cached.covers(max_chars, links)):
+            cached = None
+        if cached and cache.is_fresh(cached):
+            cache.record("hits")
+            logger.info(f"Serving cached content for: {url}")
+            return self._ensure_covers(cache, cached, max_chars, links)
+
+        # Be respectful to servers: same-host requests are spaced by a
+        # shared per-host token bucket; other hosts don't wait.
+        get_rate_limiter().acquire(url)
+
+        logger.info(f"Scraping content from: {url}")
+        # Pooled keep-alive session shared by every scraper in the process
+        # (User-Agent, retries and compression are configured there). The
+        # body is streamed so oversized or binary responses never load whole.
+        validators = cached.validators() if cached else None
+        response = get_session().get(url, headers=validators, timeout=timeout, stream=True)
+        with response:
+            if validators and response.status_code == 304:
+                cache.touch(cached)
+                cache.record("revalidated")
+                return self._ensure_covers(cache, cached, max_chars, links)
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type")
+            _check_content_type(content_type)
+            extraction, body, body_complete = self._read_body(response, content_type, max_chars, links, timeout)
+
+        page = CachedPage.from_extraction(
+            url,
+            extraction,
+            content_type=content_type,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body_complete=body_complete,
+        )
+        if cache:
+            cache.put(page, body=body)
+            cache.record("misses")
+        return page
+
+    @staticmethod
+    def _read_body(
+        response: requests.Response,
+        content_type: Optional[str],
+        max_chars: Optional[int],
+        links: bool,
+        timeout: float,
+    ) -> tuple[Extraction, bytes, bool]:
+        """Stream the body into the extractor, stopping once it has enough text.
+
+        Reads at most SCRAPER_MAX_BYTES (default 5 MB) and gives up after
+        `timeout` seconds of wall-clock reading. Returns the extraction, the
+        bytes actually read, and whether those bytes are the whole body.
+        """
+        max_bytes = int(os.getenv("SCRAPER_MAX_BYTES", 5 * 1024 * 1024))
+        deadline = time.monotonic() + timeout
+        body = bytearray()
+        capped = False
+
+        def chunks():
+            nonlocal capped
+            for chunk in response.iter_content(chunk_size=FEED_CHUNK_BYTES):
+                if not body and _looks_binary(chunk):
+                    raise UnsupportedContentError("response body looks binary")
+                chunk = chunk[: max_bytes - len(body)]
+                body.extend(chunk)
+                yield chunk
+                if len(body) >= max_bytes:
+                    capped = True
+                    logger.warning(f"Stopped reading {response.url} at {max_bytes} bytes")
+                    return
+                if time.monotonic() > deadline:
+                    raise requests.Timeout(f"reading body took longer than {timeout:g}s")
+
+        extractor = TextExtractor(max_chars=max_chars, collect_links=links)
+        stopped_early = False
+        for text in decode_stream(chunks(), content_type):
+            extractor.feed(text)
+            if extractor.done:
+                stopped_early = True
+                break
+        extractor.close()
+        return extractor.result(), bytes(body), not (capped or stopped_early)
+
+    def _ensure_covers(
+        self,
+        cache: ScrapeCache,
+        page: CachedPage,
+        max_chars: Optional[int],
+        links: bool,
+    ) -> CachedPage:
+        """Upgrade a cached prefix to a full extraction from the stored body if needed."""
+        if page.covers(max_chars, links) or (body := cache.get_body(page.url)) is None:
+            return page
+        extraction = self._extract(body, page.content_type, None, True)
+        full = CachedPage.from_extraction(
+            page.url,
+            extraction,
+            content_type=page.content_type,
+            etag=page.etag,
+            last_modified=page.last_modified,
+            fetched_at=page.fetched_at,
+        )
+        cache.put(full, body=body)
+        return full
+
+    @staticmethod
+    def _extract(
+        html: bytes,
+        content_type: Optional[str] = None,
+        max_chars: Optional[int] = None,
+        links: bool = False,
+    ) -> Extraction:
+        """Clean page text plus every absolute `(link text, href)` outside nav/header/footer."""
+        return extract_html(html, content_type, max_chars=max_chars, collect_links=links)
+
+
+class BatchWebScraperInput(BaseModel):
+    """Input schema for BatchWebScraperTool."""
+    urls: list[str] = Field(..., min_length=1, max_length=10, description="The URLs to scrape (up to 10)")
+    max_content_length: Optional[int] = Field(
+        default=5000,
+        description="Maximum content length to return per URL (default: 5000 characters)"
+    )
+    extract_links: Optional[bool] = Field(
+        default=False,
+        description="Whether to extract and return links from each page"
+    )
+    timeout: Optional[float] = Field(
+        default=15,
+        description="Per-URL timeout in seconds (default: 15)"
+    )
+
+
+# One pool for every batch scrape in the process, so SCRAPER_MAX_CONCURRENCY
+# caps in-flight fetches globally rather than per tool call or per crew.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _batch_executor() -> tuple[ThreadPoolExecutor, int]:
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None:
+            _executor_workers = int(os.getenv("SCRAPER_MAX_CONCURRENCY", 8))
+            _executor = ThreadPoolExecutor(max_workers=_executor_workers, thread_name_prefix="scraper")
+        return _executor, _executor_workers
+
+
+class BatchWebScraperTool(BaseTool):
+    name: str = "Batch Web Content Scraper"
+    description: str = (
+        "Scrapes several web pages concurrently in one call and returns each page's "
+        "clean text in the order the URLs were given. Prefer this over repeated "
+        "single-page scrapes when you already know which URLs you want."
+    )
+    args_schema: Type[BaseModel] = BatchWebScraperInput
+    _scraper: WebScraperTool = PrivateAttr(default_factory=WebScraperTool)
+
+    def _run(
+        self,
+        urls: list[str],
+        max_content_length: int = 5000,
+        extract_links: bool = False,
+        timeout: float = 15,
+    ) -> str:
+        """
+        Scrape several pages concurrently.
+
+        Args:
+            urls: The URLs to scrape
+            max_content_length: Maximum length of content to return per URL
+            extract_links: Whether to extract links from each page
+            timeout: Per-URL timeout in seconds
+
+        Returns:
+            One section per URL, in input order, separated by '---'
+        """
+        executor, workers = _batch_executor()
+        futures: list[Future] = [
+            executor.submit(self._scraper._scrape, url, max_content_length, extract_links, timeout)
+            for url in urls
+        ]
+        # Each URL gets `timeout` seconds once it's running; with more URLs
+        # than workers, later ones queue behind earlier waves.
+        deadline = time.monotonic() + timeout * math.ceil(len(urls) / workers)
+
+        sections = []
+        for url, future in zip(urls, futures):
+            try:
+                sections.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeoutError:
+                future.cancel()
+                error_msg = f"Failed to scrape {url}: timed out after {timeout:g}s"
+                logger.error(error_msg)
+                sections.append(error_msg)
+
+        logger.info(f"Batch scraped {len(urls)} URLs")
+        return "\n\n---\n\n".join(sections)
@@ -0,0 +1,40 @@
+"""Shared fixtures — isolate process-wide tool and LLM cache state between tests."""
+from __future__ import annotations
+
+import pytest
+
+from crewai_template.llm_cache import reset_llm_cache
+from crewai_template.llm_scheduler import reset_llm_scheduler
+from crewai_template.repair import reset_repair_stats
+from crewai_template.reports import reset_reports
+from crewai_template.tools.dataset import reset_dataset_cache
+from crewai_template.tools.parallel import reset_process_pool
+from crewai_template.tools.rate_limit import reset_rate_limiter
+from crewai_template.tools.scrape_cache import reset_scrape_cache
+from crewai_template.tools.tool_cache import reset_tool_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_scraper_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_CACHE_PATH", str(tmp_path / "scraper.sqlite3"))
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setenv("TOOL_CACHE_PATH", str(tmp_path / "tools.sqlite3"))
+    reset_rate_limiter()
+    reset_scrape_cache()
+    reset_dataset_cache()
+    reset_process_pool()
+    reset_llm_cache()
+    reset_tool_cache()
+    reset_llm_scheduler()
+    reset_reports()
+    reset_repair_stats()
+    yield
+    reset_rate_limiter()
+    reset_scrape_cache()
+    reset_dataset_cache()
+    reset_process_pool()
+    reset_llm_cache()
+    reset_tool_cache()
+    reset_llm_scheduler()
+    reset_reports()
+    reset_repair_stats()
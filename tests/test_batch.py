@@ -0,0 +1,95 @@
+"""Batch kickoffs: JSONL in/out, bounded concurrency, per-run reports, failures, run_id checks."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from crewai_template.batch import read_inputs, run_batch, run_batch_file
+
+
+class FakeCrew:
+    """Interpolates and writes its report like the real report task, tracking overlap."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, report_template):
+        self.template = str(report_template)
+        self.tasks = [SimpleNamespace(output_file=None), SimpleNamespace(output_file=self.template)]
+
+    def kickoff(self, inputs):
+        self.tasks[-1].output_file = self.template.format(**inputs)
+        with FakeCrew.lock:
+            FakeCrew.active += 1
+            FakeCrew.peak = max(FakeCrew.peak, FakeCrew.active)
+        time.sleep(0.05)
+        with FakeCrew.lock:
+            FakeCrew.active -= 1
+        if inputs["topic"] == "fail":
+            raise RuntimeError("provider down")
+        os.makedirs(os.path.dirname(self.tasks[-1].output_file), exist_ok=True)
+        with open(self.tasks[-1].output_file, "w") as f:
+            f.write(f"# {inputs['topic']}")
+        return SimpleNamespace(raw=f"report on {inputs['topic']}")
+
+
+@pytest.fixture(autouse=True)
+def _reset_fake():
+    FakeCrew.active = FakeCrew.peak = 0
+
+
+@pytest.fixture
+def crew_factory(tmp_path):
+    return lambda: FakeCrew(tmp_path / "reports" / "{run_id}" / "report.md")
+
+
+def test_runs_overlap_up_to_the_cap_and_reports_are_isolated(crew_factory):
+    inputs = [{"topic": f"t{i}"} for i in range(6)]
+
+    records = list(run_batch(inputs, concurrency=3, crew_factory=crew_factory))
+
+    assert FakeCrew.peak == 3
+    assert sorted(r["index"] for r in records) == list(range(6))
+    reports = {r["report"] for r in records}
+    assert len(reports) == 6
+    for record in records:
+        with open(record["report"]) as f:
+            assert f.read() == f"# {record['inputs']['topic']}"
+        assert record["raw"] == f"report on {record['inputs']['topic']}"
+
+
+def test_file_round_trip_records_failures_and_keeps_run_ids(tmp_path, crew_factory):
+    source = tmp_path / "inputs.jsonl"
+    source.write_text('{"topic": "ok", "run_id": "fixed"}\n\n{"topic": "fail"}\n')
+    output = tmp_path / "out" / "results.jsonl"
+
+    counts = run_batch_file(source, output, concurrency=2, crew_factory=crew_factory)
+
+    assert counts == {"ok": 1, "error": 1}
+    records = {r["index"]: r for r in map(json.loads, output.read_text().splitlines())}
+    assert records[0]["run_id"] == "fixed" and records[0]["report"].endswith("fixed/report.md")
+    assert records[1]["status"] == "error" and records[1]["error"] == "RuntimeError: provider down"
+
+
+@pytest.mark.parametrize("run_id", ["../escape", "a/b", "x y"])
+def test_unsafe_run_ids_fail_that_run_only(tmp_path, crew_factory, run_id):
+    records = list(run_batch([{"topic": "a", "run_id": run_id}, {"topic": "b"}], crew_factory=crew_factory))
+
+    by_topic = {r["inputs"]["topic"]: r for r in records}
+    assert by_topic["a"]["status"] == "error" and "invalid run_id" in by_topic["a"]["error"]
+    assert by_topic["b"]["status"] == "ok"
+    assert not (tmp_path / "escape").exists()
+
+
+def test_invalid_input_lines_are_reported_before_any_run(tmp_path):
+    source = tmp_path / "inputs.jsonl"
+    source.write_text('{"topic": "a"}\n["not", "a", "dict"]\n')
+
+    with pytest.raises(ValueError, match="line 2 is not a JSON object"):
+        read_inputs(source)
@@ -0,0 +1,95 @@
+"""Context compaction: boilerplate, duplicates, budgeted selection, task wiring."""
+from __future__ import annotations
+
+import json
+
+from crewai import Task
+
+from crewai_template.compaction import CompactContextTask, compact, token_budget
+from crewai_template.llm_scheduler import estimate_tokens
+
+QUOTE = "OpenCV is used by more than 40,000 companies, according to the 2025 survey at https://opencv.org/survey."
+NAV = "Home | Products | Pricing | Blog"
+
+
+def test_clean_context_within_budget_is_unchanged():
+    analysis = json.dumps({"topic": "OpenCV", "findings": [], "recommendations": ["Adopt"]})
+    notes = "## Primary sources\n- https://opencv.org\n\n## Key findings\n- Widely used."
+
+    for text in (analysis, notes):
+        result = compact(text, budget=4000)
+        assert result.text == text
+        assert result.tokens_before == result.tokens_after
+
+
+def test_duplicates_and_boilerplate_are_dropped():
+    pages = [
+        f"Source A\n{NAV}\n\n{QUOTE}\n\nAccept all cookies to continue.",
+        f"Source B\n{NAV}\n\n{QUOTE}\n\nSubscribe to our newsletter!",
+        f"Source C\n{NAV}\n\nThe 4.10 release added a DNN backend. {QUOTE}",
+    ]
+
+    result = compact("\n\n----------\n\n".join(pages))
+
+    assert NAV not in result.text and "cookies" not in result.text and "newsletter" not in result.text
+    assert result.text.count(QUOTE) == 1  # the quote-only passages are inside Source C's
+    assert "DNN backend" in result.text and result.text.count("----------") == 2
+    assert result.duplicates == 2 and result.boilerplate == 5
+    assert result.tokens_after < result.tokens_before
+
+
+def test_over_budget_context_keeps_the_most_relevant_passages_in_order():
+    filler = [f"Paragraph {i} rambles about weather, lunch and unrelated gossip. " * 6 for i in range(30)]
+    relevant = [
+        "OpenCV adoption grew in robotics; key findings at https://example.com/robotics.",
+        "Camera calibration in OpenCV reached 99% accuracy on the benchmark.",
+    ]
+    text = "\n\n".join(["# Research notes", filler[0], relevant[0], *filler[1:15], relevant[1], *filler[15:]])
+
+    result = compact(text, budget=400, query="Analyse OpenCV adoption findings with confidence and evidence")
+
+    assert result.tokens_after <= 400 < result.tokens_before
+    assert result.text.startswith("# Research notes")
+    assert result.text.index(relevant[0]) < result.text.index(relevant[1])
+    assert result.over_budget > 0
+
+
+def test_long_blocks_are_split_into_passages_for_selection():
+    block = " ".join(f"Sentence {i} is filler text about nothing much at all." for i in range(200))
+    text = f"{block} OpenCV findings are here."
+
+    result = compact(text, budget=100, query="OpenCV findings")
+
+    assert "OpenCV findings are here." in result.text
+    assert result.tokens_after <= 100
+
+
+def test_task_compacts_its_context_before_running(monkeypatch):
+    seen = []
+    monkeypatch.setattr(Task, "_execute_core", lambda self, agent, context, tools: seen.append(context))
+    monkeypatch.setenv("CONTEXT_TOKEN_BUDGETS", "analysis_task=50")
+    task = CompactContextTask(name="analysis_task", description="Analyse OpenCV", expected_output="Findings")
+    dump = "\n\n".join([QUOTE, QUOTE, *(f"Unrelated filler paragraph number {i}." * 5 for i in range(20))])
+
+    task.execute_sync(context=dump)
+
+    assert seen[0].count(QUOTE) == 1 and estimate_tokens(seen[0]) <= 50
+    assert task.compaction.tokens_before == estimate_tokens(dump)
+
+    monkeypatch.setenv("CONTEXT_COMPACTION", "0")
+    task.execute_sync(context=dump)
+    assert seen[1] == dump
+
+
+def test_budgets_are_per_task(monkeypatch):
+    assert token_budget("analysis_task") == 6000 and token_budget("research_task") == 0
+    monkeypatch.setenv("CONTEXT_TOKEN_BUDGETS", "report_task=0")
+    assert token_budget("report_task") == 0 and token_budget("analysis_task") == 0
+
+
+def test_crew_compacts_analysis_and_report_context():
+    from crewai_template.crew import CrewaiTemplate
+
+    crew = CrewaiTemplate()
+    assert isinstance(crew.analysis_task(), CompactContextTask)
+    assert isinstance(crew.report_task(), CompactContextTask)
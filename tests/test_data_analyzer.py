@@ -0,0 +1,178 @@
+"""DataAnalyzerTool: parse-once dataset cache and profiled analyses."""
+from __future__ import annotations
+
+import statistics
+
+import pytest
+
+from crewai_template.tools import DataAnalyzerTool
+from crewai_template.tools import dataset as dataset_module
+from crewai_template.tools.dataset import (
+    CATEGORICAL,
+    DATE,
+    NUMERIC,
+    get_dataset_cache,
+    load_dataset,
+    profile_csv,
+    read_csv,
+)
+
+TABLE = "region,revenue,units\nnorth,100,5\nsouth,120,7\nnorth,90,x\nnorth,150,9\n"
+
+
+def test_identical_content_is_parsed_once(monkeypatch):
+    calls = []
+    real_parse = dataset_module._parse
+    monkeypatch.setattr(dataset_module, "_parse", lambda data, digest: calls.append(digest) or real_parse(data, digest))
+
+    tool = DataAnalyzerTool()
+    for analysis_type in ("summary", "trends", "patterns", "statistics", "insights"):
+        assert "Error" not in tool._run(data=TABLE, analysis_type=analysis_type)
+
+    assert len(calls) == 1
+    assert load_dataset(TABLE) is load_dataset(TABLE)
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setenv("DATA_ANALYZER_CACHE_SIZE", "2")
+    first = load_dataset("a,b\n1,2")
+    load_dataset("a,b\n3,4")
+    load_dataset("a,b\n1,2")  # refresh → most recently used
+    load_dataset("a,b\n5,6")
+
+    assert len(get_dataset_cache()) == 2
+    assert load_dataset("a,b\n1,2") is first
+
+
+def test_columns_are_typed_once():
+    data = load_dataset(TABLE)
+
+    assert data.kind == "table"
+    assert data.row_count == 4
+    region, revenue, units = data.columns
+    assert (region.kind, revenue.kind, units.kind) == (CATEGORICAL, NUMERIC, NUMERIC)
+    assert (revenue.numbers.count, revenue.numbers.mean) == (4, 115.0)
+    # The unparseable cell counts against the numeric column, not as a number
+    assert units.count == 3 and units.missing == 1
+    assert region.values.most_common(1) == [("north", 3)]
+
+
+def test_date_columns_and_short_rows():
+    data = load_dataset("day,value,note\n2024-01-01,1\n2024-01-03,2,ok\n2024-01-02,nan\n")
+    day, value, note = data.columns
+
+    assert day.kind == DATE
+    assert value.missing == 1  # NaN counts as missing
+    assert note.missing == 2
+    stats = DataAnalyzerTool()._run(data="day,value\n2024-01-03,1\n2024-01-01,2\n,3", analysis_type="statistics")
+    assert "day:\n  - Range: 2024-01-01 to 2024-01-03\n  - Count: 2 values\n  - Missing: 1 values" in stats
+
+
+def test_quoted_fields_and_sniffed_dialect():
+    data = load_dataset('name;note;score\n"Smith; J";"said ""hi""\nthen left";3\nLee;ok;4\n')
+
+    assert data.headers == ["name", "note", "score"]
+    assert data.row_count == 2
+    name, note, score = data.columns
+    assert name.values.most_common(1) == [("Smith; J", 1)]
+    assert note.values.counts["said \"hi\"\nthen left"] == 1
+    assert score.numbers.mean == 3.5
+
+
+def test_streams_file_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_module, "CHUNK_ROWS", 7)
+    path = tmp_path / "big.csv"
+    with path.open("w") as f:
+        f.write("id,group,value\n")
+        for i in range(1000):
+            f.write(f"{i},g{i % 3},{(i * 37) % 101}\n")
+
+    data = read_csv(path)
+    values = [(i * 37) % 101 for i in range(1000)]
+    column = data.columns[2]
+
+    assert data.row_count == 1000
+    assert column.numbers.count == 1000
+    assert column.numbers.mean == pytest.approx(statistics.fmean(values))
+    assert column.numbers.std == pytest.approx(statistics.stdev(values))
+    assert (column.numbers.first, column.numbers.last) == (values[0], values[-1])
+    assert data.columns[1].values.most_common(1) == [("g0", 334)]
+    # Iterators work too, and aren't mistaken for tables when they aren't
+    assert profile_csv(iter(["a,b\n", "1,2\n"])).row_count == 1
+    assert profile_csv(iter(["just some text\n", "more text\n"])) is None
+
+
+def test_high_cardinality_column_stays_bounded(monkeypatch):
+    monkeypatch.setenv("DATA_ANALYZER_TOP_K", "8")
+    rows = "\n".join(f"{'hot' if i % 4 == 0 else f'id{i}'}" + ",1" for i in range(2000))
+    data = load_dataset("key,x\n" + rows)
+    key = data.columns[0]
+
+    assert len(key.values.counts) <= 8
+    assert key.values.most_common(1)[0][0] == "hot"
+    patterns = DataAnalyzerTool()._run(data="key,x\n" + rows, analysis_type="patterns")
+    assert "key: Most common value is 'hot' (at least" in patterns
+
+
+def test_statistics_and_patterns_use_profiles():
+    tool = DataAnalyzerTool()
+    stats = tool._run(data=TABLE, analysis_type="statistics")
+    patterns = tool._run(data=TABLE, analysis_type="patterns")
+
+    assert (
+        "revenue:\n  - Average: 115.00\n  - Std Dev: 26.46\n  - Range: 90.00 to 150.00\n"
+        "  - Quartiles: 97.50 / 110.00 / 127.50 (25th / median / 75th)\n"
+    ) in stats
+    assert "region:\n  - Distinct values: 2\n  - Most common: 'north' (3 times)" in stats
+    assert "revenue ↔ units: +0.99 (strong positive, n=3)" in stats
+    assert "region: Most common value is 'north' (3 times)" in patterns
+
+
+def test_correlations_use_pairwise_complete_rows(monkeypatch):
+    monkeypatch.setattr(dataset_module, "CHUNK_ROWS", 50)
+    rows, xs, ys = [], [], []
+    for i in range(500):
+        x, y = i % 37, (i * 7) % 23 + (i % 37) / 2
+        if i % 11 == 0:
+            rows.append(f"{x},,c{i}")  # y missing → row excluded from the pair
+        else:
+            rows.append(f"{x},{y},c{i}")
+            xs.append(x)
+            ys.append(y)
+    data = load_dataset("x,y,label\n" + "\n".join(rows))
+
+    ((left, right, moments),) = data.correlations
+    assert (left, right, moments.count) == ("x", "y", len(xs))
+    assert moments.correlation == pytest.approx(statistics.correlation(xs, ys))
+
+
+def test_high_cardinality_distinct_is_estimated(monkeypatch):
+    monkeypatch.setenv("DATA_ANALYZER_TOP_K", "16")
+    rows = "\n".join(f"u{i % 5000},{i}" for i in range(20_000))
+    column = load_dataset("user,n\n" + rows).columns[0]
+
+    distinct, exact = column.distinct_count
+    assert not exact
+    assert distinct == pytest.approx(5000, rel=0.05)
+
+
+def test_inline_json_is_profiled_like_a_table():
+    payload = '{"meta": {"page": 2}, "data": [{"a": {"b": 1}, "xs": [1, 2]}, {"a": {"b": 3}, "xs": []}, {"id": 7}]}'
+    data = load_dataset(payload)
+    ab, xs, _ = data.columns
+
+    assert data.kind == "json" and data.content["meta"] == {"page": 2}
+    assert (ab.name, ab.numbers.mean, ab.missing) == ("a.b", 2.0, 1)
+    assert (xs.name, xs.numbers.max, xs.missing) == ("xs.length", 2.0, 1)
+    stats = DataAnalyzerTool()._run(data=payload, analysis_type="statistics")
+    assert "a.b:\n  - Average: 2.00" in stats
+
+
+def test_inline_jsonl_is_profiled_as_records():
+    payload = '{"region": "north", "revenue": 100}\n\n{"region": "south", "revenue": 120}\n{"region": "north"}\n'
+    data = load_dataset(payload)
+    region, revenue = data.columns
+
+    assert data.kind == "json" and data.row_count == 3
+    assert (revenue.name, revenue.numbers.mean, revenue.missing) == ("revenue", 110.0, 1)
+    assert load_dataset('{"a": 1}\nnot json, at all\n').kind != "json"
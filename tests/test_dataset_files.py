@@ -0,0 +1,137 @@
+"""DataAnalyzerTool file_path input: CSV, JSONL, Parquet/Feather, path policy, caching."""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from crewai_template.tools import DataAnalyzerTool, dataset_files
+from crewai_template.tools.data_analyzer import DataAnalyzerInput
+from crewai_template.tools.dataset import DATE, NUMERIC
+from crewai_template.tools.dataset_files import load_file
+
+
+@pytest.fixture(autouse=True)
+def _data_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_ANALYZER_ROOT", str(tmp_path))
+
+
+def test_csv_by_path(tmp_path):
+    (tmp_path / "sales.csv").write_text("region,revenue\nnorth,100\nsouth,120\nnorth,90\n")
+
+    result = DataAnalyzerTool()._run(file_path="sales.csv", analysis_type="statistics")
+
+    assert "Source: sales.csv" in result
+    assert "revenue:\n  - Average: 103.33" in result
+
+
+def test_jsonl_records_grow_columns(tmp_path):
+    lines = [{"id": 1, "score": 2.5}, {"id": 2, "score": 3.5, "tag": "new"}, 7, {"id": 3}]
+    (tmp_path / "events.jsonl").write_text("\n".join(json.dumps(line) for line in lines) + "\n\n")
+
+    data = load_file("events.jsonl")
+    columns = {column.name: column for column in data.columns}
+
+    assert data.row_count == 4
+    assert data.headers == ["id", "score", "tag", "value"]
+    assert columns["score"].kind == NUMERIC and columns["score"].numbers.mean == 3.0
+    assert columns["tag"].missing == 3  # absent before and after it first appeared
+    assert columns["value"].values.most_common() == [(7, 1)]
+
+
+def test_jsonl_nested_records_are_flattened(tmp_path):
+    lines = [{"user": {"id": i, "geo": {"country": "fr" if i % 2 else "de"}}, "tags": ["x"] * i} for i in range(5)]
+    (tmp_path / "users.ndjson").write_text("\n".join(json.dumps(line) for line in lines))
+
+    data = load_file("users.ndjson")
+    columns = {column.name: column for column in data.columns}
+
+    assert data.kind == "json"
+    assert data.headers == ["user.id", "user.geo.country", "tags.length"]
+    assert columns["tags.length"].numbers.mean == 2.0
+    assert columns["user.geo.country"].values.most_common(1) == [("de", 3)]
+
+
+def test_json_array_file_is_streamed(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_files, "READ_BUFFER_BYTES", 16)
+    records = [{"n": i, "ratio": i / 3, "note": 'say "hi", ] ok'} for i in range(500)]
+    (tmp_path / "dump.json").write_text(json.dumps(records, indent=2))
+
+    data = load_file("dump.json")
+    n, ratio, note = data.columns
+
+    assert data.row_count == 500 and data.content is None
+    assert n.numbers.max == 499 and ratio.numbers.mean == pytest.approx(249.5 / 3)
+    assert note.values.most_common() == [('say "hi", ] ok', 500)]
+    assert "Records: 500" in DataAnalyzerTool()._run(file_path="dump.json")
+
+
+def test_json_object_file_uses_its_record_array(tmp_path):
+    (tmp_path / "api.json").write_text(json.dumps({"page": 1, "results": [{"v": 1}, {"v": 3}], "ids": [1, 2, 3]}))
+
+    data = load_file("api.json")
+
+    assert data.headers == ["v"] and data.columns[0].numbers.mean == 2.0
+
+
+def test_jsonl_reports_bad_line(tmp_path):
+    (tmp_path / "bad.jsonl").write_text('{"a": 1}\n{nope\n')
+
+    assert "bad.jsonl: line 2 is not valid JSON" in DataAnalyzerTool()._run(file_path="bad.jsonl")
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_columnar_files(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({
+        "day": [dt.date(2024, 1, 1) + dt.timedelta(days=i) for i in range(10_000)],
+        "value": [float(i % 100) for i in range(10_000)],
+        "label": [None if i % 10 == 0 else f"l{i % 3}" for i in range(10_000)],
+    })
+    path = tmp_path / f"data{suffix}"
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, row_group_size=3000)
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path)
+
+    day, value, label = load_file(path.name).columns
+
+    assert day.kind == DATE and day.count == 10_000
+    assert value.numbers.mean == pytest.approx(49.5)
+    assert label.missing == 1000
+    assert label.values.most_common(1) == [("l1", 3000)]
+
+
+def test_paths_outside_root_are_rejected(tmp_path):
+    outside = tmp_path.parent / "secret.csv"
+    outside.write_text("a,b\n1,2\n")
+
+    assert "outside the data directory" in DataAnalyzerTool()._run(file_path=str(outside))
+    assert "outside the data directory" in DataAnalyzerTool()._run(file_path="../secret.csv")
+    assert "No such data file" in DataAnalyzerTool()._run(file_path="missing.csv")
+
+
+def test_profile_cached_until_file_changes(tmp_path):
+    path = tmp_path / "d.csv"
+    path.write_text("a,b\n1,2\n")
+    first = load_file("d.csv")
+    assert load_file("d.csv") is first
+
+    path.write_text("a,b\n1,2\n3,4\n")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    assert load_file("d.csv").row_count == 2
+
+
+def test_input_requires_exactly_one_source():
+    with pytest.raises(ValidationError):
+        DataAnalyzerInput()
+    with pytest.raises(ValidationError):
+        DataAnalyzerInput(data="a,b\n1,2", file_path="x.csv")
+    assert DataAnalyzerInput(file_path="x.csv").data is None
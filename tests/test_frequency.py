@@ -0,0 +1,41 @@
+"""Text word/phrase frequencies: phrase rules, bounded memory, analyzer output."""
+from __future__ import annotations
+
+from crewai_template.tools import DataAnalyzerTool
+from crewai_template.tools.frequency import TermFrequencies, count_terms
+
+TEXT = (
+    "Machine learning models need data. We trained machine learning models on logs. "
+    "The machine learning models of the team improved. Data quality matters; data quality is key!"
+)
+
+
+def test_repeated_phrases_prefer_the_longest_and_skip_stopwords():
+    terms = count_terms(TEXT.split("."))
+
+    assert terms.repeated_phrases() == [("machine learning models", 3), ("data quality", 2)]
+    assert terms.words.most_common(1)[0][1] == 3
+    assert ("of", "the") in terms.phrases.counts  # counted, just never reported
+
+
+def test_phrases_do_not_cross_lines():
+    terms = count_terms(["alpha beta\ngamma delta", "alpha beta\ngamma delta"])
+
+    assert ("beta", "gamma") not in terms.phrases.counts
+    assert terms.repeated_phrases() == [("alpha beta", 2), ("gamma delta", 2)]
+
+
+def test_memory_is_bounded_by_capacity():
+    terms = TermFrequencies(capacity=8)
+    for batch in range(20):
+        terms.update([" ".join(f"w{batch}x{i} common phrase" for i in range(200))])
+
+    assert len(terms.words.counts) <= 8 and len(terms.phrases.counts) <= 128
+    assert not terms.phrases.exact
+    assert terms.repeated_phrases(1)[0][0] == "common phrase"
+
+
+def test_patterns_report_repeated_phrases():
+    result = DataAnalyzerTool()._run(data=TEXT, analysis_type="patterns")
+
+    assert "• Repeated phrases:\n  - 'machine learning models' (3 times)\n  - 'data quality' (2 times)" in result
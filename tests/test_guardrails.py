@@ -1,9 +1,16 @@
-"""Unit tests for the guardrail — pure function, no LLM needed."""
+"""Unit tests for the guardrails — pure functions, plus one streamed early abort."""
 from __future__ import annotations
 
 from types import SimpleNamespace
 
-from crewai_template.schemas import ensure_markdown_report
+from crewai.events import crewai_event_bus
+from crewai.llms.base_llm import BaseLLM, llm_call_context
+
+from crewai_template.guardrails import GuardrailRegistry, Rule, TextScan, min_length, report_guardrails
+from crewai_template.schemas import ensure_markdown_report, report_prefix_problem
+from crewai_template.streaming import ReportStream
+
+GOOD = "# Title\n" + ("body text " * 30) + "\n\n## Recommendations\n- Ship it."
 
 
 def _output(raw: str):
@@ -11,8 +18,7 @@ def _output(raw: str):
 
 
 def test_passes_when_heading_and_long_enough():
-    body = "# Title\n" + ("body text " * 30)
-    ok, payload = ensure_markdown_report(_output(body))
+    ok, payload = ensure_markdown_report(_output(GOOD))
     assert ok is True
     assert isinstance(payload, str)
 
@@ -33,3 +39,69 @@ def test_handles_empty_input():
     ok, msg = ensure_markdown_report(_output(""))
     assert ok is False
     assert "heading" in msg.lower()
+
+
+def test_fails_when_title_comes_too_late():
+    ok, msg = ensure_markdown_report(_output("preamble " * 30 + "\n# Title\n" + "body text " * 30))
+    assert ok is False
+    assert "first 200 characters" in msg
+
+
+def test_every_failure_is_reported_in_one_pass(monkeypatch):
+    scans = []
+    original = TextScan.of
+    monkeypatch.setattr(TextScan, "of", classmethod(lambda cls, text: scans.append(text) or original(text)))
+
+    ok, msg = ensure_markdown_report(_output("```markdown\nplain text"))
+
+    assert ok is False and len(scans) == 1
+    for fragment in ("heading", "code fences", "## Recommendations", "too short"):
+        assert fragment in msg
+
+
+def test_prefix_rules_decide_early_and_others_wait_for_the_end():
+    assert report_prefix_problem("```") is not None
+    assert report_prefix_problem("Some prose " * 5) is None  # a title may still come
+    assert "heading" in report_prefix_problem("Some prose " * 20)
+    assert report_prefix_problem("# Title\nshort") is None  # length and sections are final-only
+
+
+def test_registry_composes_and_replaces_rules_by_name():
+    registry = GuardrailRegistry([min_length(10)])
+    registry.register(Rule("no_todo", lambda scan, final: "Remove TODOs." if "TODO" in scan.text else None))
+
+    assert registry(_output("TODO")) == (False, "Report is too short (4 chars). Expand to ≥10 chars. Remove TODOs.")
+    registry.register(min_length(2))
+    registry.unregister("no_todo")
+    assert registry(_output("TODO")) == (True, "TODO")
+    assert [rule.name for rule in report_guardrails.rules][:2] == ["heading_within", "no_wrapping_fence"]
+
+
+class StreamingLLM(BaseLLM):
+    """Streams a canned answer in small chunks, counting how many it sent."""
+
+    answer: str = ""
+    sent: int = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        with llm_call_context():
+            for i in range(0, len(self.answer), 10):
+                self._emit_stream_chunk_event(self.answer[i:i + 10], from_task=from_task)
+                self.sent += 1
+        return self.answer
+
+
+def test_doomed_draft_stops_generating_and_returns_the_partial_text():
+    llm = StreamingLLM(model="fake", answer="Final Answer: " + "Untitled prose. " * 500)
+    task = SimpleNamespace(id="report", name="report", agent=SimpleNamespace(llm=llm), output_file="report.md")
+
+    with crewai_event_bus.scoped_handlers():
+        stream = ReportStream(task, [], abort=True).attach()
+        partial = llm.call([{"role": "user", "content": "write"}], from_task=task)
+        stream.detach()
+
+    assert llm.sent < 30  # stopped ~200 chars into an 8000-char draft
+    assert partial.startswith("Final Answer: Untitled prose.") and len(partial) < 300
+    ok, msg = ensure_markdown_report(_output(partial))
+    assert ok is False and "heading" in msg
@@ -0,0 +1,96 @@
+"""Streaming extractor — must match the BeautifulSoup reference pipeline."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from crewai_template.tools.html_extract import (
+    extract_html,
+    extract_stream,
+    sniff_encoding,
+    soup_extract,
+)
+
+PAGES = [
+    b"<html><body><p>Hello world</p><script>x=1</script></body></html>",
+    (
+        b"<html><head><title>T &amp; U</title></head><body>"
+        b"<nav><a href='http://n.example'>nav</a></nav>"
+        b"<p>a  b\r\n  c</p><a href='https://x.example'>Link <b>bold</b></a>"
+        b"<header>h<footer>f</header> tail <!-- comment --> &#150; end"
+        b"<a href='http://z.example'>unclosed"
+    ),
+    "<div>line1\nline2<nav><div>x</nav>after</div><style>p{}</style> café next".encode(),
+    # whitespace-only text between tags collapses like bs4: one space, or "\n" if it has one
+    b"<p>a</p>\t<p>b</p>\n  \n<p>c</p> <b>d</b>\t\t<i>e</i><pre>  </pre>f",
+]
+
+
+def _random_page(rng: random.Random) -> str:
+    parts = []
+    for _ in range(200):
+        kind = rng.random()
+        if kind < 0.15:
+            tag = rng.choice(["script", "style", "nav", "footer", "header"])
+            parts.append(f"<{tag}>skip {rng.randint(0, 9)}</{tag}>")
+        elif kind < 0.3:
+            parts.append(f"<a href='https://e.example/{rng.randint(0, 99)}'>link {rng.randint(0, 9)}</a>")
+        else:
+            words = " ".join(rng.choice(["alpha", "beta", "  ", "\n", "\t", "&amp;", "gamma"]) for _ in range(8))
+            parts.append(f"<p>{words}</p>")
+    return "<html><body>" + "".join(parts) + "</body></html>"
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_matches_soup_pipeline(page):
+    text, links = soup_extract(page)
+    result = extract_html(page, collect_links=True)
+    assert (result.text, result.links) == (text, links)
+    assert result.text_complete and result.links_complete
+
+
+def test_matches_soup_pipeline_under_arbitrary_chunking():
+    rng = random.Random(7)
+    for _ in range(20):
+        page = _random_page(rng)
+        expected_text, expected_links = soup_extract(page)
+        cuts = sorted(rng.sample(range(1, len(page)), 15))
+        chunks = [page[i:j] for i, j in zip([0, *cuts], [*cuts, len(page)])]
+        result = extract_stream(chunks, collect_links=True)
+        assert (result.text, result.links) == (expected_text, expected_links)
+
+
+def test_early_stop_yields_an_exact_prefix():
+    rng = random.Random(11)
+    for _ in range(20):
+        page = _random_page(rng).replace("\n", "")  # minified: one long line
+        expected, _ = soup_extract(page)
+        max_chars = rng.randint(1, len(expected) + 10)
+        chunks = [page[i:i + 97] for i in range(0, len(page), 97)]
+        result = extract_stream(chunks, max_chars=max_chars)
+        assert expected.startswith(result.text)
+        assert (len(result.text) > max_chars) == (len(expected) > max_chars)
+
+
+def test_stops_once_max_chars_produced():
+    page = "<p>" + "word " * 200_000 + "</p>"
+    chunks = [page[i:i + 4096] for i in range(0, len(page), 4096)]
+    fed = []
+
+    def tracking():
+        for chunk in chunks:
+            fed.append(chunk)
+            yield chunk
+
+    result = extract_stream(tracking(), max_chars=100)
+    expected, _ = soup_extract(page)
+    assert len(result.text) > 100 and expected.startswith(result.text)
+    assert not result.text_complete
+    assert len(fed) < 3
+
+
+def test_sniffs_encoding_from_header_then_meta():
+    assert sniff_encoding("text/html; charset=ISO-8859-1", b"") == "iso8859-1"
+    assert sniff_encoding("text/html", b'<meta charset="windows-1252">') == "cp1252"
+    assert sniff_encoding(None, b"<html>") == "utf-8"
@@ -0,0 +1,66 @@
+"""Connection pooling for the scraper — exercised against a local HTTP server."""
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crewai_template.tools import http_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):  # noqa: N802 — name fixed by parent class
+        body = b"<html><body><p>pooled</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    http_session.reset_session()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    http_session.reset_session()
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused_across_requests(server_url):
+    for _ in range(3):
+        http_session.get_session().get(f"{server_url}/page", timeout=5).raise_for_status()
+
+    stats = http_session.pool_stats()
+    assert stats == {"requests": 3, "hits": 2, "misses": 1}
+
+
+def test_sessions_are_per_thread_but_share_the_pool(server_url):
+    sessions = []
+
+    def _fetch():
+        session = http_session.get_session()
+        sessions.append(session)
+        session.get(f"{server_url}/page", timeout=5).raise_for_status()
+
+    _fetch()
+    worker = threading.Thread(target=_fetch)
+    worker.start()
+    worker.join()
+
+    assert sessions[0] is not sessions[1]
+    assert http_session.pool_stats()["hits"] == 1
+
+
+def test_session_requests_compressed_transfer():
+    session = http_session.get_session()
+    assert "gzip" in session.headers["Accept-Encoding"]
@@ -0,0 +1,131 @@
+"""LLM response cache: content addressing, TTL/size bounds, bypass, crew wiring."""
+from __future__ import annotations
+
+import asyncio
+
+from crewai.llms.base_llm import BaseLLM
+from pydantic import BaseModel
+
+from crewai_template.llm_cache import LLMCache, bypass_llm_cache, cache_key, cache_llm, get_llm_cache
+from crewai_template.tools import DataAnalyzerTool
+from crewai_template.tools.dataset import reset_dataset_cache
+
+MESSAGES = [{"role": "user", "content": "Summarise OpenCV"}]
+
+
+class FakeLLM(BaseLLM):
+    """Counts provider round trips and echoes the last message."""
+
+    calls: int = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        self.calls += 1
+        return f"answer {self.calls} to {messages[-1]['content']}"
+
+    async def acall(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+                    from_agent=None, response_model=None):
+        return self.call(messages, tools)
+
+
+class Report(BaseModel):
+    title: str
+
+
+def test_identical_requests_hit_and_anything_else_misses():
+    llm = cache_llm(FakeLLM(model="fake-model", temperature=0.2))
+
+    first = llm.call(MESSAGES)
+    assert llm.call(MESSAGES) == first and llm.calls == 1
+    llm.call(MESSAGES, tools=[{"type": "function", "function": {"name": "search"}}])
+    llm.call([{"role": "user", "content": "Summarise NumPy"}])
+    llm.call(MESSAGES, response_model=Report)
+    assert llm.calls == 4
+
+    stats = get_llm_cache().stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 4, 4)
+    assert stats["hit_rate"] == 0.2
+
+
+def test_key_covers_sampling_params_but_not_transport():
+    base = cache_key(FakeLLM(model="fake-model", temperature=0.2), MESSAGES)
+
+    assert cache_key(FakeLLM(model="fake-model", temperature=0.2, api_key="other"), MESSAGES) == base
+    assert cache_key(FakeLLM(model="fake-model", temperature=0.7), MESSAGES) != base
+    assert cache_key(FakeLLM(model="fake-model-2", temperature=0.2), MESSAGES) != base
+    assert cache_key(FakeLLM(model="fake-model", temperature=0.2, stop=["\n"]), MESSAGES) != base
+
+
+def test_async_calls_share_the_cache():
+    llm = cache_llm(FakeLLM(model="fake-model"))
+
+    assert asyncio.run(llm.acall(MESSAGES)) == llm.call(MESSAGES)
+    assert llm.calls == 1
+
+
+def test_bypass_refreshes_and_function_calls_are_never_cached(monkeypatch):
+    llm = cache_llm(cache_llm(FakeLLM(model="fake-model")))
+    llm.call(MESSAGES)
+    with bypass_llm_cache():
+        assert llm.call(MESSAGES).startswith("answer 2")
+    assert llm.call(MESSAGES).startswith("answer 2")  # the bypassed call refreshed the entry
+    monkeypatch.setenv("LLM_CACHE_BYPASS", "1")
+    assert llm.call(MESSAGES).startswith("answer 3")
+    monkeypatch.delenv("LLM_CACHE_BYPASS")
+
+    llm.call(MESSAGES, available_functions={"search": print})
+    llm.call(MESSAGES, available_functions={"search": print})
+    assert llm.calls == 5
+    assert get_llm_cache().stats()["bypassed"] == 2
+
+
+def test_expired_and_least_recently_used_entries_are_dropped(tmp_path, monkeypatch):
+    cache = LLMCache(tmp_path / "bounded.sqlite3", ttl=60, max_bytes=200)
+    clock = [1000.0]
+    monkeypatch.setattr("crewai_template.llm_cache.time.time", lambda: clock[0])
+
+    cache.put("old", "m", "x" * 80, 1.0)
+    clock[0] += 1
+    cache.put("recent", "m", "y" * 80, 1.0)
+    clock[0] += 1
+    assert cache.get("old")[0]  # now the most recently used
+    cache.put("new", "m", "z" * 80, 1.0)
+    assert [cache.get(key)[0] for key in ("old", "recent", "new")] == [True, False, True]
+
+    clock[0] += 120
+    assert cache.get("new") == (False, None)
+    cache.close()
+
+
+def test_disabled_cache_passes_calls_through(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", "off")
+    llm = cache_llm(FakeLLM(model="fake-model"))
+
+    llm.call(MESSAGES)
+    llm.call(MESSAGES)
+    assert llm.calls == 2 and get_llm_cache() is None
+
+
+def test_crew_agents_go_through_the_cache():
+    from crewai_template.crew import CrewaiTemplate
+
+    crew = CrewaiTemplate().crew()
+
+    assert all(getattr(agent.llm, "_response_cache", False) for agent in crew.agents)
+
+
+def test_analyst_run_with_a_tool_call_replays_from_the_cache():
+    def analyst_run():
+        llm = cache_llm(FakeLLM(model="fake-model"))
+        messages = [{"role": "user", "content": "Analyse the revenue table"}]
+        action = llm.call(messages)
+        observation = DataAnalyzerTool()._run(data="region,revenue\nnorth,100\nsouth,120\n", analysis_type="statistics")
+        messages += [{"role": "assistant", "content": action}, {"role": "user", "content": f"Observation: {observation}"}]
+        return llm.call(messages), llm.calls
+
+    first, calls = analyst_run()
+    reset_dataset_cache()  # a fresh process re-runs the tool
+    replayed, replay_calls = analyst_run()
+
+    assert (calls, replay_calls) == (2, 0)
+    assert replayed == first
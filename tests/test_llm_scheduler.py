@@ -0,0 +1,167 @@
+"""Per-provider LLM admission: slots, token budgets, priorities, re-entrancy, cancellation."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from crewai_template.llm_scheduler import (
+    LLMScheduler,
+    agent_priority,
+    estimate_tokens,
+    get_llm_scheduler,
+    parse_limits,
+    provider_of,
+    schedule_llm,
+)
+
+
+class SlowLLM:
+    def __init__(self, model):
+        self.model = model
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def call(self, messages, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.03)
+        with self.lock:
+            self.active -= 1
+        return "ok"
+
+    async def acall(self, messages, **kwargs):
+        # Like crewAI's providers, the async path may delegate to `call`.
+        return self.call(messages)
+
+
+class RetryingLLM(SlowLLM):
+    """Calls itself once more, the way crewAI's `call` retries without `stop`."""
+
+    def call(self, messages, retry=True, **kwargs):
+        return self.call(messages, retry=False) if retry else super().call(messages)
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_each_provider_has_its_own_slots(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER_CONCURRENCY", "anthropic=2")
+    claude = schedule_llm(SlowLLM("anthropic/claude-sonnet-4-6"))
+    gpt = schedule_llm(SlowLLM("openai/gpt-4.1-mini"))
+
+    with ThreadPoolExecutor(12) as pool:
+        list(pool.map(lambda llm: llm.call([]), [claude] * 6 + [gpt] * 6))
+
+    assert claude.peak == 2
+    assert gpt.peak == 6
+    assert get_llm_scheduler().stats()["anthropic"]["admitted"] == 6
+
+
+def test_nested_calls_reuse_the_held_slot(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "1")
+    llm = schedule_llm(RetryingLLM("anthropic/claude-sonnet-4-6"))
+
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(llm.call, []).result(timeout=2) == "ok"
+    assert get_llm_scheduler().stats()["anthropic"]["in_flight"] == 0
+
+
+def test_async_calls_wait_for_a_slot_without_deadlock(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "1")
+    llm = schedule_llm(schedule_llm(SlowLLM("gemini/gemini-2.5-flash")))
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(*(llm.acall([]) for _ in range(3))), timeout=2)
+
+    assert asyncio.run(main()) == ["ok"] * 3
+    assert llm.peak == 1
+
+
+def test_freed_slot_goes_to_the_highest_priority_waiter():
+    scheduler = LLMScheduler(concurrency=1)
+    order = []
+
+    def request(name, priority):
+        with scheduler.slot("anthropic", priority):
+            order.append(name)
+
+    with scheduler.slot("anthropic"):
+        threads = [threading.Thread(target=request, args=("researcher", agent_priority("researcher")))]
+        threads[0].start()
+        wait_until(lambda: scheduler.stats()["anthropic"]["queued"] == 1)
+        threads.append(threading.Thread(target=request, args=("editor", agent_priority("editor"))))
+        threads[1].start()
+        wait_until(lambda: scheduler.stats()["anthropic"]["queued"] == 2)
+        assert scheduler.stats()["anthropic"]["in_flight"] == 1
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert order == ["editor", "researcher"]
+    stats = scheduler.stats()["anthropic"]
+    assert (stats["in_flight"], stats["queued"], stats["peak_queued"], stats["admitted"]) == (0, 0, 2, 3)
+
+
+def test_token_budget_paces_requests():
+    # 600 TPM refills 10 tokens/s; the first prompt empties the bucket.
+    scheduler = LLMScheduler(tpm={"openai": 600})
+    with scheduler.slot("openai", tokens=100):
+        pass
+
+    started = time.monotonic()
+    with scheduler.slot("openai", tokens=5):
+        pass
+    assert 0.4 <= time.monotonic() - started < 2
+    assert scheduler.stats()["openai"]["wait_seconds"] >= 0.4
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = LLMScheduler(concurrency=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.aslot("openai"):
+                await release.wait()
+
+        async def waiter():
+            async with scheduler.aslot("openai"):
+                return "admitted"
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        blocked = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["openai"]["queued"] == 1
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+        assert scheduler.stats()["openai"]["queued"] == 0
+        release.set()
+        await held
+        return await asyncio.wait_for(waiter(), timeout=1)
+
+    assert asyncio.run(main()) == "admitted"
+    assert scheduler.stats()["openai"]["in_flight"] == 0
+
+
+def test_limit_parsing_provider_names_and_token_estimates(monkeypatch):
+    assert parse_limits(" anthropic=2, Gemini=16 ,") == {"anthropic": 2, "gemini": 16}
+    with pytest.raises(ValueError, match="expected name=N"):
+        parse_limits("anthropic:2")
+    assert provider_of(SlowLLM("gpt-4.1-mini")) == "openai"
+    assert provider_of(SlowLLM("anthropic/claude-sonnet-4-6")) == "anthropic"
+    assert estimate_tokens("x" * 400) == 101
+    assert estimate_tokens([{"role": "user", "content": "x" * 400}]) == 105
+    monkeypatch.setenv("LLM_AGENT_PRIORITY", "researcher=0")
+    assert (agent_priority("Researcher"), agent_priority("editor")) == (0, 1)
@@ -0,0 +1,72 @@
+"""Column-sharded profiling across a process pool."""
+from __future__ import annotations
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from crewai_template.tools import parallel
+from crewai_template.tools.dataset import NUMERIC, TableShard
+from crewai_template.tools.dataset_files import load_file, read_file
+
+
+@pytest.fixture
+def wide_csv(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_ANALYZER_ROOT", str(tmp_path))
+    monkeypatch.setenv("DATA_ANALYZER_PARALLEL_MIN_BYTES", "0")
+    monkeypatch.setenv("DATA_ANALYZER_CORRELATION_COLUMNS", "3")
+    rng = random.Random(0)
+    lines = ["id,city,a,b,note,c,d"]
+    for i in range(300):
+        lines.append(f"{i},{rng.choice('xyz')},{rng.gauss(0, 1):.3f},{i * 2 + rng.random():.3f},n{i % 7},{rng.random():.3f},")
+    (tmp_path / "wide.csv").write_text("\n".join(lines) + "\n")
+    return tmp_path / "wide.csv"
+
+
+def _summary(data):
+    return (
+        data.headers,
+        data.row_count,
+        [(c.name, c.kind, c.count, c.numbers.mean, c.values.most_common(3), c.kind == NUMERIC and c.quantiles.quantiles([0.5])) for c in data.columns],
+        [(left, right, moments.count, moments.c_xy) for left, right, moments in data.correlations],
+    )
+
+
+def test_plan_keeps_correlated_columns_together():
+    shards = parallel.plan_shards(8, [0, 2, 5], workers=3)
+
+    assert shards[0] == TableShard(columns=(0, 2, 5), correlate=True)
+    assert sorted(i for shard in shards for i in shard.columns) == list(range(8))
+    assert not any(shard.correlate for shard in shards[1:])
+    assert parallel.plan_shards(3, [1], workers=2)[0].correlate is False
+
+
+def test_sharded_profile_matches_serial(wide_csv, monkeypatch):
+    monkeypatch.setattr("crewai_template.tools.dataset.CHUNK_ROWS", 50)  # pairs fixed from the first chunk
+    pool = ThreadPoolExecutor(3)  # same sharding path, without process start-up
+    monkeypatch.setattr(parallel, "get_process_pool", lambda: (pool, 3))
+
+    sharded = parallel.profile_sharded(read_file, wide_csv)
+
+    assert _summary(sharded) == _summary(read_file(wide_csv))
+    assert len(sharded.correlations) == 3  # pairs of id, a, b
+    pool.shutdown()
+
+
+def test_worker_processes(wide_csv, monkeypatch):
+    # Spawned workers re-import everything, so only env settings reach them.
+    monkeypatch.setenv("DATA_ANALYZER_WORKERS", "2")
+
+    data = load_file("wide.csv")
+
+    assert parallel.get_process_pool()[1] == 2
+    assert _summary(data) == _summary(read_file(wide_csv))
+
+
+def test_small_files_stay_in_process(wide_csv, monkeypatch):
+    monkeypatch.setenv("DATA_ANALYZER_WORKERS", "2")
+    monkeypatch.setenv("DATA_ANALYZER_PARALLEL_MIN_BYTES", str(10 ** 9))
+    monkeypatch.setattr(parallel, "profile_sharded", lambda *args: pytest.fail("sharded a small file"))
+
+    assert load_file("wide.csv").row_count == 300
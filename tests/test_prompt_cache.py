@@ -0,0 +1,109 @@
+"""Prompt caching: static YAML prefixes, the extra Anthropic breakpoint, per-agent cached tokens."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import yaml
+from crewai import Task
+from crewai.llms.base_llm import BaseLLM
+from crewai.llms.cache import CACHE_BREAKPOINT_KEY, mark_cache_breakpoint
+
+from crewai_template.llm_cache import cache_llm
+from crewai_template.llm_scheduler import schedule_llm
+from crewai_template.prompt_cache import (
+    cache_static_prompts,
+    cached_token_usage,
+    split_static_prefix,
+    static_head,
+    usage_snapshot,
+)
+
+CONFIG = "src/crewai_template/config"
+
+
+class RecordingLLM(BaseLLM):
+    calls: list = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        self.calls.append(messages)
+        return "ok"
+
+
+def task_messages(task):
+    prompt = f"\nCurrent Task: {task.description}\n\nThis is the context you're working with:\nnotes"
+    return [
+        mark_cache_breakpoint({"role": "system", "content": "You are Insight Analyst."}),
+        mark_cache_breakpoint({"role": "user", "content": prompt}),
+    ]
+
+
+def interpolated(description):
+    task = Task(description=description, expected_output="A report")
+    task.interpolate_inputs_and_add_conversation_history({"topic": "OpenCV"})
+    return task
+
+
+def test_configs_keep_run_inputs_out_of_static_prompts():
+    agents = yaml.safe_load(open(f"{CONFIG}/agents.yaml"))
+    tasks = yaml.safe_load(open(f"{CONFIG}/tasks.yaml"))
+
+    for agent in agents.values():
+        assert "{" not in agent["role"] + agent["goal"] + agent["backstory"]
+    for task in tasks.values():
+        head = static_head(SimpleNamespace(description=task["description"]))
+        assert len(head) > 0.8 * len(task["description"])
+
+
+def test_task_prompt_is_split_after_its_static_head():
+    task = interpolated("Follow these long instructions. Topic: {topic}.")
+    messages = task_messages(task)
+
+    split = split_static_prefix(messages, static_head(task))
+
+    assert [m["content"] for m in split[1:]] == [
+        "\nCurrent Task: Follow these long instructions. Topic: ",
+        "OpenCV.\n\nThis is the context you're working with:\nnotes",
+    ]
+    assert all(m.get(CACHE_BREAKPOINT_KEY) for m in split)
+    assert messages[1]["content"].endswith("notes")  # the executor's buffer is not touched
+    assert split_static_prefix(messages, "") is messages
+    assert split_static_prefix(messages, "not in the prompt") is messages
+
+
+def test_only_anthropic_task_calls_are_rewritten(monkeypatch):
+    task = interpolated("Follow these long instructions. Topic: {topic}.")
+
+    anthropic = cache_static_prompts(RecordingLLM(model="claude-sonnet-4-6", provider="anthropic", calls=[]))
+    anthropic.call(task_messages(task), from_task=task)
+    anthropic.call([{"role": "user", "content": "Convert this."}], from_task=task)
+    assert [len(m) for m in anthropic.calls] == [3, 1]
+
+    openai = cache_static_prompts(RecordingLLM(model="gpt-4.1-mini", provider="openai", calls=[]))
+    openai.call(task_messages(task), from_task=task)
+    assert len(openai.calls[0]) == 2
+
+    wrapped = RecordingLLM(model="claude-opus-4-7", provider="anthropic", calls=[])
+    cache_llm(schedule_llm(cache_static_prompts(wrapped)))  # as the crew stacks them
+    wrapped.call(task_messages(task), from_task=task)
+    assert len(wrapped.calls[0]) == 3
+
+    monkeypatch.setenv("PROMPT_CACHE", "0")
+    off = cache_static_prompts(RecordingLLM(model="claude-sonnet-4-6", provider="anthropic", calls=[]))
+    off.call(task_messages(task), from_task=task)
+    assert len(off.calls[0]) == 2
+
+
+def test_cached_tokens_are_reported_per_agent_for_one_kickoff():
+    llm = RecordingLLM(model="claude-sonnet-4-6", provider="anthropic", calls=[])
+    agents = {"analyst": SimpleNamespace(llm=llm), "editor": SimpleNamespace(llm=None)}
+    llm._track_token_usage_internal({"prompt_tokens": 500, "completion_tokens": 10})
+    baseline = usage_snapshot(agents)
+
+    llm._track_token_usage_internal({"prompt_tokens": 2000, "cached_prompt_tokens": 1500, "completion_tokens": 50})
+
+    report = cached_token_usage(agents, baseline)
+    assert report["analyst"]["prompt_tokens"] == 2000
+    assert report["analyst"]["cached_prompt_tokens"] == 1500
+    assert report["analyst"]["cached_share"] == 0.75
+    assert report["editor"]["prompt_tokens"] == 0
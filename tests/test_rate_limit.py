@@ -0,0 +1,81 @@
+"""Per-host token-bucket limiter — driven by a fake clock, no real sleeping."""
+from __future__ import annotations
+
+import threading
+
+from crewai_template.tools.rate_limit import HostRateLimiter
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: _FakeClock, **kwargs) -> HostRateLimiter:
+    return HostRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_different_hosts_do_not_wait():
+    clock = _FakeClock()
+    limiter = _limiter(clock, rate=1.0)
+    for host in ("a.example", "b.example", "c.example"):
+        assert limiter.acquire(f"https://{host}/page") == 0
+    assert clock.slept == []
+
+
+def test_same_host_is_spaced_to_rate():
+    clock = _FakeClock()
+    limiter = _limiter(clock, rate=2.0)
+    limiter.acquire("https://a.example/1")
+    assert limiter.acquire("https://a.example/2") == 0.5
+    assert limiter.acquire("https://A.example/3") == 0.5  # hostnames are case-insensitive
+
+
+def test_burst_admits_back_to_back_requests():
+    clock = _FakeClock()
+    limiter = _limiter(clock, rate=1.0, burst=3)
+    waits = [limiter.acquire("https://a.example/") for _ in range(4)]
+    assert waits == [0, 0, 0, 1.0]
+
+
+def test_robots_crawl_delay_slows_host(monkeypatch):
+    clock = _FakeClock()
+    limiter = _limiter(clock, rate=10.0, burst=5, honor_robots=True)
+    monkeypatch.setattr(limiter, "_crawl_delay", lambda scheme, host: 4.0)
+    limiter.acquire("https://slow.example/")
+    assert limiter.acquire("https://slow.example/next") == 4.0
+
+
+def test_robots_lookup_runs_once_and_outside_the_lock(monkeypatch):
+    clock = _FakeClock()
+    limiter = _limiter(clock, honor_robots=True)
+    started, release, lookups = threading.Event(), threading.Event(), []
+
+    def slow_lookup(scheme, host):
+        lookups.append(host)
+        if host == "slow.example":
+            started.set()
+            release.wait(5)
+        return None
+
+    monkeypatch.setattr(limiter, "_crawl_delay", slow_lookup)
+    first = threading.Thread(target=limiter.acquire, args=("https://slow.example/1",))
+    second = threading.Thread(target=limiter.acquire, args=("https://slow.example/2",))
+    first.start()
+    assert started.wait(5)
+    second.start()
+
+    assert limiter.acquire("https://fast.example/") == 0  # not stuck behind slow.example's robots.txt
+    assert second.is_alive()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert lookups == ["slow.example", "fast.example"]
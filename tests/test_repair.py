@@ -0,0 +1,109 @@
+"""Structured-output repair: tolerant extraction, coercion, field patches, fallback, metrics."""
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from crewai.llms.base_llm import BaseLLM
+from crewai.utilities.converter import convert_to_model
+
+from crewai_template.repair import RepairingConverter, apply_patch, coerce, extract_json, get_repair_stats
+from crewai_template.schemas import AnalysisReport
+
+FINDING = {"title": "Adoption", "evidence": "Used by 40k companies", "confidence": 0.8}
+
+
+class ScriptedLLM(BaseLLM):
+    """Replies with the next canned response and records every prompt."""
+
+    replies: list = []
+    prompts: list = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None,
+             from_agent=None, response_model=None):
+        self.prompts.append(messages)
+        return self.replies.pop(0)
+
+    def supports_function_calling(self):
+        return False
+
+
+def converter(text, *replies):
+    llm = ScriptedLLM(model="fake", replies=list(replies), prompts=[])
+    return RepairingConverter(llm=llm, text=text, model=AnalysisReport, instructions="Convert."), llm
+
+
+def test_extraction_tolerates_prose_fences_and_python_literals():
+    text = 'Here is the report:\n```json\n{"topic": "OpenCV", "draft": True, "tags": ["a", "b",],}\n```\nThanks!'
+
+    assert extract_json(text) == {"topic": "OpenCV", "draft": True, "tags": ["a", "b"]}
+    assert extract_json("no json {here") is None
+
+
+def test_coercion_follows_the_schema():
+    data = {
+        "topic": "OpenCV",
+        "findings": {"title": "Adoption", "evidence": 40000, "confidence": "85%"},
+        "recommendations": "Adopt it",
+    }
+
+    fixed = coerce(data, AnalysisReport)
+
+    assert fixed["findings"] == [{"title": "Adoption", "evidence": "40000", "confidence": 0.85}]
+    assert fixed["recommendations"] == ["Adopt it"]
+    scores = [{**FINDING, "confidence": c} for c in (1.2, -0.3, 85, "0.4")]
+    assert [f["confidence"] for f in coerce({"findings": scores}, AnalysisReport)["findings"]] == [1, 0, 0.85, 0.4]
+
+
+def test_out_of_range_confidence_is_repaired_without_an_llm_call():
+    report = {"topic": "OpenCV", "findings": [{**FINDING, "confidence": 1.2}], "recommendations": ["Adopt"]}
+    conv, llm = converter(f"Final report:\n{json.dumps(report)}")
+
+    result = conv.to_pydantic()
+
+    assert result.findings[0].confidence == 1.0
+    assert llm.prompts == []
+    assert get_repair_stats().stats() == {"valid": 0, "repaired": 1, "patched": 0, "fallback": 0, "retries_avoided": 1}
+
+
+def test_missing_field_is_patched_by_path_only():
+    report = {"topic": "OpenCV", "findings": [{"title": "Adoption", "confidence": 0.7}], "recommendations": ["Adopt"]}
+    conv, llm = converter(json.dumps(report), '{"findings.0.evidence": "Used by 40k companies"}')
+
+    result = conv.to_pydantic()
+
+    assert result.findings[0].evidence == "Used by 40k companies"
+    assert len(llm.prompts) == 1
+    prompt = llm.prompts[0][-1]["content"]
+    assert "- findings.0.evidence: Field required" in prompt and "- topic" not in prompt
+    assert get_repair_stats().stats()["patched"] == 1
+
+
+def test_unrepairable_output_falls_back_to_full_conversion():
+    valid = json.dumps({"topic": "OpenCV", "findings": [FINDING], "recommendations": ["Adopt"]})
+    conv, llm = converter('{"topic": "OpenCV"}', "I can't help with that.", valid)
+
+    assert conv.to_pydantic().topic == "OpenCV"
+    assert len(llm.prompts) == 2
+    assert get_repair_stats().stats()["fallback"] == 1
+    assert get_repair_stats().stats()["retries_avoided"] == 0
+
+
+def test_crewai_conversion_uses_the_repairing_converter():
+    llm = ScriptedLLM(model="fake", replies=[], prompts=[])
+    agent = SimpleNamespace(llm=llm, function_calling_llm=None, verbose=False)
+    text = json.dumps({"topic": "OpenCV", "findings": [{**FINDING, "confidence": "90%"}], "recommendations": []})
+
+    result = convert_to_model(text, AnalysisReport, None, agent, RepairingConverter)
+
+    assert isinstance(result, AnalysisReport) and result.findings[0].confidence == 0.9
+    assert llm.prompts == []
+
+
+def test_patches_set_nested_paths_and_ignore_bad_ones():
+    data = {"findings": [{"title": "a"}], "topic": "x"}
+
+    patched = apply_patch(data, {"findings.0.evidence": "e", "findings.1": FINDING, "nope.3.x": 1})
+
+    assert patched == {"findings": [{"title": "a", "evidence": "e"}, FINDING], "topic": "x"}
+    assert data == {"findings": [{"title": "a"}], "topic": "x"}
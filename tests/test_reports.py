@@ -0,0 +1,62 @@
+"""Report output: per-run paths, atomic replacement, in-memory mode."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from crewai_template.reports import ReportTask, get_report, write_atomic
+
+INPUTS = {"topic": "OpenCV", "current_year": "2026"}
+
+
+def report_task(template):
+    return ReportTask(description="Write about {topic}", expected_output="A report", output_file=template)
+
+
+def test_each_run_id_gets_its_own_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task = report_task("reports/{run_id}/report.md")
+
+    for run_id in ("a1", "b2"):
+        task.interpolate_inputs_and_add_conversation_history({**INPUTS, "run_id": run_id})
+        task._save_file(f"# {run_id}")
+
+    assert (tmp_path / "reports/a1/report.md").read_text() == "# a1"
+    assert (tmp_path / "reports/b2/report.md").read_text() == "# b2"
+
+
+def test_failed_write_keeps_the_previous_report(tmp_path, monkeypatch):
+    path = tmp_path / "report.md"
+    write_atomic(path, "# old")
+
+    def broken_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", broken_replace)
+    with pytest.raises(RuntimeError, match="disk full"):
+        report_task(str(path))._save_file("# new")
+
+    assert path.read_text() == "# old"
+    assert os.listdir(tmp_path) == ["report.md"]
+
+
+def test_memory_mode_skips_the_filesystem(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("REPORT_OUTPUT", "memory")
+    task = report_task("reports/{run_id}/report.md")
+    task.interpolate_inputs_and_add_conversation_history({**INPUTS, "run_id": "svc"})
+
+    task._save_file({"title": "OpenCV"})
+
+    assert get_report("reports/svc/report.md") == '{\n  "title": "OpenCV"\n}'
+    assert os.listdir(tmp_path) == []
+
+
+def test_crew_templates_the_report_on_run_id():
+    from crewai_template.crew import CrewaiTemplate
+
+    task = CrewaiTemplate().report_task()
+    assert isinstance(task, ReportTask)
+    task.interpolate_inputs_and_add_conversation_history({**INPUTS, "run_id": "r42"})
+    assert task.output_file == "reports/r42/report.md"
@@ -0,0 +1,98 @@
+"""Scraper page cache — fresh hits, 304 revalidation, and LRU eviction."""
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock, patch
+
+from crewai_template.tools import WebScraperTool
+from crewai_template.tools.scrape_cache import CachedPage, ScrapeCache, get_scrape_cache
+
+HTML = b"<html><body><p>Cached words</p><a href='https://x.example'>X</a></body></html>"
+
+
+def _session(*responses):
+    session = MagicMock()
+    session.get.side_effect = list(responses)
+    return session
+
+
+def _response(status=200, content=HTML, headers=None):
+    return MagicMock(
+        status_code=status,
+        headers={"Content-Type": "text/html", **(headers or {})},
+        raise_for_status=lambda: None,
+        iter_content=lambda chunk_size: iter([content[i:i + 64] for i in range(0, len(content), 64)]),
+    )
+
+
+def test_fresh_hit_skips_network_and_parse():
+    session = _session(_response(headers={"ETag": '"v1"'}))
+    tool = WebScraperTool()
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=session):
+        first = tool._run(url="https://a.example/", extract_links=True)
+        with patch.object(WebScraperTool, "_extract", side_effect=AssertionError("re-parsed")):
+            second = tool._run(url="https://a.example/", extract_links=True)
+
+    assert first == second
+    assert "Cached words" in second and "- X: https://x.example" in second
+    assert session.get.call_count == 1
+    assert get_scrape_cache().stats()["hits"] == 1
+
+
+def test_stale_entry_revalidates_with_etag():
+    session = _session(_response(headers={"ETag": '"v1"'}), _response(status=304))
+    tool = WebScraperTool()
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=session):
+        tool._run(url="https://a.example/")
+        get_scrape_cache().ttl = 0
+        result = tool._run(url="https://a.example/")
+
+    assert "Cached words" in result
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert get_scrape_cache().stats()["revalidated"] == 1
+
+
+def test_lru_eviction_keeps_size_bound(tmp_path):
+    cache = ScrapeCache(tmp_path / "lru.sqlite3", max_bytes=3100)
+    for name in ("a", "b", "c"):
+        cache.put(CachedPage(url=name, text=name * 1000, links=[]))
+        time.sleep(0.01)
+    cache.get("a")  # touch → "b" is now least recently used
+    cache.put(CachedPage(url="d", text="d" * 1000, links=[]))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["bytes"] <= 3100
+
+
+def test_raw_body_round_trips(tmp_path):
+    cache = ScrapeCache(tmp_path / "body.sqlite3")
+    cache.put(CachedPage(url="u", text="t", links=[]), body=HTML)
+    assert cache.get_body("u") == HTML
+
+
+def test_cached_prefix_with_cut_body_is_refetched():
+    body = b"<html><body><p>" + b"lots of words " * 1000 + b"</p><a href='https://x.example'>X</a></body></html>"
+    session = _session(_response(content=body), _response(content=body))
+    tool = WebScraperTool()
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=session):
+        short = tool._run(url="https://a.example/", max_content_length=50)
+        longer = tool._run(url="https://a.example/", max_content_length=5000, extract_links=True)
+
+    assert short.endswith("...") and len(short) < 200
+    assert "- X: https://x.example" in longer
+    # The first read stopped early, so its stored body is a prefix: refetch.
+    assert session.get.call_count == 2
+    stored = get_scrape_cache().get("https://a.example/")
+    assert stored.body_complete and stored.links_complete
+
+
+def test_complete_body_is_re_extracted_without_refetch():
+    session = _session(_response())
+    tool = WebScraperTool()
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=session):
+        tool._run(url="https://a.example/")  # whole body read, links not collected
+        result = tool._run(url="https://a.example/", extract_links=True)
+
+    assert "- X: https://x.example" in result
+    assert session.get.call_count == 1
@@ -0,0 +1,96 @@
+"""Streaming accumulators: batch/merge results match a single exact pass."""
+from __future__ import annotations
+
+import random
+import statistics
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+import pytest
+
+from crewai_template.tools.sketches import CoMoments, HeavyHitters, HyperLogLog, Moments, QuantileSketch
+
+
+def test_moments_merge_matches_one_pass():
+    random.seed(7)
+    values = [random.gauss(1e6, 3) for _ in range(5000)]  # large mean, small spread
+    moments = Moments()
+    for start in range(0, len(values), 333):
+        moments.update(array("d", values[start:start + 333]))
+
+    assert moments.count == len(values)
+    assert moments.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert moments.variance == pytest.approx(statistics.variance(values), rel=1e-9)
+    assert (moments.min, moments.max) == (min(values), max(values))
+    assert (moments.first, moments.last) == (values[0], values[-1])
+
+
+def test_heavy_hitters_bounds():
+    random.seed(3)
+    stream = ["a"] * 300 + ["b"] * 150 + [f"x{i}" for i in range(2000)]
+    random.shuffle(stream)
+    sketch = HeavyHitters(capacity=10)
+    for start in range(0, len(stream), 100):
+        sketch.update(Counter(stream[start:start + 100]))
+
+    truth = Counter(stream)
+    assert len(sketch.counts) <= 10
+    assert not sketch.exact and sketch.error <= len(stream) / 11
+    for value, count in sketch.counts.items():
+        assert truth[value] - sketch.error <= count <= truth[value]
+    assert [value for value, _ in sketch.most_common(2)] == ["a", "b"]
+
+
+def test_heavy_hitters_exact_below_capacity():
+    left, right = HeavyHitters(capacity=5), HeavyHitters(capacity=5)
+    left.update(Counter("aabbc"))
+    right.update(Counter("abd"))
+    left.merge(right)
+
+    assert left.exact
+    assert left.counts == Counter("aabbcabd")
+
+
+def test_quantiles_exact_when_small_and_close_when_large():
+    small = QuantileSketch()
+    small.update(array("d", [4.0, 1.0, 3.0, 2.0]))
+    assert small.quantiles((0.0, 0.25, 0.5, 1.0)) == [1.0, 1.75, 2.5, 4.0]
+
+    random.seed(5)
+    values = [random.expovariate(1.0) for _ in range(200_000)]
+    left, right = QuantileSketch(seed=1), QuantileSketch(seed=2)
+    for start in range(0, len(values), 4096):
+        (left if start % 8192 else right).update(array("d", values[start:start + 4096]))
+    left.merge(right)
+
+    ordered = sorted(values)
+    assert left.count == len(values)
+    assert sum(len(level) for level in left.levels) < 2000
+    for q, estimate in zip((0.05, 0.5, 0.95), left.quantiles((0.05, 0.5, 0.95))):
+        assert abs(bisect_left(ordered, estimate) / len(values) - q) < 0.01
+
+
+def test_hyperloglog_estimates_and_merges():
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(f"user{i}" for i in range(60_000))
+    right.update(f"user{i}" for i in range(40_000, 100_000))
+    left.merge(right)
+
+    assert left.estimate() == pytest.approx(100_000, rel=0.05)
+    tiny = HyperLogLog()
+    tiny.update(["a", "b", "a"])
+    assert round(tiny.estimate()) == 2
+
+
+def test_comoments_match_pearson():
+    random.seed(9)
+    xs = [random.random() for _ in range(3000)]
+    ys = [2 * x + random.gauss(0, 0.3) for x in xs]
+    moments = CoMoments()
+    for start in range(0, len(xs), 250):
+        moments.update(array("d", xs[start:start + 250]), array("d", ys[start:start + 250]))
+
+    assert moments.count == 3000
+    assert moments.correlation == pytest.approx(statistics.correlation(xs, ys), rel=1e-9)
+    assert CoMoments(count=2).correlation is None
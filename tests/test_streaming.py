@@ -0,0 +1,166 @@
+"""Report streaming: answer extraction, per-attempt discards, sinks, event-bus wiring."""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from crewai import Task
+from crewai.events import LLMStreamChunkEvent, TaskCompletedEvent, crewai_event_bus
+from crewai.tasks.task_output import TaskOutput
+
+from crewai_template.streaming import (
+    AsyncIteratorSink,
+    FileSink,
+    ReportStream,
+    StreamSink,
+    sinks_from_env,
+)
+
+REPORT = "# OpenCV\n\nA library for computer vision.\n\n## Recommendations\n- Use it."
+
+
+class RecordingSink(StreamSink):
+    def __init__(self):
+        self.calls = []
+
+    def begin(self, task):
+        self.calls.append(("begin",))
+
+    def write(self, text):
+        if self.calls and self.calls[-1][0] == "write":
+            self.calls[-1] = ("write", self.calls[-1][1] + text)
+        else:
+            self.calls.append(("write", text))
+
+    def discard(self, reason):
+        self.calls.append(("discard", reason))
+
+    def close(self, text):
+        self.calls.append(("close", text))
+
+
+@pytest.fixture(autouse=True)
+def _in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def report_task():
+    return Task(description="Report", expected_output="A report", output_file="report.md")
+
+
+def chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_only_the_final_answer_is_forwarded():
+    sink = RecordingSink()
+    stream = ReportStream(report_task(), [sink])
+
+    for chunk in chunks("Plan: outline, then write."):
+        stream.feed("plan", chunk)
+    for chunk in chunks(f"Thought: I now can give a great answer\nFinal Answer: {REPORT}"):
+        stream.feed("answer", chunk)
+    stream.finish(REPORT)
+
+    assert sink.calls == [("begin",), ("write", REPORT), ("close", REPORT)]
+
+
+def test_doomed_and_rejected_drafts_are_discarded():
+    sink = RecordingSink()
+    stream = ReportStream(report_task(), [sink])
+
+    for chunk in chunks("Final Answer: " + "Prose before any title. " * 20):
+        stream.feed("no-heading", chunk)
+    for chunk in chunks("# Draft\n\nToo short."):
+        stream.feed("too-short", chunk)
+    for chunk in chunks(REPORT):
+        stream.feed("final", chunk)
+    stream.finish(REPORT)
+
+    assert [call[0] for call in sink.calls] == [
+        "begin", "write", "discard", "begin", "write", "discard", "begin", "write", "close",
+    ]
+    assert "heading" in sink.calls[2][1]  # dropped at 200 chars, not after the whole draft
+    assert sink.calls[4] == ("write", "# Draft\n\nToo short.")
+    assert "retrying" in sink.calls[5][1]
+    assert sink.calls[-2:] == [("write", REPORT), ("close", REPORT)]
+
+
+def test_cached_report_is_sent_in_one_piece_and_failures_close_empty():
+    sink = RecordingSink()
+    ReportStream(report_task(), [sink]).finish(REPORT)
+    assert sink.calls == [("begin",), ("write", REPORT), ("close", REPORT)]
+
+    failed = RecordingSink()
+    stream = ReportStream(report_task(), [failed])
+    stream.feed("only", REPORT)
+    stream.finish(None)
+    assert [call[0] for call in failed.calls] == ["begin", "write", "discard", "close"]
+    assert failed.calls[-1] == ("close", None)
+
+
+def test_file_sink_tails_a_partial_file_until_close(tmp_path):
+    task = report_task()
+    sink = FileSink()
+    stream = ReportStream(task, [sink])
+
+    stream.feed("c1", REPORT[:20])
+    assert (tmp_path / "report.md.partial").read_text() == REPORT[:20]
+    stream.feed("c1", REPORT[20:])
+    stream.finish(REPORT)
+
+    assert not (tmp_path / "report.md.partial").exists()
+
+
+def test_async_sink_yields_events_sent_from_another_thread():
+    async def main():
+        sink = AsyncIteratorSink()
+        stream = ReportStream(report_task(), [sink])
+
+        def produce():
+            for chunk in chunks(REPORT):
+                stream.feed("c1", chunk)
+            stream.finish(REPORT)
+
+        threading.Thread(target=produce).start()
+        return [event async for event in sink]
+
+    events = asyncio.run(asyncio.wait_for(main(), timeout=2))
+
+    assert "".join(e.text for e in events if e.kind == "text") == REPORT
+    assert events[-1] == ("done", REPORT)
+
+
+def test_listens_on_the_event_bus_until_the_task_completes():
+    task = report_task()
+    other = report_task()
+    sink = RecordingSink()
+
+    with crewai_event_bus.scoped_handlers():
+        ReportStream(task, [sink]).attach()
+        for chunk in chunks(REPORT):
+            crewai_event_bus.emit(task, LLMStreamChunkEvent(chunk=chunk, call_id="c1", from_task=task))
+        crewai_event_bus.emit(other, LLMStreamChunkEvent(chunk="# Other", call_id="c2", from_task=other))
+        output = TaskOutput(description="Report", raw=REPORT, agent="editor")
+        crewai_event_bus.emit(task, TaskCompletedEvent(output=output, task=task))
+        crewai_event_bus.flush()
+
+    assert sink.calls == [("begin",), ("write", REPORT), ("close", REPORT)]
+
+
+def test_crew_report_stream_turns_on_editor_streaming():
+    from crewai_template.crew import CrewaiTemplate
+
+    task = CrewaiTemplate().report_task()
+    stream = ReportStream(task, []).attach()
+    stream.detach()
+    assert task.agent.llm.stream is True
+
+
+def test_sinks_are_configured_by_name(monkeypatch):
+    monkeypatch.setenv("REPORT_STREAM", "stdout, file")
+    assert [type(s).__name__ for s in sinks_from_env()] == ["ConsoleSink", "FileSink"]
+    monkeypatch.setenv("REPORT_STREAM", "websocket")
+    with pytest.raises(ValueError, match="unknown REPORT_STREAM sink"):
+        sinks_from_env()
@@ -0,0 +1,118 @@
+"""Tool result cache: argument normalization, tiers, TTL, crewAI call paths."""
+from __future__ import annotations
+
+from typing import Type
+
+from crewai.tools import BaseTool, tool
+from pydantic import BaseModel
+
+from crewai_template.tools.tool_cache import (
+    ToolCache,
+    cache_tool,
+    get_tool_cache,
+    normalize_query,
+    normalize_url,
+    reset_tool_cache,
+)
+
+
+class LookupInput(BaseModel):
+    query: str
+    limit: int = 3
+
+
+class LookupTool(BaseTool):
+    name: str = "Lookup"
+    description: str = "Looks things up."
+    args_schema: Type[BaseModel] = LookupInput
+    calls: int = 0
+
+    def _run(self, query: str, limit: int = 3) -> str:
+        self.calls += 1
+        if query == "boom":
+            return "Error: lookup failed"
+        return f"{self.calls}: {query} x{limit}"
+
+
+def test_equivalent_calls_share_one_result():
+    lookup = cache_tool(LookupTool(), normalize={"query": normalize_query})
+
+    first = lookup.run(query="OpenCV  release")
+    assert lookup.run(query="  opencv release ", limit=3) == first
+    assert lookup._run("OPENCV RELEASE") == first
+    assert lookup.run(query="opencv release", limit=5) != first
+    assert lookup.calls == 2
+
+
+def test_hits_reach_agents_through_the_structured_tool():
+    lookup = cache_tool(LookupTool())
+    structured = lookup.to_structured_tool()
+
+    assert structured.invoke({"query": "numpy"}) == structured.invoke({"query": "numpy"}) == "1: numpy x3"
+    assert lookup.calls == 1
+
+
+def test_decorated_tools_are_cached():
+    seen = []
+
+    @tool("Shout")
+    def shout(text: str) -> str:
+        """Upper-case `text`."""
+        seen.append(text)
+        return text.upper()
+
+    cache_tool(shout)
+    assert shout.run(text="hi") == shout.run(text="hi ") == shout.to_structured_tool().invoke({"text": "hi"}) == "HI"
+    assert seen == ["hi"]
+
+
+def test_disk_tier_survives_a_restart_and_failures_are_not_stored():
+    lookup = cache_tool(LookupTool(), cacheable=lambda _args, result: not result.startswith("Error"))
+    lookup.run(query="pandas")
+    lookup.run(query="boom")
+    lookup.run(query="boom")
+
+    reset_tool_cache()
+    assert lookup.run(query="pandas") == "1: pandas x3"
+    stats = get_tool_cache().stats()
+    assert (stats["disk_hits"], stats["entries"], lookup.calls) == (1, 1, 3)
+
+
+def test_per_tool_ttl_and_memory_bound(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("crewai_template.tools.tool_cache.time.time", lambda: clock[0])
+    monkeypatch.setenv("TOOL_CACHE_PATH", "memory")
+    monkeypatch.setenv("TOOL_CACHE_MEMORY_ENTRIES", "2")
+    short = cache_tool(LookupTool(name="Short"), ttl=10)
+    long = cache_tool(LookupTool(name="Long"), ttl=1000)
+
+    short.run(query="a"), long.run(query="a")
+    clock[0] += 60
+    short.run(query="a"), long.run(query="a")
+    assert (short.calls, long.calls) == (2, 1)
+
+    long.run(query="b"), long.run(query="c")  # evicts the oldest in-process entries
+    long.run(query="a")
+    assert long.calls == 4 and get_tool_cache().stats()["memory_entries"] == 2
+
+
+def test_disabled_cache_passes_calls_through(monkeypatch):
+    monkeypatch.setenv("TOOL_CACHE_PATH", "off")
+    lookup = cache_tool(LookupTool())
+
+    lookup.run(query="x"), lookup.run(query="x")
+    assert lookup.calls == 2
+
+
+def test_normalize_url():
+    assert normalize_url(" HTTPS://Example.COM/Docs/#intro") == "https://example.com/Docs"
+    assert normalize_url("https://example.com/a?b=1") == "https://example.com/a?b=1"
+
+
+def test_tool_cache_bounds_the_disk_tier(tmp_path):
+    cache = ToolCache(tmp_path / "bounded.sqlite3", max_bytes=300, memory_entries=0)
+    for key in "abc":
+        cache.put(key, "t", key * 120, ttl=60)
+
+    assert [cache.get(key)[0] for key in "abc"] == [False, True, True]
+    cache.close()
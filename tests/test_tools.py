@@ -25,12 +25,16 @@ def test_character_count_basic():
 
 def test_web_scraper_extracts_text():
     fake_html = b"<html><body><p>Hello world</p><script>x=1</script></body></html>"
-    fake_response = MagicMock(content=fake_html, raise_for_status=lambda: None)
-
-    with (
-        patch("crewai_template.tools.web_scraper.requests.get", return_value=fake_response),
-        patch("crewai_template.tools.web_scraper.time.sleep"),
-    ):
+    fake_response = MagicMock(
+        status_code=200,
+        headers={"Content-Type": "text/html"},
+        raise_for_status=lambda: None,
+        iter_content=lambda chunk_size: iter([fake_html]),
+    )
+    fake_session = MagicMock()
+    fake_session.get.return_value = fake_response
+
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=fake_session):
         result = WebScraperTool()._run(url="https://example.com", max_content_length=1000)
 
     assert "Hello world" in result
@@ -40,13 +44,10 @@ def test_web_scraper_extracts_text():
 def test_web_scraper_handles_request_failure():
     import requests
 
-    with (
-        patch(
-            "crewai_template.tools.web_scraper.requests.get",
-            side_effect=requests.RequestException("boom"),
-        ),
-        patch("crewai_template.tools.web_scraper.time.sleep"),
-    ):
+    fake_session = MagicMock()
+    fake_session.get.side_effect = requests.RequestException("boom")
+
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=fake_session):
         result = WebScraperTool()._run(url="https://example.com")
 
     assert "Failed to scrape" in result
@@ -56,3 +57,42 @@ def test_data_analyzer_summary_on_text():
     result = DataAnalyzerTool()._run(data="Hello world. This is a test.", analysis_type="summary")
     assert "Word Count" in result
     assert "Summary" in result
+
+
+def test_batch_scraper_returns_results_in_input_order():
+    import time
+
+    from crewai_template.tools import BatchWebScraperTool
+
+    delays = {"https://slow.example": 0.2, "https://fast.example": 0.0}
+
+    def fake_scrape(url, max_content_length, extract_links, timeout):
+        time.sleep(delays[url])
+        return f"Content from {url}"
+
+    tool = BatchWebScraperTool()
+    with patch.object(tool._scraper, "_scrape", side_effect=fake_scrape):
+        started = time.monotonic()
+        result = tool._run(urls=["https://slow.example", "https://fast.example"])
+        elapsed = time.monotonic() - started
+
+    assert result.index("slow.example") < result.index("fast.example")
+    assert elapsed < 0.35  # fetched concurrently, not back-to-back
+
+
+def test_batch_scraper_reports_timeouts_per_url():
+    import time
+
+    from crewai_template.tools import BatchWebScraperTool
+
+    def fake_scrape(url, max_content_length, extract_links, timeout):
+        if "hang" in url:
+            time.sleep(0.5)
+        return f"Content from {url}"
+
+    tool = BatchWebScraperTool()
+    with patch.object(tool._scraper, "_scrape", side_effect=fake_scrape):
+        result = tool._run(urls=["https://ok.example", "https://hang.example"], timeout=0.1)
+
+    assert "Content from https://ok.example" in result
+    assert "Failed to scrape https://hang.example: timed out" in result
@@ -0,0 +1,75 @@
+"""Trend sketch: least-squares fit, bounded bucket series, changepoints, analyzer output."""
+from __future__ import annotations
+
+import random
+from array import array
+
+import pytest
+
+from crewai_template.tools import DataAnalyzerTool
+from crewai_template.tools.trends import TrendSketch, summarize
+
+
+def _sketch(values, chunk=1000, buckets=128):
+    sketch = TrendSketch(buckets=buckets)
+    for offset in range(0, len(values), chunk):
+        piece = values[offset:offset + chunk]
+        mask = bytearray(value is not None for value in piece)
+        sketch.update(offset, array("d", (value or 0.0 for value in piece)), mask)
+    return sketch
+
+
+def test_fit_matches_least_squares_with_gaps():
+    rng = random.Random(0)
+    values = [None if i % 7 == 0 else 3.0 - 0.02 * i + rng.gauss(0, 1) for i in range(5000)]
+    summary = summarize(_sketch(values))
+
+    points = [(i, y) for i, y in enumerate(values) if y is not None]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+    assert summary.direction == "decreasing"
+    assert summary.slope == pytest.approx(slope)
+    assert summary.r_squared > 0.9
+
+
+def test_bucket_series_stays_bounded():
+    sketch = _sketch([float(i % 10) for i in range(100_000)], chunk=4096, buckets=16)
+
+    assert len(sketch.counts) <= 32
+    assert sum(sketch.counts) == 100_000
+    assert sum(sketch.sums) == pytest.approx(450_000)
+
+
+def test_step_is_found_and_noise_is_not():
+    rng = random.Random(1)
+    step = [(2.0 if i >= 30_000 else 0.0) + rng.gauss(0, 1) for i in range(50_000)]
+    noise = [rng.gauss(0, 1) for _ in range(50_000)]
+
+    (point,) = summarize(_sketch(step, chunk=4096)).changepoints
+    assert abs(point.row - 30_000) < 1000
+    assert point.before == pytest.approx(0, abs=0.2) and point.after == pytest.approx(2, abs=0.2)
+    quiet = summarize(_sketch(noise, chunk=4096))
+    assert quiet.direction == "stable" and not quiet.changepoints
+
+
+def test_too_few_values():
+    assert summarize(_sketch([1.0, None, 2.0])) is None
+    result = DataAnalyzerTool()._run(data="x,y\nnan,1\n2,inf\n3,3", analysis_type="trends")
+    assert "Too few values for a trend (fewer than 3 finite numbers): x, y" in result
+
+
+def test_trends_report_every_numeric_column():
+    rng = random.Random(2)
+    lines = ["a,b,c,d,e"] + [
+        f"{i},{-i + rng.gauss(0, 5)},{rng.gauss(0, 1)},{rng.gauss(0, 1)},{(5 if i > 600 else 0) + rng.gauss(0, 0.5)}"
+        for i in range(1000)
+    ]
+
+    result = DataAnalyzerTool()._run(data="\n".join(lines), analysis_type="trends")
+
+    assert "Found 5 numeric columns" in result
+    assert "• a: 📈 Increasing (+1 per row, R² = 1.00)" in result
+    assert "• b: 📉 Decreasing" in result
+    assert "Stable (no linear trend or changepoint): c, d" in result
+    assert "• e:" in result and "Change near row" in result
@@ -0,0 +1,60 @@
+"""Streamed downloads — content-type gating, byte cap, and early abort."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from crewai_template.tools import WebScraperTool
+
+
+def _streaming_response(chunks, content_type="text/html"):
+    consumed = []
+
+    def iter_content(chunk_size):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    response = MagicMock(
+        status_code=200,
+        headers={"Content-Type": content_type} if content_type else {},
+        raise_for_status=lambda: None,
+        iter_content=iter_content,
+    )
+    return response, consumed
+
+
+def _scrape(response, **kwargs):
+    session = MagicMock()
+    session.get.return_value = response
+    with patch("crewai_template.tools.web_scraper.get_session", return_value=session):
+        return WebScraperTool()._run(url="https://a.example/", **kwargs)
+
+
+def test_rejects_binary_content_type_before_reading():
+    response, consumed = _streaming_response([b"%PDF-1.7 ..."], content_type="application/pdf")
+    result = _scrape(response)
+    assert "unsupported content type 'application/pdf'" in result
+    assert consumed == []
+
+
+def test_sniffs_binary_payload_without_content_type():
+    response, consumed = _streaming_response([b"\x89PNG\r\n\x1a\n...", b"more"], content_type=None)
+    result = _scrape(response)
+    assert "looks binary" in result
+    assert len(consumed) == 1
+
+
+def test_stops_reading_once_enough_text():
+    paragraph = b"<p>" + b"word " * 2000 + b"</p>\n"
+    response, consumed = _streaming_response([paragraph] * 1000)
+    result = _scrape(response, max_content_length=100)
+    assert result.endswith("...")
+    assert len(consumed) < 5
+
+
+def test_byte_cap_bounds_the_download(monkeypatch):
+    monkeypatch.setenv("SCRAPER_MAX_BYTES", "1000")
+    response, consumed = _streaming_response([b"<p>" + b"a " * 300 + b"</p>"] * 50)
+    result = _scrape(response, max_content_length=100_000)
+    assert "Content from" in result
+    assert sum(len(chunk) for chunk in consumed) <= 1000 + 606